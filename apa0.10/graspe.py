@@ -3,6 +3,8 @@ Implementação do método GRASPE para análise de cruzamentos.
 Prioriza coeficientes 0 e avança em ordem crescente.
 """
 
+import numpy as np
+
 def analisar_cruzamentos_graspe(matriz, limite_combinacoes=50, descartar_valor=-1):
     """
     Análise de cruzamentos usando método GRASPE.
@@ -11,6 +13,10 @@ def analisar_cruzamentos_graspe(matriz, limite_combinacoes=50, descartar_valor=-
     - Todos os Animal_2 precisam ter um cruzamento
     - Prioriza coeficientes começando por 0 e avançando em ordem crescente
     
+    As linhas de cada coluna são ordenadas uma única vez (argsort ao longo do eixo 0)
+    e o melhor Animal_1 ainda disponível de cada Animal_2 é obtido no índice da coluna,
+    sem percorrer a lista de todas as combinações.
+    
     Parâmetros:
     matriz (DataFrame): Matriz de coeficientes
     limite_combinacoes (int): Número máximo de combinações a retornar
@@ -19,65 +25,60 @@ def analisar_cruzamentos_graspe(matriz, limite_combinacoes=50, descartar_valor=-
     Retorno:
     list: Lista de dicionários com as melhores combinações
     """
-    # Criar lista de todas as combinações válidas
-    todas_combinacoes = []
-    
-    for animal1 in matriz.index:
-        for animal2 in matriz.columns:
-            coef = matriz.loc[animal1, animal2]
-            # Filtrar valores descartados e valores 1.0 (parentesco total)
-            if coef != descartar_valor and coef != 1.0:
-                todas_combinacoes.append({
-                    'Animal_1': animal1,
-                    'Animal_2': animal2,
-                    'Coeficiente': float(coef)
-                })
-    
-    # Ordenar por coeficiente (prioriza 0, depois valores crescentes)
-    todas_combinacoes.sort(key=lambda x: (
-        0 if x['Coeficiente'] == 0 else 1,
-        x['Coeficiente']
-    ))
+    valores = matriz.to_numpy(dtype=float)
+    num_animal1, num_animal2 = valores.shape
+    
+    # Índice ordenado por coluna: para cada Animal_2, as linhas (Animal_1) em ordem GRASPE
+    # (0 primeiro, depois valores crescentes; empates pela ordem das linhas). Valores
+    # descartados e 1.0 (parentesco total) vão para o fim e não são considerados.
+    validos = (valores != descartar_valor) & (valores != 1.0)
+    prioridade = np.where(validos, np.where(valores == 0, 0, 1), 2)
+    ordem_colunas = np.lexsort((valores, prioridade), axis=0)
+    total_validos = validos.sum(axis=0)
+    
+    # Cursor de cada coluna: próxima posição do índice ordenado a examinar
+    cursores = np.zeros(num_animal2, dtype=np.int64)
     
     # Conjunto para controlar Animal_2 já usados (cada Animal_2 só pode cruzar uma vez)
     animal2_usados = set()
     cruzamentos_selecionados = []
     
-    # Contador de cruzamentos por Animal_1
-    contador_animal1 = {}
-    
-    # Lista de todos os Animal_2 que precisam ter cruzamento
-    todos_animal2 = list(matriz.columns)
-    
     # Calcular número máximo de cruzamentos por Animal_1: (Animal_2/Animal_1)+1
-    num_animal2 = len(matriz.columns)
-    num_animal1 = len(matriz.index)
     max_cruzamentos_por_animal1 = int((num_animal2 / num_animal1) + 1)
     
+    # Contador de cruzamentos por Animal_1 e máscara dos que ainda podem cruzar
+    contador_animal1 = np.zeros(num_animal1, dtype=np.int64)
+    disponiveis = np.full(num_animal1, max_cruzamentos_por_animal1 > 0)
+    
     print(f"Máximo de cruzamentos por Animal_1: {max_cruzamentos_por_animal1}")
     
     # Garantir que todos os Animal_2 tenham um cruzamento
-    for animal2 in todos_animal2:
-        if animal2 not in animal2_usados:
-            # Buscar o melhor cruzamento para este Animal_2
-            melhor_opcao = None
-            
-            for comb in todas_combinacoes:
-                if comb['Animal_2'] == animal2:
-                    # Verificar se o Animal_1 ainda pode cruzar mais
-                    animal1 = comb['Animal_1']
-                    uso_atual = contador_animal1.get(animal1, 0)
-                    
-                    if uso_atual < max_cruzamentos_por_animal1:
-                        melhor_opcao = comb
-                        break
-            
-            if melhor_opcao:
-                cruzamentos_selecionados.append(melhor_opcao)
-                animal2_usados.add(melhor_opcao['Animal_2'])
-                # Incrementar contador do Animal_1
-                animal1 = melhor_opcao['Animal_1']
-                contador_animal1[animal1] = contador_animal1.get(animal1, 0) + 1
+    for coluna, animal2 in enumerate(matriz.columns):
+        if animal2 in animal2_usados:
+            continue
+        
+        # Melhor Animal_1 ainda disponível para este Animal_2, a partir do cursor
+        candidatos = ordem_colunas[cursores[coluna]:total_validos[coluna], coluna]
+        livres = disponiveis[candidatos]
+        if not livres.any():
+            cursores[coluna] = total_validos[coluna]
+            continue
+        
+        posicao = int(np.argmax(livres))
+        linha = int(candidatos[posicao])
+        cursores[coluna] += posicao + 1
+        
+        cruzamentos_selecionados.append({
+            'Animal_1': matriz.index[linha],
+            'Animal_2': animal2,
+            'Coeficiente': float(valores[linha, coluna])
+        })
+        animal2_usados.add(animal2)
+        
+        # Incrementar contador do Animal_1
+        contador_animal1[linha] += 1
+        if contador_animal1[linha] >= max_cruzamentos_por_animal1:
+            disponiveis[linha] = False
     
     return cruzamentos_selecionados
 
@@ -6,7 +6,8 @@ from flask import Flask, render_template, request, send_file, flash, redirect, u
 import os
 import pandas as pd
 from werkzeug.utils import secure_filename
-from csv_to_matrix import csv_to_matrix, get_matrix_statistics, contagem_animais
+from csv_to_matrix import (csv_to_matrix, get_matrix_statistics, contagem_animais,
+                           salvar_matriz, ler_matriz, PARQUET_DISPONIVEL)
 from graspe import grasp_cruzamentos, grasp_multiplas_execucoes
 
 app = Flask(__name__)
@@ -14,7 +15,7 @@ app.secret_key = 'sua_chave_secreta'  # Necessário para mensagens flash
 
 # Configuração de upload 
 UPLOAD_FOLDER = os.path.join(os.getcwd(), 'uploads')
-ALLOWED_EXTENSIONS = {'csv'}
+ALLOWED_EXTENSIONS = {'csv', 'parquet'} if PARQUET_DISPONIVEL else {'csv'}
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 # Aumentar limite de tamanho de upload para 10MB
 app.config['MAX_CONTENT_LENGTH'] = 10 * 1024 * 1024
@@ -60,6 +61,9 @@ def index():
             except ValueError:
                 num_execucoes = 5  # Valor padrão se não for um número válido
             
+            # Modo reativo: tamanho da RCL ajustado pela qualidade das soluções
+            modo_reativo = request.form.get('modo_reativo') == 'on'
+            
             try:
                 # Salva o arquivo com nome seguro
                 nome_arquivo = arquivo.filename  # Certifica que filename não é None
@@ -90,21 +94,21 @@ def index():
                 if hasattr(matriz, 'attrs') and 'total_animais' in matriz.attrs:
                     estatisticas['total_animais'] = matriz.attrs['total_animais']
                 
-                # Salva a matriz em CSV
+                # Salva a matriz no mesmo formato do arquivo enviado (CSV ou Parquet)
                 matriz_filename = f"matriz_{filename}"
                 matriz_filepath = os.path.join(app.config['UPLOAD_FOLDER'], matriz_filename)
-                matriz.to_csv(matriz_filepath)
+                salvar_matriz(matriz, matriz_filepath)
                 
                 # Salvar o número de execuções no nome do arquivo para uso posterior
                 import json
-                config_filename = f"config_{filename.replace('.csv', '.json')}"
+                config_filename = f"config_{os.path.splitext(filename)[0]}.json"
                 config_filepath = os.path.join(app.config['UPLOAD_FOLDER'], config_filename)
                 with open(config_filepath, 'w') as f:
-                    json.dump({'num_execucoes': num_execucoes}, f)
+                    json.dump({'num_execucoes': num_execucoes, 'modo_reativo': modo_reativo}, f)
                 
                 # Executar análise GRASPE imediatamente
                 print(f"Iniciando {num_execucoes} execuções GRASPE para encontrar melhores cruzamentos...")
-                resultado_multiplo = grasp_multiplas_execucoes(matriz, num_execucoes)
+                resultado_multiplo = grasp_multiplas_execucoes(matriz, num_execucoes, modo_reativo=modo_reativo)
                 
                 melhor_solucao_global = resultado_multiplo['melhor_solucao_global']
                 estatisticas_multiplas = resultado_multiplo['estatisticas']
@@ -142,7 +146,7 @@ def index():
                 flash(f'Erro ao processar o arquivo: {str(e)}')
         else:
             upload_status = 'erro'
-            flash('Tipo de arquivo não permitido. Por favor, envie um arquivo CSV.')
+            flash('Tipo de arquivo não permitido. Por favor, envie um arquivo CSV ou Parquet.')
     
     return render_template('index.html', 
                            upload_status=upload_status, 
@@ -179,10 +183,10 @@ def download_cruzamentos_csv():
 @app.route('/visualizar/<filename>')
 def visualizar_matriz(filename):
     try:
-        # Ler o arquivo CSV
+        # Ler o arquivo da matriz (CSV ou Parquet)
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
         print(f"Lendo arquivo da matriz: {filepath}")
-        df = pd.read_csv(filepath, index_col=0)
+        df = ler_matriz(filepath)
         
         # Limitar o tamanho para visualização (30x30 conforme solicitado)
         max_rows = 30
@@ -196,21 +200,23 @@ def visualizar_matriz(filename):
         # Obter número de execuções do arquivo de configuração
         import json
         arquivo_original = filename.replace("matriz_", "")
-        config_filename = f"config_{arquivo_original.replace('.csv', '.json')}"
+        config_filename = f"config_{os.path.splitext(arquivo_original)[0]}.json"
         config_filepath = os.path.join(app.config['UPLOAD_FOLDER'], config_filename)
         
         num_execucoes = 5  # Valor padrão
+        modo_reativo = False
         try:
             if os.path.exists(config_filepath):
                 with open(config_filepath, 'r') as f:
                     config = json.load(f)
                     num_execucoes = config.get('num_execucoes', 5)
+                    modo_reativo = config.get('modo_reativo', False)
         except Exception as e:
             print(f"Erro ao ler configuração: {e}")
         
         # Analisar os melhores cruzamentos usando múltiplas execuções GRASPE
         print(f"Iniciando {num_execucoes} execuções GRASPE para encontrar melhores cruzamentos...")
-        resultado_multiplo = grasp_multiplas_execucoes(df, num_execucoes)
+        resultado_multiplo = grasp_multiplas_execucoes(df, num_execucoes, modo_reativo=modo_reativo)
         
         melhor_solucao_global = resultado_multiplo['melhor_solucao_global']
         estatisticas = resultado_multiplo['estatisticas']
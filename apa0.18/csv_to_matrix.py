@@ -1,56 +1,240 @@
+import os
 import pandas as pd
 import numpy as np
 
+# Suporte a Parquet é opcional (requer pyarrow); sem ele, apenas CSV
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_DISPONIVEL = True
+except ImportError:
+    pa = None
+    pq = None
+    PARQUET_DISPONIVEL = False
 
-def csv_to_matrix(arquivo_csv):
+
+# Linhas por bloco na leitura em streaming
+TAMANHO_BLOCO_PADRAO = 250000
+
+EXTENSOES_PARQUET = ('.parquet', '.pq')
+
+
+def eh_parquet(arquivo):
+    """
+    Indica se o caminho (ou objeto de arquivo com atributo name) é um arquivo Parquet,
+    pela extensão.
+    """
+    nome = arquivo if isinstance(arquivo, (str, os.PathLike)) else getattr(arquivo, 'name', '')
+    return str(nome).lower().endswith(EXTENSOES_PARQUET)
+
+
+def _exigir_parquet():
+    if not PARQUET_DISPONIVEL:
+        raise ImportError("O suporte a Parquet requer o pacote pyarrow (pip install pyarrow)")
+
+
+def tamanho_arquivo(arquivo_csv):
+    """
+    Retorna o tamanho do arquivo em bytes, ou None se não for possível determiná-lo.
+    """
+    if isinstance(arquivo_csv, (str, os.PathLike)):
+        return os.path.getsize(arquivo_csv)
+    try:
+        posicao = arquivo_csv.tell()
+        arquivo_csv.seek(0, os.SEEK_END)
+        tamanho = arquivo_csv.tell()
+        arquivo_csv.seek(posicao)
+        return tamanho
+    except (AttributeError, OSError):
+        return None
+
+
+def ler_csv_em_blocos(arquivo_csv, tamanho_bloco=TAMANHO_BLOCO_PADRAO, colunas=None,
+                      callback_progresso=None):
+    """
+    Lê um arquivo CSV em blocos, com memória limitada ao tamanho do bloco.
+    
+    Parâmetros:
+    arquivo_csv (str ou arquivo): Caminho ou objeto de arquivo
+    tamanho_bloco (int): Número de linhas por bloco
+    colunas (list): Colunas a manter (as demais não são carregadas)
+    callback_progresso (callable): Função chamada após cada bloco com
+        (linhas_lidas, bytes_lidos, total_bytes); total_bytes é None se desconhecido
+    
+    Retorno:
+    generator: DataFrames de cada bloco
+    """
+    total_bytes = tamanho_arquivo(arquivo_csv)
+    arquivo = open(arquivo_csv, 'rb') if isinstance(arquivo_csv, (str, os.PathLike)) else arquivo_csv
+    usecols = (lambda coluna: coluna in colunas) if colunas else None
+    linhas_lidas = 0
+
+    try:
+        for bloco in pd.read_csv(arquivo, chunksize=tamanho_bloco, usecols=usecols):
+            linhas_lidas += len(bloco)
+            if callback_progresso:
+                bytes_lidos = arquivo.tell() if hasattr(arquivo, 'tell') else 0
+                if total_bytes is not None:
+                    bytes_lidos = min(bytes_lidos, total_bytes)
+                callback_progresso(linhas_lidas, bytes_lidos, total_bytes)
+            yield bloco
+    finally:
+        if arquivo is not arquivo_csv:
+            arquivo.close()
+
+
+def ler_parquet_em_blocos(arquivo_parquet, tamanho_bloco=TAMANHO_BLOCO_PADRAO, colunas=None,
+                          callback_progresso=None):
+    """
+    Lê um arquivo Parquet em lotes, carregando apenas as colunas pedidas. As colunas
+    Animal_1 e Animal_2 são lidas com codificação por dicionário (categóricas).
+    
+    Parâmetros:
+    arquivo_parquet (str ou arquivo): Caminho ou objeto de arquivo
+    tamanho_bloco (int): Número máximo de linhas por lote
+    colunas (list): Colunas a manter (as ausentes no arquivo são ignoradas)
+    callback_progresso (callable): Função chamada após cada lote com
+        (linhas_lidas, bytes_lidos, total_bytes); bytes_lidos é estimado pela
+        fração de linhas lidas
+    
+    Retorno:
+    generator: DataFrames de cada lote
+    """
+    _exigir_parquet()
+    total_bytes = tamanho_arquivo(arquivo_parquet)
+    arquivo = pq.ParquetFile(arquivo_parquet, read_dictionary=['Animal_1', 'Animal_2'])
+    nomes = arquivo.schema_arrow.names
+    if colunas:
+        colunas = [coluna for coluna in colunas if coluna in nomes]
+    total_linhas = arquivo.metadata.num_rows
+    linhas_lidas = 0
+
+    for lote in arquivo.iter_batches(batch_size=tamanho_bloco, columns=colunas):
+        linhas_lidas += lote.num_rows
+        if callback_progresso:
+            bytes_lidos = int(total_bytes * linhas_lidas / total_linhas) if total_bytes and total_linhas else 0
+            callback_progresso(linhas_lidas, bytes_lidos, total_bytes)
+        yield lote.to_pandas()
+
+
+def ler_em_blocos(arquivo, tamanho_bloco=TAMANHO_BLOCO_PADRAO, colunas=None, callback_progresso=None):
+    """
+    Lê um arquivo CSV ou Parquet em blocos, escolhendo o leitor pela extensão.
+    """
+    if eh_parquet(arquivo):
+        return ler_parquet_em_blocos(arquivo, tamanho_bloco, colunas, callback_progresso)
+    return ler_csv_em_blocos(arquivo, tamanho_bloco, colunas, callback_progresso)
+
+
+def salvar_matriz(matriz, caminho):
+    """
+    Salva a matriz em CSV ou, se o caminho terminar em .parquet, em Parquet
+    (colunar e comprimido, com os nomes dos animais no índice).
+    
+    Parâmetros:
+    matriz (DataFrame): Matriz a salvar
+    caminho (str): Caminho do arquivo de saída
+    """
+    if eh_parquet(caminho):
+        _exigir_parquet()
+        tabela = pa.Table.from_pandas(matriz.rename(columns=str), preserve_index=True)
+        pq.write_table(tabela, caminho, compression='zstd')
+    else:
+        matriz.to_csv(caminho)
+
+
+def ler_matriz(caminho):
+    """
+    Lê uma matriz salva por salvar_matriz (CSV ou Parquet).
+    
+    Parâmetros:
+    caminho (str): Caminho do arquivo
+    
+    Retorno:
+    DataFrame: Matriz com os animais no índice e nas colunas
+    """
+    if eh_parquet(caminho):
+        _exigir_parquet()
+        return pq.read_table(caminho).to_pandas()
+    return pd.read_csv(caminho, index_col=0)
+
+
+def _codificar(valores, indice):
+    # Atribui códigos inteiros incrementais aos animais, na ordem de aparição
+    codigos, unicos = pd.factorize(valores)
+    mapa = np.fromiter((indice.setdefault(animal, len(indice)) for animal in unicos),
+                       dtype=np.int64, count=len(unicos))
+    return mapa[codigos]
+
+
+def csv_to_matrix(arquivo_csv, tamanho_bloco=TAMANHO_BLOCO_PADRAO, callback_progresso=None):
     """
-    Função para converter um arquivo CSV em uma matriz.
-    O CSV deve conter colunas Animal_1, Animal_2 e Coef.
+    Função para converter um arquivo CSV (ou Parquet) em uma matriz.
+    O arquivo deve conter colunas Animal_1, Animal_2 e Coef.
     Cria uma matriz onde as linhas e colunas são os animais e 
     os valores são os coeficientes.
     
+    O arquivo é lido em blocos: apenas os índices dos animais e os coeficientes
+    de cada linha são acumulados, e a matriz é preenchida de uma vez no final.
+    Arquivos Parquet são lidos apenas nessas três colunas, com os animais
+    codificados por dicionário.
+    
     Parâmetros:
-    arquivo_csv (str): Caminho para o arquivo CSV
+    arquivo_csv (str): Caminho para o arquivo CSV ou Parquet
+    tamanho_bloco (int): Número de linhas lidas por bloco
+    callback_progresso (callable): Função chamada após cada bloco com
+        (linhas_lidas, bytes_lidos, total_bytes)
     
     Retorno:
     DataFrame: Matriz convertida do CSV
     """
     try:
-        # Ler o arquivo CSV
-        df = pd.read_csv(arquivo_csv)
+        indice_animal_1 = {}
+        indice_animal_2 = {}
+        partes_linhas, partes_colunas, partes_coef = [], [], []
+        tem_coef = None
 
-        # Verificar se as colunas necessárias existem
-        colunas_necessarias = ['Animal_1', 'Animal_2']
-        if 'Coef' in df.columns:
-            colunas_necessarias.append('Coef')
+        for bloco in ler_em_blocos(arquivo_csv, tamanho_bloco, ['Animal_1', 'Animal_2', 'Coef'],
+                                   callback_progresso):
+            # Verificar se as colunas necessárias existem
+            if tem_coef is None:
+                tem_coef = 'Coef' in bloco.columns
+                for coluna in ['Animal_1', 'Animal_2']:
+                    if coluna not in bloco.columns:
+                        raise ValueError(
+                            f"A coluna {coluna} não está presente no arquivo CSV")
 
-        for coluna in colunas_necessarias:
-            if coluna not in df.columns:
-                raise ValueError(
-                    f"A coluna {coluna} não está presente no arquivo CSV")
+            partes_linhas.append(_codificar(bloco['Animal_1'], indice_animal_1))
+            partes_colunas.append(_codificar(bloco['Animal_2'], indice_animal_2))
+            if tem_coef:
+                # Converter para float
+                partes_coef.append(bloco['Coef'].to_numpy(dtype=float))
+            else:
+                # Se não houver coluna Coef, usar valor 1 para preenchimento
+                partes_coef.append(np.ones(len(bloco)))
 
-        # Obter listas separadas de Animal_1 e Animal_2
-        animais_1 = sorted(df['Animal_1'].unique())  # Linhas
-        animais_2 = sorted(df['Animal_2'].unique())  # Colunas
+        # Obter listas separadas de Animal_1 e Animal_2, ordenadas
+        animais_1 = sorted(indice_animal_1)  # Linhas
+        animais_2 = sorted(indice_animal_2)  # Colunas
+        posicao_1 = np.empty(len(animais_1), dtype=np.int64)
+        posicao_1[[indice_animal_1[a] for a in animais_1]] = np.arange(len(animais_1))
+        posicao_2 = np.empty(len(animais_2), dtype=np.int64)
+        posicao_2[[indice_animal_2[a] for a in animais_2]] = np.arange(len(animais_2))
+
+        linhas = posicao_1[np.concatenate(partes_linhas)] if partes_linhas else np.zeros(0, dtype=np.int64)
+        colunas = posicao_2[np.concatenate(partes_colunas)] if partes_colunas else np.zeros(0, dtype=np.int64)
+        coeficientes = np.concatenate(partes_coef) if partes_coef else np.zeros(0)
+
+        # Em pares repetidos prevalece a última ocorrência, como no preenchimento linha a linha
+        celulas = linhas * len(animais_2) + colunas
+        _, ultima = np.unique(celulas[::-1], return_index=True)
+        manter = len(celulas) - 1 - ultima
 
         # Criar uma matriz com Animal_1 nas linhas e Animal_2 nas colunas
         # Usar float como tipo para evitar avisos de incompatibilidade de tipo
-        matriz = pd.DataFrame(0.0, index=animais_1, columns=animais_2)
-
-        # Preencher a matriz com os coeficientes
-        if 'Coef' in df.columns:
-            # Usar o valor do coeficiente no arquivo
-            for _, row in df.iterrows():
-                animal1 = row['Animal_1']
-                animal2 = row['Animal_2']
-                coef = float(row['Coef'])  # Converter para float
-                matriz.loc[animal1, animal2] = coef
-        else:
-            # Se não houver coluna Coef, usar valor 1 para preenchimento
-            for _, row in df.iterrows():
-                animal1 = row['Animal_1']
-                animal2 = row['Animal_2']
-                matriz.loc[animal1, animal2] = 1.0
+        valores = np.zeros((len(animais_1), len(animais_2)))
+        valores[linhas[manter], colunas[manter]] = coeficientes[manter]
+        matriz = pd.DataFrame(valores, index=animais_1, columns=animais_2)
 
         # Adicionar contagem de Animal_1 e Animal_2 como atributos da matriz
         # Usar dicionário para armazenar atributos, pois DataFrame não possui attrs em algumas versões
@@ -118,18 +302,23 @@ def get_matrix_statistics(matriz):
 
 def contagem_animais(arquivo_csv):
     """
-    Função para ler um arquivo CSV e contar quantos animais distintos existem 
+    Função para ler um arquivo CSV (ou Parquet) e contar quantos animais distintos existem 
     nas colunas Animal_1 e Animal_2
     
     Parâmetros:
-    arquivo_csv (str): Caminho para o arquivo CSV
+    arquivo_csv (str): Caminho para o arquivo CSV ou Parquet
     
     Retorno:
     dict: Dicionário com a contagem de animais distintos em Animal_1 e Animal_2
     """
     try:
-        # Ler o arquivo CSV
-        df = pd.read_csv(arquivo_csv)
+        # Ler o arquivo (no Parquet, apenas as colunas dos animais)
+        if eh_parquet(arquivo_csv):
+            _exigir_parquet()
+            nomes = pq.ParquetFile(arquivo_csv).schema_arrow.names
+            df = pq.read_table(arquivo_csv, columns=[c for c in ["Animal_1", "Animal_2"] if c in nomes]).to_pandas()
+        else:
+            df = pd.read_csv(arquivo_csv)
 
         # Verificar se as colunas necessárias existem
         colunas_necessarias = ["Animal_1", "Animal_2"]
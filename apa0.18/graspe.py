@@ -13,6 +13,69 @@ def calcular_media_cruzamentos(solucao):
         return 0.0
     return sum(pair['Coeficiente'] for pair in solucao) / len(solucao)
 
+# Valores discretos de RCL usados no modo reativo
+RCL_VALORES_REATIVOS = [0.75, 0.80, 0.85, 0.90, 0.95]
+
+def criar_estado_reativo(valores=None, intervalo_atualizacao=10):
+    """
+    Cria o estado do GRASP reativo: cada tamanho de RCL começa com a mesma probabilidade.
+    As probabilidades são recalculadas a cada intervalo_atualizacao registros
+    (mesma cadência do ReactiveAlpha da versão Streamlit).
+    """
+    valores = list(valores) if valores else list(RCL_VALORES_REATIVOS)
+    return {
+        'valores': valores,
+        'probabilidades': [1.0 / len(valores)] * len(valores),
+        'somas': [0.0] * len(valores),
+        'contagens': [0] * len(valores),
+        'melhor_valor': float('inf'),
+        'intervalo_atualizacao': intervalo_atualizacao,
+        'registros_desde_atualizacao': 0
+    }
+
+def escolher_rcl_reativo(estado):
+    """Sorteia um tamanho de RCL conforme as probabilidades atuais"""
+    return random.choices(estado['valores'], weights=estado['probabilidades'])[0]
+
+def atualizar_rcl_reativo(estado, rcl_tamanho, valor, delta=4):
+    """
+    Registra o valor objetivo obtido com rcl_tamanho (creditado ao valor de RCL mais
+    próximo, sem exigir igualdade exata de float) e, a cada intervalo de registros,
+    recalcula as probabilidades.
+    """
+    k = min(range(len(estado['valores'])), key=lambda i: abs(estado['valores'][i] - rcl_tamanho))
+    estado['somas'][k] += valor
+    estado['contagens'][k] += 1
+    estado['melhor_valor'] = min(estado['melhor_valor'], valor)
+
+    estado['registros_desde_atualizacao'] += 1
+    if estado['registros_desde_atualizacao'] >= estado['intervalo_atualizacao']:
+        recalcular_probabilidades_reativo(estado, delta)
+
+def recalcular_probabilidades_reativo(estado, delta=4):
+    """
+    Recalcula as probabilidades como q_k = (melhor / media_k) ** delta, normalizadas.
+    Valores ainda não testados mantêm qualidade neutra 1.
+    """
+    # Evitar divisão por zero quando o valor objetivo é 0
+    epsilon = 1e-9
+    qualidades = []
+    for soma, contagem in zip(estado['somas'], estado['contagens']):
+        if contagem == 0:
+            qualidades.append(1.0)
+        else:
+            media = soma / contagem
+            qualidades.append(((estado['melhor_valor'] + epsilon) / (media + epsilon)) ** delta)
+
+    total = sum(qualidades)
+    estado['probabilidades'] = [q / total for q in qualidades]
+    estado['registros_desde_atualizacao'] = 0
+
+def rcl_mais_provavel(estado):
+    """Retorna o tamanho de RCL com maior probabilidade no estado reativo"""
+    k = estado['probabilidades'].index(max(estado['probabilidades']))
+    return estado['valores'][k]
+
 def construir_solucao_rcl_adaptativa(matriz, tamanho_rcl=0.3, descartar_valor=-1):
     """
     Constrói solução com RCL adaptativa, onde a lista de candidatos e seus coeficientes são atualizados a cada passo.
@@ -75,10 +138,12 @@ def busca_local(solucao, matriz):
 
     return melhor
 
-def grasp_cruzamentos(matriz, iteracoes, rcl_tamanho, indice_execucao=None):
+def grasp_cruzamentos(matriz, iteracoes, rcl_tamanho, indice_execucao=None, estado_reativo=None):
     """
     GRASP com busca construtiva adaptativa.
     Salva as soluções encontradas em arquivos separados por execução.
+    Se estado_reativo for informado, o tamanho da RCL é sorteado a cada iteração
+    pelo GRASP reativo e rcl_tamanho é ignorado.
     """
     print(f"Executando GRASP com {iteracoes} iterações e rcl_tamanho={rcl_tamanho}")
 
@@ -98,9 +163,13 @@ def grasp_cruzamentos(matriz, iteracoes, rcl_tamanho, indice_execucao=None):
         f.write("iteracao,valor_objetivo,media_coeficientes,total_cruzamentos\n")
 
     for i in range(1, iteracoes + 1):
+        if estado_reativo is not None:
+            rcl_tamanho = escolher_rcl_reativo(estado_reativo)
         s = construir_solucao_rcl_adaptativa(matriz, rcl_tamanho)
         s_local = busca_local(s, matriz)
         v = f_objetivo(s_local)
+        if estado_reativo is not None:
+            atualizar_rcl_reativo(estado_reativo, rcl_tamanho, v)
         media_coeficientes = calcular_media_cruzamentos(s_local)
         print(f"  -> solução encontrada (valor {v:.6f})")
 
@@ -133,10 +202,18 @@ def grasp_cruzamentos(matriz, iteracoes, rcl_tamanho, indice_execucao=None):
     return resultado
 
 
-def grasp_multiplas_execucoes(matriz, num_execucoes, pasta_saida='resultados_grasp'):
+def grasp_multiplas_execucoes(matriz, num_execucoes, pasta_saida='resultados_grasp', modo_reativo=False):
+    """
+    Executa o GRASP várias vezes e guarda a melhor solução global.
+    No modo reativo o tamanho da RCL não é sorteado uniformemente: ele é escolhido
+    de RCL_VALORES_REATIVOS com probabilidades aprendidas pela qualidade das
+    soluções, e o aprendizado é compartilhado entre as execuções.
+    """
     os.makedirs(pasta_saida, exist_ok=True)
 
     print(f"Iniciando {num_execucoes} execuções do GRASP com RCL adaptativa...\n")
+
+    estado_reativo = criar_estado_reativo() if modo_reativo else None
     
     todas_execucoes = []
     melhor_solucao_global = None
@@ -147,19 +224,27 @@ def grasp_multiplas_execucoes(matriz, num_execucoes, pasta_saida='resultados_gra
 
     for execucao in range(num_execucoes):
         iteracoes = len(matriz.columns) if hasattr(matriz, 'columns') else len(matriz[0])
-        rcl_tamanho_aleatorio = round(random.uniform(0.75, 0.95), 2)
-
-        print(f"Execução {execucao + 1}/{num_execucoes} - Iterações: {iteracoes}, RCL proporcional: {rcl_tamanho_aleatorio:.2f}")
+        if estado_reativo is not None:
+            rcl_tamanho_aleatorio = rcl_mais_provavel(estado_reativo)
+            print(f"Execução {execucao + 1}/{num_execucoes} - Iterações: {iteracoes}, RCL reativa")
+        else:
+            rcl_tamanho_aleatorio = round(random.uniform(0.75, 0.95), 2)
+            print(f"Execução {execucao + 1}/{num_execucoes} - Iterações: {iteracoes}, RCL proporcional: {rcl_tamanho_aleatorio:.2f}")
 
         inicio = time.time()
         resultado = grasp_cruzamentos(
                     matriz,
                     iteracoes,
                     rcl_tamanho_aleatorio,
-                    indice_execucao=execucao + 1  
+                    indice_execucao=execucao + 1,
+                    estado_reativo=estado_reativo
         )
         duracao = time.time() - inicio
 
+        if estado_reativo is not None:
+            # Registrar o tamanho de RCL mais provável ao final da execução
+            rcl_tamanho_aleatorio = rcl_mais_provavel(estado_reativo)
+
         resultado['execucao'] = execucao + 1
         resultado['parametros'] = {
             'iteracoes': iteracoes,
@@ -210,6 +295,8 @@ def grasp_multiplas_execucoes(matriz, num_execucoes, pasta_saida='resultados_gra
             'valores_objetivo': valores_objetivo,
             'tempos_execucao': tempos_execucao,
             'tempo_total': tempo_total,
-            'num_execucoes': num_execucoes
+            'num_execucoes': num_execucoes,
+            'modo_reativo': modo_reativo,
+            'probabilidades_rcl': dict(zip(estado_reativo['valores'], estado_reativo['probabilidades'])) if estado_reativo else None
         }
     }
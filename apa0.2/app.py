@@ -52,26 +52,15 @@ def index():
             arquivo.save(filepath)
             
             try:
-                # Detecta o formato do arquivo e processa
+                # Detecta o formato do arquivo pelo início do arquivo
                 info_formato = detectar_formato_csv(filepath)
                 formato_info = info_formato  # Para exibir na página
                 
-                if info_formato['formato'] == 'padrao':
-                    # Se for o formato padrão, usa a função csv_to_matrix diretamente
-                    matriz = csv_to_matrix(filepath)
-                else:
-                    # Caso contrário, processa o arquivo para o formato padrão primeiro
-                    df_processado, _ = processar_arquivo_csv(filepath)
-                    
-                    # Salva o DataFrame processado em um arquivo temporário
-                    temp_filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"temp_{filename}")
-                    df_processado.to_csv(temp_filepath, index=False)
-                    
-                    # Converte o arquivo processado para matriz
-                    matriz = csv_to_matrix(temp_filepath)
-                    
-                    # Remove o arquivo temporário
-                    os.remove(temp_filepath)
+                # Lê o arquivo uma única vez, já no formato padrão (qualquer que seja o formato detectado)
+                df_processado, _ = processar_arquivo_csv(filepath, info_formato=info_formato)
+                
+                # Converte o DataFrame processado para matriz, sem arquivo temporário
+                matriz = csv_to_matrix(df_processado)
                 
                 # Obtém estatísticas
                 estatisticas = get_matrix_statistics(matriz)
@@ -10,21 +10,25 @@ import numpy as np
 import sys
 import os
 
-def csv_to_matrix(csv_path: str, output_path: str = "matriz_final.csv") -> pd.DataFrame:
+def csv_to_matrix(csv_path, output_path: str = "matriz_final.csv") -> pd.DataFrame:
     """
     Converte um arquivo CSV de relacionamentos em uma matriz.
     
     Args:
-        csv_path (str): Caminho para o arquivo CSV.
+        csv_path (str ou pd.DataFrame): Caminho para o arquivo CSV, ou DataFrame
+            já lido no formato padrão (Animal_1, Animal_2, Coef).
         output_path (str): Caminho para salvar a matriz resultante.
         
     Returns:
         pd.DataFrame: DataFrame contendo a matriz de coeficientes.
     """
     try:
-        # Carregar o arquivo CSV
-        print(f"Carregando arquivo: {csv_path}")
-        df = pd.read_csv(csv_path)
+        # Carregar o arquivo CSV (ou usar o DataFrame já lido)
+        if isinstance(csv_path, pd.DataFrame):
+            df = csv_path
+        else:
+            print(f"Carregando arquivo: {csv_path}")
+            df = pd.read_csv(csv_path)
         print(f"Arquivo carregado: {len(df)} linhas")
         
         # Obter todos os animais únicos (combinando Animal_1 e Animal_2)
@@ -157,37 +161,45 @@ def get_matrix_statistics(matrix: pd.DataFrame) -> dict:
         traceback.print_exc()
         return {}
 
-def extract_vectors(csv_path: str, vector1_path: str = "vetor_animal1.csv", 
-                   vector2_path: str = "vetor_animal2.csv") -> tuple:
+def extract_vectors(csv_path, vector1_path: str = None, vector2_path: str = None) -> tuple:
     """
     Extrai vetores Animal_1 e Animal_2 do arquivo CSV.
     
+    Os vetores são devolvidos em memória; arquivos só são gravados quando os
+    caminhos são informados.
+    
     Args:
-        csv_path (str): Caminho para o arquivo CSV
-        vector1_path (str): Caminho para salvar o vetor Animal_1
-        vector2_path (str): Caminho para salvar o vetor Animal_2
+        csv_path (str ou pd.DataFrame): Caminho para o arquivo CSV, ou DataFrame já lido
+        vector1_path (str): Caminho para salvar o vetor Animal_1 (opcional)
+        vector2_path (str): Caminho para salvar o vetor Animal_2 (opcional)
         
     Returns:
         tuple: Tupla contendo os dois vetores (animal1, animal2)
     """
     try:
-        # Carregar o arquivo CSV
-        print(f"Carregando arquivo: {csv_path}")
-        df = pd.read_csv(csv_path)
+        # Carregar o arquivo CSV (apenas as colunas dos animais)
+        if isinstance(csv_path, pd.DataFrame):
+            df = csv_path
+        else:
+            print(f"Carregando arquivo: {csv_path}")
+            df = pd.read_csv(csv_path, usecols=['Animal_1', 'Animal_2'])
         
-        # Extrair vetores únicos
+        # Extrair vetores únicos (na ordem de aparição)
         animal1 = df['Animal_1'].unique().tolist()
         animal2 = df['Animal_2'].unique().tolist()
         
-        # Salvar vetores em arquivos separados
-        pd.DataFrame(animal1, columns=['Animal_1']).to_csv(vector1_path, index=False)
-        pd.DataFrame(animal2, columns=['Animal_2']).to_csv(vector2_path, index=False)
-        
         # Exibir informações
         print(f"Vetores extraídos com sucesso:")
         print(f"- Animal_1: {len(animal1)} valores únicos")
         print(f"- Animal_2: {len(animal2)} valores únicos")
-        print(f"Arquivos salvos: {vector1_path}, {vector2_path}")
+        
+        # Salvar vetores em arquivos separados, se solicitado
+        if vector1_path:
+            pd.DataFrame(animal1, columns=['Animal_1']).to_csv(vector1_path, index=False)
+            print(f"Arquivo salvo: {vector1_path}")
+        if vector2_path:
+            pd.DataFrame(animal2, columns=['Animal_2']).to_csv(vector2_path, index=False)
+            print(f"Arquivo salvo: {vector2_path}")
         
         return animal1, animal2
         
@@ -195,39 +207,70 @@ def extract_vectors(csv_path: str, vector1_path: str = "vetor_animal1.csv",
         print(f"Erro ao processar o arquivo: {str(e)}")
         return None, None
 
-def remove_duplicates(vector1_path: str = "vetor_animal1.csv", 
-                     vector2_path: str = "vetor_animal2.csv",
-                     output_path: str = "vetor_animal2_sem_duplicados.csv") -> list:
+def load_vectors(vector1_path: str = "vetor_animal1.csv",
+                 vector2_path: str = "vetor_animal2.csv") -> tuple:
     """
-    Remove duplicidades entre os vetores Animal_1 e Animal_2.
+    Carrega vetores Animal_1 e Animal_2 salvos por extract_vectors.
     
     Args:
         vector1_path (str): Caminho para o arquivo do vetor Animal_1
         vector2_path (str): Caminho para o arquivo do vetor Animal_2
-        output_path (str): Caminho para salvar o novo vetor Animal_2 sem duplicados
         
     Returns:
-        list: Lista de animais únicos no vetor Animal_2
+        tuple: Tupla contendo os dois vetores (animal1, animal2)
     """
-    try:
-        # Carregar os vetores
-        print("Carregando vetores existentes...")
-        df_animal1 = pd.read_csv(vector1_path)
-        df_animal2 = pd.read_csv(vector2_path)
+    print("Carregando vetores existentes...")
+    animal1 = pd.read_csv(vector1_path)['Animal_1'].tolist()
+    animal2 = pd.read_csv(vector2_path)['Animal_2'].tolist()
+    return animal1, animal2
+
+def find_duplicates(animal1: list, animal2: list) -> dict:
+    """
+    Compara os vetores Animal_1 e Animal_2 sobre IDs codificados como inteiros.
+    
+    Os dois vetores são codificados juntos (pd.factorize) e a interseção e a
+    diferença são calculadas com np.intersect1d e np.setdiff1d sobre os códigos.
+    
+    Args:
+        animal1 (list): Vetor Animal_1
+        animal2 (list): Vetor Animal_2
         
-        # Obter listas de animais
-        animal1 = df_animal1['Animal_1'].tolist()
-        animal2 = df_animal2['Animal_2'].tolist()
+    Returns:
+        dict: 'duplicados' (animais presentes em ambos vetores) e 'unicos_animal2'
+        (animais exclusivos do vetor Animal_2), ambos ordenados
+    """
+    codigos, animais = pd.factorize(pd.Series(list(animal1) + list(animal2), dtype=object))
+    codigos1 = codigos[:len(animal1)]
+    codigos2 = codigos[len(animal1):]
+    
+    duplicados = animais[np.intersect1d(codigos1, codigos2)]
+    unicos_animal2 = animais[np.setdiff1d(codigos2, codigos1)]
+    
+    return {
+        'duplicados': sorted(duplicados.tolist()),
+        'unicos_animal2': sorted(unicos_animal2.tolist())
+    }
+
+def remove_duplicates(animal1: list, animal2: list, output_path: str = None) -> list:
+    """
+    Remove duplicidades entre os vetores Animal_1 e Animal_2.
+    
+    Args:
+        animal1 (list): Vetor Animal_1 (ex.: retornado por extract_vectors ou load_vectors)
+        animal2 (list): Vetor Animal_2
+        output_path (str): Caminho para salvar o novo vetor Animal_2 sem duplicados (opcional)
         
+    Returns:
+        list: Lista de animais únicos no vetor Animal_2
+    """
+    try:
         print(f"Vetor Animal_1: {len(animal1)} animais")
         print(f"Vetor Animal_2: {len(animal2)} animais")
         
         # Encontrar animais duplicados (presentes em ambos vetores)
-        set_animal1 = set(animal1)
-        set_animal2 = set(animal2)
-        
-        duplicados = set_animal1.intersection(set_animal2)
-        unicos_animal2 = set_animal2 - set_animal1
+        resultado = find_duplicates(animal1, animal2)
+        duplicados = resultado['duplicados']
+        unicos_animal2 = resultado['unicos_animal2']
         
         print(f"\nAnálise de duplicidade:")
         print(f"- Animais presentes em ambos vetores: {len(duplicados)}")
@@ -236,18 +279,14 @@ def remove_duplicates(vector1_path: str = "vetor_animal1.csv",
         # Se houver duplicados, removê-los do vetor_animal2
         if duplicados:
             print(f"\nRemovendo {len(duplicados)} animais duplicados do vetor Animal_2...")
+            print(f"Novo vetor Animal_2 criado: {len(unicos_animal2)} animais")
             
-            # Criar novo vetor Animal_2 sem os duplicados
-            animal2_sem_duplicados = sorted(list(unicos_animal2))
-            
-            # Salvar o novo vetor Animal_2
-            df_animal2_novo = pd.DataFrame(animal2_sem_duplicados, columns=['Animal_2'])
-            df_animal2_novo.to_csv(output_path, index=False)
+            # Salvar o novo vetor Animal_2, se solicitado
+            if output_path:
+                pd.DataFrame(unicos_animal2, columns=['Animal_2']).to_csv(output_path, index=False)
+                print(f"Salvo em: {output_path}")
             
-            print(f"Novo vetor Animal_2 criado: {len(animal2_sem_duplicados)} animais")
-            print(f"Salvo em: {output_path}")
-            
-            return animal2_sem_duplicados
+            return unicos_animal2
         else:
             print("\nNão foram encontrados animais duplicados entre os vetores.")
             return animal2
@@ -258,6 +297,35 @@ def remove_duplicates(vector1_path: str = "vetor_animal1.csv",
         traceback.print_exc()
         return []
 
+def extract_unique_vectors(csv_path, output_dir: str = None) -> dict:
+    """
+    Pipeline em memória: extrai os vetores Animal_1 e Animal_2 e remove do
+    vetor Animal_2 os animais que também estão em Animal_1.
+    
+    Args:
+        csv_path (str ou pd.DataFrame): Caminho para o arquivo CSV, ou DataFrame já lido
+        output_dir (str): Se informado, grava vetor_animal1.csv, vetor_animal2.csv e
+            vetor_animal2_sem_duplicados.csv nesse diretório
+        
+    Returns:
+        dict: 'animal1', 'animal2' e 'animal2_sem_duplicados'
+    """
+    caminhos = [None, None, None]
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        caminhos = [os.path.join(output_dir, nome) for nome in
+                    ("vetor_animal1.csv", "vetor_animal2.csv", "vetor_animal2_sem_duplicados.csv")]
+    
+    animal1, animal2 = extract_vectors(csv_path, caminhos[0], caminhos[1])
+    if animal1 is None:
+        return None
+    
+    return {
+        'animal1': animal1,
+        'animal2': animal2,
+        'animal2_sem_duplicados': remove_duplicates(animal1, animal2, caminhos[2])
+    }
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Uso:")
@@ -286,10 +354,16 @@ if __name__ == "__main__":
             sys.exit(1)
             
         arquivo_csv = sys.argv[2]
-        extract_vectors(arquivo_csv)
+        extract_vectors(arquivo_csv, "vetor_animal1.csv", "vetor_animal2.csv")
         
     elif comando == "limpar":
-        remove_duplicates()
+        try:
+            animal1, animal2 = load_vectors()
+        except Exception as e:
+            print(f"Erro ao carregar vetores: {str(e)}")
+            print("Gere os vetores antes com: python csv_to_matrix.py vetores <arquivo_csv>")
+            sys.exit(1)
+        remove_duplicates(animal1, animal2, output_path="vetor_animal2_sem_duplicados.csv")
         
     else:
         print(f"Comando desconhecido: {comando}")
@@ -10,26 +10,60 @@ import numpy as np
 import csv
 import io
 
+# Quantidade de caracteres lidos após o cabeçalho para detectar o formato
+TAMANHO_AMOSTRA = 64 * 1024
+
+def _ler_amostra(arquivo_path):
+    """
+    Lê o cabeçalho completo e o início das linhas seguintes, terminando na
+    última linha completa.
+    
+    O cabeçalho é sempre lido inteiro (uma matriz de adjacência grande tem uma
+    coluna por animal, e o cabeçalho sozinho pode passar de TAMANHO_AMOSTRA).
+    
+    Args:
+        arquivo_path (str): Caminho para o arquivo CSV.
+        
+    Returns:
+        tuple: (texto da amostra, True se a amostra contém o arquivo inteiro)
+    """
+    with open(arquivo_path, 'r') as f:
+        cabecalho = f.readline()
+        linhas = f.read(TAMANHO_AMOSTRA)
+        completa = f.read(1) == ''
+    
+    if not completa and '\n' in linhas:
+        linhas = linhas[:linhas.rindex('\n') + 1]
+    return cabecalho + linhas, completa
+
 def detectar_formato_csv(arquivo_path):
     """
     Detecta o formato do arquivo CSV e retorna informações sobre ele.
     
+    Apenas o cabeçalho e o início das linhas seguintes (TAMANHO_AMOSTRA) são
+    lidos: o delimitador, o cabeçalho e as primeiras linhas bastam para
+    reconhecer o formato. O
+    resultado inclui em 'leitura' os parâmetros de pd.read_csv (delimitador,
+    colunas a ler e tipos) que o conversor usa para ler o arquivo uma única vez.
+    
     Args:
         arquivo_path (str): Caminho para o arquivo CSV.
         
     Returns:
-        dict: Dicionário com informações sobre o formato do arquivo.
+        dict: Dicionário com informações sobre o formato do arquivo. 'linhas' é
+        None quando a amostra não contém o arquivo inteiro (preenchido por
+        processar_arquivo_csv após a leitura).
     """
     try:
-        # Detectar delimitador do arquivo
-        with open(arquivo_path, 'r') as f:
-            # Lê as primeiras linhas para detectar o delimitador
-            sample = f.read(1024)
-            dialect = csv.Sniffer().sniff(sample)
-            delimitador = dialect.delimiter
+        amostra, completa = _ler_amostra(arquivo_path)
+        
+        # Detectar delimitador a partir das primeiras linhas
+        dialect = csv.Sniffer().sniff(amostra[:1024])
+        delimitador = dialect.delimiter
         
-        # Ler o arquivo com o delimitador detectado
-        df = pd.read_csv(arquivo_path, sep=delimitador)
+        # Ler apenas a amostra com o delimitador detectado
+        df = pd.read_csv(io.StringIO(amostra), sep=delimitador)
+        linhas = len(df) if completa else None
         
         # Verificar formato
         colunas = list(df.columns)
@@ -37,14 +71,21 @@ def detectar_formato_csv(arquivo_path):
         # Verificar se é uma matriz de adjacência (primeira coluna é rótulo e restante são os mesmos valores da primeira coluna)
         if len(colunas) > 2 and colunas[0] not in ['Animal_1', 'origem', 'source'] and all(col not in ['Animal_2', 'destino', 'target', 'Coef', 'peso', 'weight'] for col in colunas[1:]):
             # Verificar se as colunas 1+ são iguais aos valores da primeira coluna em uma matriz de adjacência
+            # (com amostra parcial, verifica-se que os rótulos das linhas lidas estão entre as colunas)
             try:
                 primeiros_valores = df[colunas[0]].tolist()
-                if all(col in primeiros_valores for col in colunas[1:]):
+                if completa:
+                    eh_matriz = all(col in primeiros_valores for col in colunas[1:])
+                else:
+                    rotulos_colunas = set(colunas[1:])
+                    eh_matriz = len(primeiros_valores) > 0 and all(valor in rotulos_colunas for valor in primeiros_valores)
+                if eh_matriz:
                     return {
                         'formato': 'matriz_adjacencia',
                         'delimitador': delimitador,
                         'colunas': colunas,
-                        'linhas': len(df)
+                        'linhas': linhas,
+                        'leitura': {'sep': delimitador, 'index_col': 0}
                     }
             except:
                 pass
@@ -71,15 +112,25 @@ def detectar_formato_csv(arquivo_path):
                     'delimitador': delimitador,
                     'colunas': colunas,
                     'mapeamento': mapeamento,
-                    'linhas': len(df)
+                    'linhas': linhas,
+                    'leitura': _opcoes_leitura_arestas(df, delimitador, mapeamento)
                 }
         
         # Formato padrão ou não reconhecido
+        if all(col in df.columns for col in ['Animal_1', 'Animal_2', 'Coef']):
+            mapeamento_padrao = {col: col for col in ['Animal_1', 'Animal_2', 'Coef']}
+            return {
+                'formato': 'padrao',
+                'delimitador': delimitador,
+                'colunas': colunas,
+                'linhas': linhas,
+                'leitura': _opcoes_leitura_arestas(df, delimitador, mapeamento_padrao)
+            }
         return {
-            'formato': 'padrao' if all(col in df.columns for col in ['Animal_1', 'Animal_2', 'Coef']) else 'desconhecido',
+            'formato': 'desconhecido',
             'delimitador': delimitador,
             'colunas': colunas,
-            'linhas': len(df)
+            'linhas': linhas
         }
     
     except Exception as e:
@@ -88,44 +139,64 @@ def detectar_formato_csv(arquivo_path):
             'mensagem': str(e)
         }
 
-def converter_matriz_adjacencia(arquivo_path, info_formato):
+def _opcoes_leitura_arestas(df_amostra, delimitador, mapeamento):
+    """
+    Parâmetros de pd.read_csv para uma lista de arestas: apenas as colunas mapeadas
+    e, se a amostra mostrou o coeficiente numérico, leitura direta como float64.
+    """
+    opcoes = {
+        'sep': delimitador,
+        'usecols': list(dict.fromkeys(mapeamento.values()))
+    }
+    if pd.api.types.is_numeric_dtype(df_amostra[mapeamento['Coef']]):
+        opcoes['dtype'] = {mapeamento['Coef']: 'float64'}
+    return opcoes
+
+def converter_matriz_adjacencia(arquivo_path, info_formato, somente_triangulo_superior=False):
     """
     Converte uma matriz de adjacência para o formato padrão.
     
+    A conversão é vetorizada: todas as células são convertidas de uma vez com
+    pd.to_numeric (valores não numéricos viram NaN e são descartados) e as
+    células com valor maior que zero são localizadas com np.nonzero, na ordem
+    linha a linha da matriz.
+    
     Args:
         arquivo_path (str): Caminho para o arquivo CSV.
         info_formato (dict): Informações sobre o formato do arquivo.
+        somente_triangulo_superior (bool): Para matrizes simétricas, mantém apenas
+            as células acima da diagonal (cada par aparece uma única vez).
         
     Returns:
         pd.DataFrame: DataFrame no formato padrão (Animal_1, Animal_2, Coef).
     """
-    # Ler a matriz de adjacência
-    df = pd.read_csv(arquivo_path, sep=info_formato['delimitador'], index_col=0)
+    # Ler a matriz de adjacência (leitura configurada na detecção do formato)
+    df = pd.read_csv(arquivo_path, **info_formato.get('leitura', {'sep': info_formato['delimitador'], 'index_col': 0}))
     
-    # Criar lista de arestas a partir da matriz
-    linhas = []
+    # Total de linhas da matriz (a detecção lê apenas o início do arquivo)
+    info_formato['linhas'] = len(df)
     
-    # Iterar pelas linhas e colunas da matriz
-    for idx in df.index:
-        for col in df.columns:
-            # Extrair o valor na célula
-            valor = df.loc[idx, col]
-            
-            # Verificar se o valor é um número válido e maior que zero
-            try:
-                valor_float = float(valor)
-                if not pd.isna(valor) and valor_float > 0:
-                    linhas.append({
-                        'Animal_1': idx,
-                        'Animal_2': col,
-                        'Coef': valor_float
-                    })
-            except (ValueError, TypeError):
-                # Ignora valores que não podem ser convertidos para float
-                continue
+    # Converter o bloco inteiro para números; células inválidas viram NaN
+    valores = df.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+    
+    # Células com valor numérico maior que zero (NaN nunca é maior que zero)
+    mascara = valores > 0
+    
+    if somente_triangulo_superior:
+        # Posição de cada coluna na ordem das linhas (a matriz pode ter as colunas em outra ordem)
+        posicao_colunas = df.index.get_indexer(df.columns)
+        if (posicao_colunas < 0).any():
+            posicao_colunas = np.arange(len(df.columns))
+        mascara &= posicao_colunas[np.newaxis, :] > np.arange(len(df.index))[:, np.newaxis]
+    
+    linhas, colunas = np.nonzero(mascara)
     
     # Criar DataFrame no formato padrão
-    return pd.DataFrame(linhas)
+    return pd.DataFrame({
+        'Animal_1': df.index.to_numpy()[linhas],
+        'Animal_2': df.columns.to_numpy()[colunas],
+        'Coef': valores[linhas, colunas]
+    })
 
 def converter_lista_arestas(arquivo_path, info_formato):
     """
@@ -138,8 +209,8 @@ def converter_lista_arestas(arquivo_path, info_formato):
     Returns:
         pd.DataFrame: DataFrame no formato padrão (Animal_1, Animal_2, Coef).
     """
-    # Ler a lista de arestas
-    df = pd.read_csv(arquivo_path, sep=info_formato['delimitador'])
+    # Ler a lista de arestas (apenas as colunas mapeadas, conforme a detecção do formato)
+    df = pd.read_csv(arquivo_path, **info_formato.get('leitura', {'sep': info_formato['delimitador']}))
     
     # Mapear colunas para o formato padrão
     mapeamento = info_formato['mapeamento']
@@ -150,26 +221,33 @@ def converter_lista_arestas(arquivo_path, info_formato):
     
     return df_padrao
 
-def processar_arquivo_csv(arquivo_path):
+def processar_arquivo_csv(arquivo_path, somente_triangulo_superior=False, info_formato=None):
     """
     Processa um arquivo CSV e retorna um DataFrame no formato padrão.
     
+    O formato é detectado pelo início do arquivo e o arquivo completo é lido
+    uma única vez, já com o delimitador, as colunas e os tipos detectados.
+    
     Args:
         arquivo_path (str): Caminho para o arquivo CSV.
+        somente_triangulo_superior (bool): Para matrizes de adjacência simétricas,
+            converte apenas o triângulo superior.
+        info_formato (dict): Resultado de detectar_formato_csv, se já calculado.
         
     Returns:
         tuple: (DataFrame no formato padrão, informações sobre o formato detectado)
     """
     # Detectar formato
-    info_formato = detectar_formato_csv(arquivo_path)
+    if info_formato is None:
+        info_formato = detectar_formato_csv(arquivo_path)
     
     # Converter com base no formato detectado
     if info_formato['formato'] == 'matriz_adjacencia':
-        df = converter_matriz_adjacencia(arquivo_path, info_formato)
+        df = converter_matriz_adjacencia(arquivo_path, info_formato, somente_triangulo_superior)
     elif info_formato['formato'] == 'lista_arestas':
         df = converter_lista_arestas(arquivo_path, info_formato)
     elif info_formato['formato'] == 'padrao':
-        df = pd.read_csv(arquivo_path, sep=info_formato['delimitador'])
+        df = pd.read_csv(arquivo_path, **info_formato.get('leitura', {'sep': info_formato['delimitador']}))
     else:
         # Tentar ler o arquivo normalmente se o formato não for reconhecido
         df = pd.read_csv(arquivo_path)
@@ -179,4 +257,8 @@ def processar_arquivo_csv(arquivo_path):
         if not all(col in df.columns for col in required_columns):
             raise ValueError(f"Formato de arquivo não suportado. Colunas necessárias: {required_columns}")
     
+    # Total de linhas conhecido apenas após a leitura completa
+    if info_formato.get('linhas') is None:
+        info_formato['linhas'] = len(df)
+    
     return df, info_formato
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""
+Script para testar a detecção de formato de imports_especiais
+
+Verifica que uma matriz de adjacência com cabeçalho maior que TAMANHO_AMOSTRA
+(uma coluna por animal) continua sendo reconhecida e convertida.
+"""
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+import imports_especiais
+from imports_especiais import detectar_formato_csv, processar_arquivo_csv
+
+def escrever_matriz(caminho, num_animais):
+    # IDs de par com 15 caracteres, como nos arquivos reais
+    rotulos = [f"{3900000 + i}_{3950000 + i}" for i in range(num_animais)]
+    valores = np.round(0.01 + np.random.default_rng(0).random((num_animais, num_animais)) * 0.5, 3)
+    valores = np.triu(valores, 1) + np.triu(valores, 1).T
+    pd.DataFrame(valores, index=rotulos, columns=rotulos).to_csv(caminho)
+    return rotulos
+
+def testar_cabecalho_maior_que_amostra():
+    num_animais = 300
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, 'matriz.csv')
+        escrever_matriz(caminho, num_animais)
+        with open(caminho) as f:
+            tamanho_cabecalho = len(f.readline())
+
+        # Amostra menor que o cabeçalho (o mesmo caso de uma matriz grande com 64 KB)
+        tamanho_original = imports_especiais.TAMANHO_AMOSTRA
+        imports_especiais.TAMANHO_AMOSTRA = tamanho_cabecalho // 4
+        try:
+            info = detectar_formato_csv(caminho)
+            if info['formato'] != 'matriz_adjacencia':
+                print(f"✗ Cabeçalho de {tamanho_cabecalho} caracteres detectado como '{info['formato']}'")
+                return False
+            df, _ = processar_arquivo_csv(caminho, info_formato=info)
+        finally:
+            imports_especiais.TAMANHO_AMOSTRA = tamanho_original
+
+    # Todas as células fora da diagonal são positivas
+    esperado = num_animais * (num_animais - 1)
+    if len(df) != esperado:
+        print(f"✗ Conversão gerou {len(df)} linhas")
+        return False
+
+    print(f"✓ Matriz com cabeçalho de {tamanho_cabecalho} caracteres detectada e convertida ({len(df)} linhas)")
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if testar_cabecalho_maior_que_amostra() else 1)
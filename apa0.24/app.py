@@ -5,10 +5,18 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import time
-import io
 import random
+import uuid
 from data_processor import DataProcessor
-from grasp_algorithm import GRASPOptimizer
+from grasp_algorithm import GRASPOptimizer, ReactiveAlpha
+from crossing_index import SortedCrossingIndex
+from result_record import OptimizationRecord
+from recommendations import distribute_males_improved
+from conflict_graph import CrossingConflictGraph
+from crossing_selection import grasp_crossing_selection
+from heatmap_tiles import extract_tile, block_labels, locate_cells
+from view_cache import DerivedViewCache
+from columnar_io import EXPORT_FORMATS, PARQUET_AVAILABLE, export_dataframe
 
 # Page configuration
 st.set_page_config(
@@ -18,6 +26,40 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Linhas por bloco na leitura do CSV enviado
+LOAD_CHUNKSIZE = 250_000
+
+# Orçamento de memória do cache de visualizações derivadas (compartilhado entre sessões)
+VIEW_CACHE_MAX_MB = 256
+
+@st.cache_resource
+def get_view_cache():
+    """Cache das visualizações derivadas, chaveado por hash do dataset e parâmetros"""
+    return DerivedViewCache(max_bytes=VIEW_CACHE_MAX_MB * 1024 * 1024)
+
+view_cache = get_view_cache()
+
+def download_dataframe(label, df, file_stem, cache_key=None, index=False, help=None):
+    """
+    Botão de download de um DataFrame no formato de exportação escolhido na barra lateral.
+    Com cache_key, o arquivo serializado é guardado no cache de visualizações.
+    """
+    def serialize():
+        return export_dataframe(df, export_format, index=index)
+    
+    if cache_key is not None:
+        data, mime, extension = view_cache.get_or_compute(('export',) + cache_key + (export_format,), serialize)
+    else:
+        data, mime, extension = serialize()
+    
+    st.download_button(
+        label=f"{label} ({export_format})",
+        data=data,
+        file_name=f"{file_stem}_{int(time.time())}.{extension}",
+        mime=mime,
+        help=help
+    )
+
 # Initialize session state
 if 'data_processor' not in st.session_state:
     st.session_state.data_processor = None
@@ -51,6 +93,73 @@ def generate_random_params():
     
     return random_max_iterations, random_alpha, random_local_search
 
+# Máximo de células por eixo enviadas ao navegador em cada mapa de calor
+HEATMAP_MAX_CELLS = 200
+
+def render_matrix_heatmap(matrix, key, title, x_prefix, y_prefix, x_title, y_title,
+                          color_scale="Viridis", highlight_cells=None):
+    """
+    Mostra um mapa de calor da matriz enviando no máximo HEATMAP_MAX_CELLS × HEATMAP_MAX_CELLS células.
+    Matrizes maiores são agregadas em blocos (média ou mínimo) e o usuário pode
+    aproximar uma região, que é exibida em resolução completa quando cabe no limite.
+    highlight_cells é uma tupla (linhas, colunas) de células marcadas com estrelas.
+    """
+    num_rows, num_cols = matrix.shape
+    row_start, row_end, col_start, col_end = 0, num_rows, 0, num_cols
+    method = 'mean'
+    
+    if num_rows > HEATMAP_MAX_CELLS or num_cols > HEATMAP_MAX_CELLS:
+        col_zoom1, col_zoom2, col_zoom3 = st.columns(3)
+        with col_zoom1:
+            method_label = st.selectbox("Agregação dos blocos", ["Média", "Mínimo"], key=f"{key}_method")
+            method = 'min' if method_label == "Mínimo" else 'mean'
+        with col_zoom2:
+            row_start, row_end = st.slider(f"Região: {y_title}", 1, num_rows, (1, num_rows), key=f"{key}_rows")
+            row_start -= 1
+        with col_zoom3:
+            col_start, col_end = st.slider(f"Região: {x_title}", 1, num_cols, (1, num_cols), key=f"{key}_cols")
+            col_start -= 1
+    
+    tile, row_edges, col_edges = extract_tile(
+        matrix, row_start, row_end, col_start, col_end,
+        HEATMAP_MAX_CELLS, HEATMAP_MAX_CELLS, method
+    )
+    
+    if tile.shape != (row_end - row_start, col_end - col_start):
+        st.caption(f"Matriz agregada em {tile.shape[0]}×{tile.shape[1]} blocos. "
+                   f"Reduza a região para no máximo {HEATMAP_MAX_CELLS} linhas e colunas para ver em resolução completa.")
+    
+    x_labels = block_labels(col_edges, x_prefix)
+    y_labels = block_labels(row_edges, y_prefix)
+    
+    fig = px.imshow(
+        tile,
+        labels=dict(x=x_title, y=y_title, color="Coancestralidade"),
+        x=x_labels,
+        y=y_labels,
+        color_continuous_scale=color_scale
+    )
+    
+    if highlight_cells is not None and len(highlight_cells[0]) > 0:
+        row_blocks = locate_cells(row_edges, highlight_cells[0])
+        col_blocks = locate_cells(col_edges, highlight_cells[1])
+        visible = (row_blocks >= 0) & (col_blocks >= 0)
+        fig.add_scatter(
+            x=[x_labels[b] for b in col_blocks[visible]],
+            y=[y_labels[b] for b in row_blocks[visible]],
+            mode='markers',
+            marker=dict(symbol='star', size=10, color='red'),
+            name='Melhores Cruzamentos',
+            showlegend=True
+        )
+    
+    fig.update_layout(
+        title=title,
+        xaxis_title=x_title,
+        yaxis_title=y_title
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
 # Sidebar - Configuração de páginas
 st.sidebar.header("📑 Navegação")
 pages = ["Análise de Dados", "Resultados da Otimização"]
@@ -78,8 +187,15 @@ selected_page = st.sidebar.selectbox("Selecione a Página", pages, index=default
 st.sidebar.header("📁 Upload de Dados")
 uploaded_file = st.sidebar.file_uploader(
     "Fazer upload do arquivo CSV com dados de acasalamento", 
-    type=['csv'],
-    help="O arquivo CSV deve conter as colunas: Animal_1, Animal_2, Coef"
+    type=['csv', 'parquet'] if PARQUET_AVAILABLE else ['csv'],
+    help="O arquivo CSV (ou Parquet) deve conter as colunas: Animal_1, Animal_2, Coef"
+)
+
+# Formato dos arquivos exportados (Parquet requer pyarrow)
+export_format = st.sidebar.selectbox(
+    "Formato de exportação",
+    EXPORT_FORMATS,
+    help="Parquet é colunar e comprimido, com IDs dos animais codificados por dicionário"
 )
 
 # Sidebar - Parâmetros GRASP
@@ -99,6 +215,31 @@ else:
     alpha = st.sidebar.slider("Alpha (Fator Ganancioso)", 0.1, 1.0, 0.3, 0.1)
     local_search_iterations = st.sidebar.slider("Iterações de Busca Local", 1, 30, 10)  # Valores otimizados
 
+# GRASP reativo: alpha ajustado pela qualidade das soluções
+use_reactive_alpha = st.sidebar.checkbox(
+    "Alpha reativo (auto-ajuste)",
+    value=False,
+    help="Sorteia alpha de um conjunto discreto com probabilidades atualizadas pela qualidade das soluções que cada valor produz"
+)
+if use_reactive_alpha:
+    st.sidebar.info("O alpha é ajustado automaticamente e o aprendizado é compartilhado entre as execuções")
+
+# Conjunto elite e path-relinking
+use_path_relinking = st.sidebar.checkbox(
+    "Usar path-relinking (conjunto elite)", 
+    value=True,
+    help="Guarda as melhores soluções encontradas e explora o caminho entre elas e as novas soluções"
+)
+elite_size = st.sidebar.slider("Tamanho do Conjunto Elite", 2, 20, 5) if use_path_relinking else 0
+
+# Construção vetorizada de várias soluções por passo
+construction_batch_size = st.sidebar.slider(
+    "Soluções Construídas por Lote", 1, 64, 1,
+    help="Número de soluções construídas ao mesmo tempo pela construção vetorizada "
+         "(1 = uma solução por iteração, comportamento padrão; valores maiores aceleram "
+         "a construção, mas os alphas do lote são sorteados antes de avaliar suas soluções)"
+)
+
 # Número de execuções
 num_executions = st.sidebar.slider("Número de Execuções", 1, 100, 3)
 
@@ -113,9 +254,20 @@ st.markdown("---")
 if selected_page == "Análise de Dados":
     if uploaded_file is not None:
         try:
-            # Load and process data
+            # Load and process data (leitura em blocos, com progresso)
             with st.spinner("Carregando e processando dados..."):
-                st.session_state.data_processor = DataProcessor(uploaded_file)
+                load_progress = st.progress(0.0, text="Lendo arquivo...")
+                
+                def report_load_progress(rows_read, bytes_read, total_bytes):
+                    fraction = bytes_read / total_bytes if total_bytes else 0.0
+                    load_progress.progress(min(fraction, 1.0), text=f"Lendo arquivo... {rows_read:,} registros")
+                
+                st.session_state.data_processor = DataProcessor(
+                    uploaded_file,
+                    chunksize=LOAD_CHUNKSIZE,
+                    progress_callback=report_load_progress
+                )
+                load_progress.empty()
                 
             dp = st.session_state.data_processor
             
@@ -125,7 +277,7 @@ if selected_page == "Análise de Dados":
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                st.metric("Total de Registros", len(dp.df))
+                st.metric("Total de Registros", dp.num_records)
             
             with col2:
                 st.metric("Fêmeas Distintas", dp.num_females)
@@ -151,14 +303,15 @@ if selected_page == "Análise de Dados":
             
             # Coefficient distribution plot
             st.subheader("📈 Distribuição dos Coeficientes")
-            fig_hist = px.histogram(
-                dp.df, 
-                x='Coef', 
-                nbins=50,
+            # Histograma calculado aqui: apenas as contagens vão para o navegador
+            hist_counts, hist_edges = np.histogram(dp.coef_values, bins=50)
+            fig_hist = px.bar(
+                x=(hist_edges[:-1] + hist_edges[1:]) / 2,
+                y=hist_counts,
                 title="Distribuição dos Coeficientes de Coancestralidade",
-                labels={'Coef': 'Coeficiente de Coancestralidade', 'count': 'Frequência'}
+                labels={'x': 'Coeficiente de Coancestralidade', 'y': 'Frequência'}
             )
-            fig_hist.update_layout(showlegend=False)
+            fig_hist.update_layout(showlegend=False, bargap=0)
             st.plotly_chart(fig_hist, use_container_width=True)
             
             # Animal mapping
@@ -187,19 +340,13 @@ if selected_page == "Análise de Dados":
             st.subheader("Matriz de Coancestralidade (Todos os Cruzamentos do Arquivo CSV)")
             
             # Create matrix visualization
-            matrix_fig = px.imshow(
+            render_matrix_heatmap(
                 dp.coancestry_matrix,
-                labels=dict(x="Pares de Animais", y="Pares de Animais", color="Coancestralidade"),
-                x=[f'P{i+1}' for i in range(len(dp.all_pairs))],
-                y=[f'P{i+1}' for i in range(len(dp.all_pairs))],
-                color_continuous_scale="Viridis"
-            )
-            matrix_fig.update_layout(
+                key="heatmap_coancestry",
                 title="Mapa de Calor da Matriz de Coancestralidade (Todos os Cruzamentos)",
-                xaxis_title="Pares de Animais",
-                yaxis_title="Pares de Animais"
+                x_prefix='P', y_prefix='P',
+                x_title="Pares de Animais", y_title="Pares de Animais"
             )
-            st.plotly_chart(matrix_fig, use_container_width=True)
             
             # Show matrix as table (first 20x20 for readability)
             st.subheader("Valores da Matriz (Primeiros 20×20)")
@@ -224,19 +371,13 @@ if selected_page == "Análise de Dados":
             st.subheader("Matriz Fêmeas × Machos")
             
             # Create breeding matrix visualization
-            breeding_fig = px.imshow(
+            render_matrix_heatmap(
                 dp.breeding_matrix,
-                labels=dict(x="Machos", y="Fêmeas", color="Coancestralidade"),
-                x=[f'm{i+1}' for i in range(len(dp.males))],
-                y=[f'f{i+1}' for i in range(len(dp.females))],
-                color_continuous_scale="Viridis"
-            )
-            breeding_fig.update_layout(
+                key="heatmap_breeding",
                 title="Matriz de Breeding (Fêmeas × Machos)",
-                xaxis_title="Machos",
-                yaxis_title="Fêmeas"
+                x_prefix='m', y_prefix='f',
+                x_title="Machos", y_title="Fêmeas"
             )
-            st.plotly_chart(breeding_fig, use_container_width=True)
             
             # GRASP Optimization
             st.header("🔍 Otimização GRASP")
@@ -248,6 +389,16 @@ if selected_page == "Análise de Dados":
                 overall_progress = st.progress(0)
                 status_text = st.empty()
                 
+                # Estado reativo compartilhado entre as execuções
+                reactive_alpha = ReactiveAlpha() if use_reactive_alpha else None
+                
+                # Cruzamentos ordenados por coancestralidade: índice construído uma vez por
+                # conjunto de dados e compartilhado por todas as execuções
+                crossing_index = view_cache.get_or_compute(
+                    ('crossing_index', getattr(dp, 'dataset_hash', id(dp))),
+                    lambda: SortedCrossingIndex.from_matrix(dp.coancestry_matrix)
+                )
+                
                 for execution in range(num_executions):
                     # Generate parameters for this execution
                     if use_random_params:
@@ -266,7 +417,12 @@ if selected_page == "Análise de Dados":
                             max_iterations=curr_max_iterations,
                             alpha=curr_alpha,
                             local_search_iterations=curr_local_search,
-                            pair_names=dp.all_pairs
+                            pair_names=dp.all_pairs,
+                            elite_size=elite_size,
+                            use_path_relinking=use_path_relinking,
+                            reactive_alpha=reactive_alpha,
+                            batch_size=construction_batch_size,
+                            crossing_index=crossing_index
                         )
                         
                         # Definir número de cruzamentos a selecionar (otimizado para performance)
@@ -276,21 +432,17 @@ if selected_page == "Análise de Dados":
                         best_solution, best_cost, iteration_costs = optimizer.optimize(num_crossings=num_crossings)
                         end_time = time.time()
                         
-                        # Store results
-                        result = {
-                            'execution': execution + 1,
-                            'best_solution': best_solution,
-                            'best_cost': best_cost,
-                            'iteration_costs': iteration_costs,
-                            'execution_time': end_time - start_time,
-                            'max_iterations': curr_max_iterations,
-                            'alpha': curr_alpha,
-                            'local_search_iterations': curr_local_search,
-                            'final_iterations': len(iteration_costs),
-                            'best_crossings': optimizer.best_crossings,
-                            'num_crossings_selected': len(best_solution),
-                            'optimizer': optimizer  # Guardar para análises posteriores
-                        }
+                        if reactive_alpha is not None:
+                            curr_alpha = reactive_alpha.best_alpha()
+                        
+                        # Store results: registro compacto, sem manter o otimizador em memória
+                        result = OptimizationRecord.from_optimizer(
+                            optimizer,
+                            execution=execution + 1,
+                            execution_time=end_time - start_time,
+                            alpha=curr_alpha,
+                            alpha_probabilities=reactive_alpha.get_probabilities() if reactive_alpha is not None else None
+                        )
                         
                         st.session_state.multiple_results.append(result)
                     
@@ -303,6 +455,8 @@ if selected_page == "Análise de Dados":
                 # Store the best overall result
                 best_execution = min(st.session_state.multiple_results, key=lambda x: x['best_cost'])
                 st.session_state.optimization_results = best_execution
+                # Identificador deste conjunto de resultados para as chaves do cache
+                st.session_state.results_run_id = uuid.uuid4().hex
                 
                 # Redirecionar para a página de resultados
                 st.info("🎯 Redirecionando para a página de resultados...")
@@ -347,6 +501,10 @@ elif selected_page == "Resultados da Otimização":
         dp = st.session_state.data_processor
         results = st.session_state.multiple_results
         
+        # Chaves do cache: dataset + conjunto de resultados das execuções
+        dataset_key = getattr(dp, 'dataset_hash', id(dp))
+        run_key = st.session_state.get('results_run_id')
+        
         st.header("🎯 Resultados da Otimização GRASP")
         
         # Summary statistics
@@ -381,7 +539,9 @@ elif selected_page == "Resultados da Otimização":
                 'Tempo (s)': result['execution_time'],
                 'Iterações': result['max_iterations'],
                 'Alpha': result['alpha'],
-                'Busca Local': result['local_search_iterations']
+                'Busca Local': result['local_search_iterations'],
+                'Iteração do Melhor': result.get('best_iteration', 0),
+                'Tempo até o Melhor (s)': result.get('time_to_best', 0.0)
             })
         
         comparison_df = pd.DataFrame(comparison_data)
@@ -401,16 +561,34 @@ elif selected_page == "Resultados da Otimização":
         st.subheader("⚙️ Parâmetros Utilizados")
         st.dataframe(comparison_df, use_container_width=True)
         
+        # Probabilidades aprendidas pelo GRASP reativo (estado final)
+        if results[-1].get('alpha_probabilities'):
+            st.subheader("🎲 Probabilidades do Alpha Reativo")
+            alpha_prob_df = pd.DataFrame({
+                'Alpha': list(results[-1]['alpha_probabilities'].keys()),
+                'Probabilidade': list(results[-1]['alpha_probabilities'].values())
+            })
+            fig_alpha = px.bar(
+                alpha_prob_df,
+                x='Alpha',
+                y='Probabilidade',
+                title="Probabilidade de Seleção de Cada Alpha ao Final das Execuções"
+            )
+            fig_alpha.update_layout(showlegend=False)
+            st.plotly_chart(fig_alpha, use_container_width=True)
+        
         # Convergence comparison
         st.subheader("🔄 Convergência dos Algoritmos")
         
         fig_convergence = go.Figure()
         
         for result in results:
+            # Traço reduzido: apenas as iterações em que o melhor custo mudou
             fig_convergence.add_trace(go.Scatter(
-                x=list(range(len(result['iteration_costs']))),
-                y=result['iteration_costs'],
+                x=result.trace_iterations,
+                y=result.trace_costs,
                 mode='lines',
+                line_shape='hv',
                 name=f"Execução {result['execution']}",
                 line=dict(width=2)
             ))
@@ -424,8 +602,55 @@ elif selected_page == "Resultados da Otimização":
         
         st.plotly_chart(fig_convergence, use_container_width=True)
         
+        # Perfil de execução por fase do GRASP
+        profiled_results = [r for r in results if r.get('profile')]
+        if profiled_results:
+            st.subheader("⏱️ Perfil de Execução por Fase")
+            
+            phase_labels = {
+                'construction': 'Construção',
+                'local_search': 'Busca Local',
+                'path_relinking': 'Path-Relinking',
+                'diversify_solution': 'Diversificação',
+                'convert_to_crossing_details': 'Conversão de Detalhes'
+            }
+            
+            profile_data = []
+            for result in profiled_results:
+                profile = result['profile']
+                row = {'Execução': f"Execução {result['execution']}"}
+                for phase, label in phase_labels.items():
+                    row[f'{label} (s)'] = profile[phase]['time']
+                    row[f'{label} (chamadas)'] = profile[phase]['calls']
+                row['Movimentos Avaliados'] = profile['moves_evaluated']
+                row['Movimentos Aceitos'] = profile['moves_accepted']
+                row['Tempo Total (s)'] = profile['total_time']
+                profile_data.append(row)
+            
+            profile_df = pd.DataFrame(profile_data)
+            
+            # Tempo por fase empilhado por execução
+            phase_time_df = profile_df.melt(
+                id_vars='Execução',
+                value_vars=[f'{label} (s)' for label in phase_labels.values()],
+                var_name='Fase',
+                value_name='Tempo (s)'
+            )
+            phase_time_df['Fase'] = phase_time_df['Fase'].str.replace(' (s)', '', regex=False)
+            
+            fig_profile = px.bar(
+                phase_time_df,
+                x='Execução',
+                y='Tempo (s)',
+                color='Fase',
+                title="Tempo Gasto em Cada Fase do GRASP"
+            )
+            st.plotly_chart(fig_profile, use_container_width=True)
+            st.dataframe(profile_df, use_container_width=True)
+        
         # Best solution details
         best_result = min(results, key=lambda x: x['best_cost'])
+        best_crossings = best_result.crossing_details(dp.all_pairs)
         st.subheader("🏆 Melhor Solução Encontrada")
         
         col1, col2, col3 = st.columns(3)
@@ -442,8 +667,8 @@ elif selected_page == "Resultados da Otimização":
         # Best crossings from optimization
         st.subheader("🎯 Melhores Cruzamentos Encontrados")
         
-        if 'best_crossings' in best_result and best_result['best_crossings']:
-            best_crossings_df = pd.DataFrame(best_result['best_crossings'])
+        if best_crossings:
+            best_crossings_df = pd.DataFrame(best_crossings)
             best_crossings_df = best_crossings_df.rename(columns={
                 'pair1_name': 'Par Animal 1',
                 'pair2_name': 'Par Animal 2', 
@@ -461,7 +686,7 @@ elif selected_page == "Resultados da Otimização":
             
             col1, col2, col3, col4 = st.columns(4)
             
-            coef_values = [c['coancestry'] for c in best_result['best_crossings']]
+            coef_values = [c['coancestry'] for c in best_crossings]
             
             with col1:
                 st.metric("Média", f"{np.mean(coef_values):.6f}")
@@ -508,38 +733,19 @@ elif selected_page == "Resultados da Otimização":
         # Matrix visualization with best crossings
         st.subheader("🗃️ Matriz de Cruzamentos com Destaques")
         
-        if 'optimizer' in best_result and hasattr(best_result['optimizer'], 'get_best_crossings_matrix'):
-            # Obter matriz com melhores cruzamentos destacados
-            best_crossings_matrix = best_result['optimizer'].get_best_crossings_matrix()
+        if best_result['best_solution'] and all(isinstance(x, tuple) for x in best_result['best_solution']):
+            # Marcar os melhores cruzamentos nas duas metades da matriz simétrica
+            best_rows = [i for i, j in best_result['best_solution']] + [j for i, j in best_result['best_solution']]
+            best_cols = [j for i, j in best_result['best_solution']] + [i for i, j in best_result['best_solution']]
             
-            # Criar visualização da matriz original com destaques
-            fig_matrix = px.imshow(
+            render_matrix_heatmap(
                 dp.coancestry_matrix,
-                labels=dict(x="Pares de Animais", y="Pares de Animais", color="Coancestralidade"),
-                x=[f'P{i+1}' for i in range(len(dp.all_pairs))],
-                y=[f'P{i+1}' for i in range(len(dp.all_pairs))],
-                color_continuous_scale="Viridis"
-            )
-            
-            # Adicionar marcadores para os melhores cruzamentos
-            best_x, best_y = np.where(best_crossings_matrix == 1)
-            
-            fig_matrix.add_scatter(
-                x=best_x,
-                y=best_y,
-                mode='markers',
-                marker=dict(symbol='star', size=10, color='red'),
-                name='Melhores Cruzamentos',
-                showlegend=True
-            )
-            
-            fig_matrix.update_layout(
+                key="heatmap_results",
                 title="Matriz de Coancestralidade com Melhores Cruzamentos Destacados (★)",
-                xaxis_title="Pares de Animais",
-                yaxis_title="Pares de Animais"
+                x_prefix='P', y_prefix='P',
+                x_title="Pares de Animais", y_title="Pares de Animais",
+                highlight_cells=(np.array(best_rows), np.array(best_cols))
             )
-            
-            st.plotly_chart(fig_matrix, use_container_width=True)
         
         # Solution analysis
         st.subheader("📈 Análise da Solução")
@@ -547,9 +753,9 @@ elif selected_page == "Resultados da Otimização":
         col1, col2 = st.columns(2)
         
         with col1:
-            if 'best_crossings' in best_result and best_result['best_crossings']:
+            if best_crossings:
                 st.write("**Distribuição de Coancestralidade dos Melhores Cruzamentos:**")
-                coef_values = [c['coancestry'] for c in best_result['best_crossings']]
+                coef_values = [c['coancestry'] for c in best_crossings]
                 
                 coancestry_fig = px.histogram(
                     x=coef_values,
@@ -577,10 +783,11 @@ elif selected_page == "Resultados da Otimização":
             st.write("**Qualidade da Solução vs. Todas as Possibilidades:**")
             
             # Comparar com todos os cruzamentos possíveis
-            if 'optimizer' in best_result and hasattr(best_result['optimizer'], 'get_all_crossings_ranked'):
-                all_crossings = best_result['optimizer'].get_all_crossings_ranked()
-                all_coef = [c['coancestry'] for c in all_crossings]
-                selected_coef = [c['coancestry'] for c in all_crossings if c['selected']]
+            if best_crossings:
+                all_coef, selected_coef = view_cache.get_or_compute(
+                    ('ranked_coefficients', dataset_key, run_key, best_result['execution']),
+                    lambda: best_result.ranked_coefficients(dp.coancestry_matrix)
+                )
                 
                 comparison_data = {
                     'Todos os Cruzamentos': all_coef,
@@ -598,71 +805,116 @@ elif selected_page == "Resultados da Otimização":
             else:
                 st.info("Comparação detalhada não disponível.")
         
+        # Ranking paginado de todos os cruzamentos possíveis
+        st.subheader("🏅 Ranking de Todos os Cruzamentos")
+        
+        # Índice ordenado compartilhado com as execuções (ordenado uma vez por conjunto de dados)
+        crossing_index = view_cache.get_or_compute(
+            ('crossing_index', dataset_key),
+            lambda: SortedCrossingIndex.from_matrix(dp.coancestry_matrix)
+        )
+        ranking = best_result.crossing_ranking(dp.coancestry_matrix, dp.all_pairs, crossing_index)
+        
+        col_rank1, col_rank2 = st.columns(2)
+        
+        with col_rank1:
+            ranking_page_size = st.selectbox(
+                "Cruzamentos por página:",
+                options=[25, 50, 100, 500],
+                index=2,
+                key="ranking_page_size"
+            )
+        
+        with col_rank2:
+            num_ranking_pages = ranking.num_pages(ranking_page_size)
+            ranking_page = st.number_input(
+                f"Página (de {num_ranking_pages}):",
+                min_value=1,
+                max_value=num_ranking_pages,
+                value=1,
+                key="ranking_page"
+            )
+        
+        ranking_df = view_cache.get_or_compute(
+            ('ranking_page', dataset_key, run_key, best_result['execution'], ranking_page_size, ranking_page),
+            lambda: ranking.page(ranking_page - 1, ranking_page_size)
+        )
+        
+        st.caption(f"{ranking.num_crossings:,} cruzamentos possíveis, ordenados por coancestralidade (menor primeiro)")
+        st.dataframe(
+            ranking_df.rename(columns={
+                'rank': 'Posição',
+                'pair1_name': 'Par Animal 1',
+                'pair2_name': 'Par Animal 2',
+                'coancestry': 'Coeficiente de Coancestralidade',
+                'selected': 'Selecionado'
+            })[['Posição', 'Par Animal 1', 'Par Animal 2', 'Coeficiente de Coancestralidade', 'Selecionado']],
+            use_container_width=True,
+            hide_index=True
+        )
+        
         # Download results
         st.subheader("💾 Download dos Resultados")
         
-        # Create comprehensive results CSV
-        all_results_data = []
-        for result in results:
-            base_data = {
-                'Execução': result['execution'],
-                'Custo_Total': result['best_cost'],
-                'Tempo_Execucao': result['execution_time'],
-                'Max_Iteracoes': result['max_iterations'],
-                'Alpha': result['alpha'],
-                'Busca_Local': result['local_search_iterations'],
-                'Iteracoes_Realizadas': result['final_iterations']
-            }
+        def build_results_df():
+            # Create comprehensive results CSV
+            all_results_data = []
+            for result in results:
+                base_data = {
+                    'Execução': result['execution'],
+                    'Custo_Total': result['best_cost'],
+                    'Tempo_Execucao': result['execution_time'],
+                    'Max_Iteracoes': result['max_iterations'],
+                    'Alpha': result['alpha'],
+                    'Busca_Local': result['local_search_iterations'],
+                    'Iteracoes_Realizadas': result['final_iterations'],
+                    'Iteracao_Melhor': result.get('best_iteration', 0),
+                    'Tempo_Ate_Melhor': result.get('time_to_best', 0.0)
+                }
             
-            # Add crossings data for this execution
-            if 'best_crossings' in result and result['best_crossings']:
-                # Novos dados de cruzamentos
-                for idx, crossing in enumerate(result['best_crossings']):
-                    row_data = base_data.copy()
-                    row_data.update({
-                        'Cruzamento_ID': idx + 1,
-                        'Par_Animal_1': crossing['pair1_name'],
-                        'Par_Animal_2': crossing['pair2_name'],
-                        'Coancestralidade': crossing['coancestry']
-                    })
-                    all_results_data.append(row_data)
-            else:
-                # Compatibilidade com versão anterior (fêmeas/machos)
-                for i, solution_item in enumerate(result['best_solution']):
-                    row_data = base_data.copy()
-                    if isinstance(solution_item, tuple):
-                        # Nova versão com pares
-                        pair1_idx, pair2_idx = solution_item
-                        row_data.update({
-                            'Cruzamento_ID': i + 1,
-                            'Par_Animal_1': dp.all_pairs[pair1_idx],
-                            'Par_Animal_2': dp.all_pairs[pair2_idx],
-                            'Coancestralidade': dp.coancestry_matrix[pair1_idx, pair2_idx]
-                        })
-                    else:
-                        # Versão antiga com machos/fêmeas
-                        male_idx = solution_item
+                # Add crossings data for this execution
+                if len(result.solution) > 0:
+                    # Novos dados de cruzamentos
+                    for idx, crossing in enumerate(result.crossing_details(dp.all_pairs)):
+                        row_data = base_data.copy()
                         row_data.update({
-                            'Femea_ID': f'f{i+1}',
-                            'Macho_ID': f'm{male_idx+1}',
-                            'Femea_Original': dp.females[i] if hasattr(dp, 'females') else f'f{i+1}',
-                            'Macho_Original': dp.males[male_idx] if hasattr(dp, 'males') else f'm{male_idx+1}',
-                            'Coancestralidade': dp.breeding_matrix[i, male_idx] if hasattr(dp, 'breeding_matrix') else 0
+                            'Cruzamento_ID': idx + 1,
+                            'Par_Animal_1': crossing['pair1_name'],
+                            'Par_Animal_2': crossing['pair2_name'],
+                            'Coancestralidade': crossing['coancestry']
                         })
-                    all_results_data.append(row_data)
+                        all_results_data.append(row_data)
+                else:
+                    # Compatibilidade com versão anterior (fêmeas/machos)
+                    for i, solution_item in enumerate(result['best_solution']):
+                        row_data = base_data.copy()
+                        if isinstance(solution_item, tuple):
+                            # Nova versão com pares
+                            pair1_idx, pair2_idx = solution_item
+                            row_data.update({
+                                'Cruzamento_ID': i + 1,
+                                'Par_Animal_1': dp.all_pairs[pair1_idx],
+                                'Par_Animal_2': dp.all_pairs[pair2_idx],
+                                'Coancestralidade': dp.coancestry_matrix[pair1_idx, pair2_idx]
+                            })
+                        else:
+                            # Versão antiga com machos/fêmeas
+                            male_idx = solution_item
+                            row_data.update({
+                                'Femea_ID': f'f{i+1}',
+                                'Macho_ID': f'm{male_idx+1}',
+                                'Femea_Original': dp.females[i] if hasattr(dp, 'females') else f'f{i+1}',
+                                'Macho_Original': dp.males[male_idx] if hasattr(dp, 'males') else f'm{male_idx+1}',
+                                'Coancestralidade': dp.breeding_matrix[i, male_idx] if hasattr(dp, 'breeding_matrix') else 0
+                            })
+                        all_results_data.append(row_data)
         
-        results_df = pd.DataFrame(all_results_data)
+            return pd.DataFrame(all_results_data)
         
-        csv_buffer = io.StringIO()
-        results_df.to_csv(csv_buffer, index=False)
-        csv_data = csv_buffer.getvalue()
+        results_df = view_cache.get_or_compute(('results_df', dataset_key, run_key), build_results_df)
         
-        st.download_button(
-            label="📥 Download Resultados Completos (CSV)",
-            data=csv_data,
-            file_name=f"resultados_grasp_{int(time.time())}.csv",
-            mime="text/csv"
-        )
+        download_dataframe("📥 Download Resultados Completos", results_df, "resultados_grasp",
+                           cache_key=('results', dataset_key, run_key))
         
         # Gerar arquivos especiais para a melhor solução
         st.subheader("🎯 Arquivos da Melhor Solução")
@@ -671,9 +923,9 @@ elif selected_page == "Resultados da Otimização":
         
         with col1:
             # CSV com os melhores cruzamentos
-            if 'best_crossings' in best_result and best_result['best_crossings']:
+            if best_crossings:
                 # Novos dados de cruzamentos
-                best_crossings_df = pd.DataFrame(best_result['best_crossings'])
+                best_crossings_df = pd.DataFrame(best_crossings)
                 best_crossings_df = best_crossings_df.rename(columns={
                     'pair1_name': 'Par_Animal_1',
                     'pair2_name': 'Par_Animal_2',
@@ -682,16 +934,7 @@ elif selected_page == "Resultados da Otimização":
                 best_crossings_df = best_crossings_df[['Par_Animal_1', 'Par_Animal_2', 'Coeficiente_Coancestralidade']]
                 
                 # Já está ordenado por coancestralidade (menor para maior)
-                csv_best_buffer = io.StringIO()
-                best_crossings_df.to_csv(csv_best_buffer, index=False)
-                csv_best_data = csv_best_buffer.getvalue()
-                
-                st.download_button(
-                    label="📊 Download Melhores Cruzamentos (CSV)",
-                    data=csv_best_data,
-                    file_name=f"melhores_cruzamentos_{int(time.time())}.csv",
-                    mime="text/csv"
-                )
+                download_dataframe("📊 Download Melhores Cruzamentos", best_crossings_df, "melhores_cruzamentos")
                 
                 # Mostrar preview dos melhores cruzamentos
                 st.write("**Preview dos Melhores Cruzamentos:**")
@@ -724,16 +967,7 @@ elif selected_page == "Resultados da Otimização":
                 sort_column = 'Coeficiente_Coancestralidade' if 'Coeficiente_Coancestralidade' in best_breeding_df.columns else 'Coancestralidade'
                 best_breeding_df = best_breeding_df.sort_values(sort_column)
                 
-                csv_best_buffer = io.StringIO()
-                best_breeding_df.to_csv(csv_best_buffer, index=False)
-                csv_best_data = csv_best_buffer.getvalue()
-                
-                st.download_button(
-                    label="📊 Download Melhores Cruzamentos (CSV)",
-                    data=csv_best_data,
-                    file_name=f"melhores_cruzamentos_{int(time.time())}.csv",
-                    mime="text/csv"
-                )
+                download_dataframe("📊 Download Melhores Cruzamentos", best_breeding_df, "melhores_cruzamentos")
                 
                 # Mostrar preview dos melhores cruzamentos
                 st.write("**Preview dos Melhores Cruzamentos:**")
@@ -744,74 +978,67 @@ elif selected_page == "Resultados da Otimização":
             if hasattr(dp, 'breeding_matrix') and hasattr(dp, 'females') and hasattr(dp, 'males'):
                 st.write("**Melhores Cruzamentos por Fêmea:**")
                 
-                # Encontrar o melhor macho para cada fêmea
-                best_males_per_female = []
-                for i in range(len(dp.females)):
-                    # Encontrar o macho com menor coancestralidade para esta fêmea
-                    best_male_idx = np.argmin(dp.breeding_matrix[i, :])
-                    best_coancestry = dp.breeding_matrix[i, best_male_idx]
-                    
-                    best_males_per_female.append({
-                        'Fêmea': f'f{i+1}',
-                        'Fêmea_Original': dp.females[i],
-                        'Melhor_Macho': f'm{best_male_idx+1}',
-                        'Macho_Original': dp.males[best_male_idx],
-                        'Coancestralidade': best_coancestry
+                def build_per_female_exports():
+                    # Encontrar o macho com menor coancestralidade para cada fêmea
+                    best_male_indices = np.argmin(dp.breeding_matrix, axis=1)
+                    best_males_df = pd.DataFrame({
+                        'Fêmea': [f'f{i+1}' for i in range(len(dp.females))],
+                        'Fêmea_Original': dp.females,
+                        'Melhor_Macho': [f'm{idx+1}' for idx in best_male_indices],
+                        'Macho_Original': [dp.males[idx] for idx in best_male_indices],
+                        'Coancestralidade': dp.breeding_matrix[np.arange(len(dp.females)), best_male_indices]
                     })
+                    
+                    # Criar matriz com destaques dos melhores cruzamentos
+                    breeding_matrix_for_females = pd.DataFrame(
+                        dp.breeding_matrix,
+                        index=[f'f{i+1} ({dp.females[i]})' for i in range(len(dp.females))],
+                        columns=[f'm{i+1} ({dp.males[i]})' for i in range(len(dp.males))]
+                    )
+                    
+                    # Destacar os melhores cruzamentos na matriz (apenas se for compatível)
+                    matrix_with_best = breeding_matrix_for_females.astype(str)
+                    values = matrix_with_best.to_numpy(copy=True)
+                    
+                    # Destacar melhor macho para cada fêmea
+                    rows = np.arange(len(dp.females))
+                    values[rows, best_male_indices] = ["★ " + v for v in values[rows, best_male_indices]]
+                    
+                    # Se há solução da otimização, destacar também
+                    if 'best_solution' in best_result and all(isinstance(x, int) for x in best_result['best_solution']):
+                        for i, male_idx in enumerate(best_result['best_solution']):
+                            if i < len(dp.females) and male_idx < len(dp.males):
+                                original_value = breeding_matrix_for_females.iloc[i, male_idx]
+                                values[i, male_idx] = f"🎯 {original_value}"
+                    
+                    matrix_with_best = pd.DataFrame(values, index=matrix_with_best.index,
+                                                    columns=matrix_with_best.columns)
+                    
+                    return {
+                        'best_males_df': best_males_df,
+                        'matrix_df': matrix_with_best,
+                        'matrix_preview': matrix_with_best.head(10)
+                    }
                 
-                best_males_df = pd.DataFrame(best_males_per_female)
-                st.dataframe(best_males_df, use_container_width=True)
-                
-                # Download dos melhores cruzamentos por fêmea
-                csv_best_males_buffer = io.StringIO()
-                best_males_df.to_csv(csv_best_males_buffer, index=False)
-                csv_best_males_data = csv_best_males_buffer.getvalue()
-                
-                st.download_button(
-                    label="📋 Download Melhores Cruzamentos por Fêmea (CSV)",
-                    data=csv_best_males_data,
-                    file_name=f"melhores_cruzamentos_por_femea_{int(time.time())}.csv",
-                    mime="text/csv"
-                )
-                
-                # Criar matriz com destaques dos melhores cruzamentos
-                breeding_matrix_for_females = pd.DataFrame(
-                    dp.breeding_matrix,
-                    index=[f'f{i+1} ({dp.females[i]})' for i in range(len(dp.females))],
-                    columns=[f'm{i+1} ({dp.males[i]})' for i in range(len(dp.males))]
+                per_female_exports = view_cache.get_or_compute(
+                    ('per_female_exports', dataset_key, run_key, best_result['execution']),
+                    build_per_female_exports
                 )
                 
-                # Destacar os melhores cruzamentos na matriz (apenas se for compatível)
-                matrix_with_best = breeding_matrix_for_females.copy().astype(str)
-                
-                # Destacar melhor macho para cada fêmea
-                for i in range(len(dp.females)):
-                    best_male_idx = np.argmin(dp.breeding_matrix[i, :])
-                    original_value = breeding_matrix_for_females.iloc[i, best_male_idx]
-                    matrix_with_best.iloc[i, best_male_idx] = f"★ {original_value}"
+                st.dataframe(per_female_exports['best_males_df'], use_container_width=True)
                 
-                # Se há solução da otimização, destacar também
-                if 'best_solution' in best_result and all(isinstance(x, int) for x in best_result['best_solution']):
-                    for i, male_idx in enumerate(best_result['best_solution']):
-                        if i < len(dp.females) and male_idx < len(dp.males):
-                            original_value = breeding_matrix_for_females.iloc[i, male_idx]
-                            matrix_with_best.iloc[i, male_idx] = f"🎯 {original_value}"
-                
-                csv_matrix_buffer = io.StringIO()
-                matrix_with_best.to_csv(csv_matrix_buffer)
-                csv_matrix_data = csv_matrix_buffer.getvalue()
+                # Download dos melhores cruzamentos por fêmea
+                per_female_key = ('per_female', dataset_key, run_key, best_result['execution'])
+                download_dataframe("📋 Download Melhores Cruzamentos por Fêmea", per_female_exports['best_males_df'],
+                                   "melhores_cruzamentos_por_femea", cache_key=per_female_key + ('best_males',))
                 
-                st.download_button(
-                    label="📋 Download Matriz de Cruzamentos (CSV)",
-                    data=csv_matrix_data,
-                    file_name=f"matriz_cruzamentos_{int(time.time())}.csv",
-                    mime="text/csv"
-                )
+                download_dataframe("📋 Download Matriz de Cruzamentos", per_female_exports['matrix_df'],
+                                   "matriz_cruzamentos", cache_key=per_female_key + ('matrix',), index=True)
                 
                 # Mostrar preview da matriz
                 st.write("**Preview da Matriz de Cruzamentos:**")
                 st.write("(★ = melhor para cada fêmea, 🎯 = selecionado pela otimização)")
-                st.dataframe(matrix_with_best.head(10), use_container_width=True)
+                st.dataframe(per_female_exports['matrix_preview'], use_container_width=True)
             else:
                 st.info("Matriz de breeding tradicional não disponível com a nova implementação.")
         
@@ -852,120 +1079,70 @@ elif selected_page == "Resultados da Otimização":
             num_females = len(dp.females)
             num_males = len(dp.males)
             
-            # Algoritmo melhorado para distribuir machos para fêmeas
-            def distribute_males_improved(breeding_matrix, females, males, max_recommendations_per_female=5, allow_reuse=False):
-                """
-                Distribui machos para fêmeas com configurações flexíveis.
-                Prioriza melhores cruzamentos (menor coancestralidade).
-                """
-                num_females = len(females)
-                num_males = len(males)
-                
-                # Criar lista de todos os cruzamentos possíveis
-                all_crossings = []
-                for i in range(num_females):
-                    for j in range(num_males):
-                        all_crossings.append({
-                            'female_idx': i,
-                            'male_idx': j,
-                            'coancestry': breeding_matrix[i, j]
-                        })
-                
-                # Ordenar por coancestralidade (melhor primeiro)
-                all_crossings.sort(key=lambda x: x['coancestry'])
-                
-                # Inicializar matriz de recomendações
-                female_recommendations = [[] for _ in range(num_females)]
-                used_males = set()
-                
-                if allow_reuse:
-                    # Permitir reutilização de machos - simplesmente pegar os melhores para cada fêmea
-                    for i in range(num_females):
-                        female_crossings = [c for c in all_crossings if c['female_idx'] == i]
-                        female_recommendations[i] = female_crossings[:max_recommendations_per_female]
-                else:
-                    # Distribuir sem reutilização
-                    # Primeira rodada: melhor para cada fêmea
-                    for crossing in all_crossings:
-                        female_idx = crossing['female_idx']
-                        male_idx = crossing['male_idx']
-                        
-                        if len(female_recommendations[female_idx]) == 0 and male_idx not in used_males:
-                            female_recommendations[female_idx].append(crossing)
-                            used_males.add(male_idx)
-                    
-                    # Rodadas subsequentes: completar recomendações
-                    for round_num in range(1, max_recommendations_per_female):
-                        random.shuffle(all_crossings)  # Embaralhar para diversidade
-                        for crossing in all_crossings:
-                            female_idx = crossing['female_idx']
-                            male_idx = crossing['male_idx']
-                            
-                            if (len(female_recommendations[female_idx]) == round_num and 
-                                male_idx not in used_males):
-                                female_recommendations[female_idx].append(crossing)
-                                used_males.add(male_idx)
-                                
-                                if len(used_males) >= num_males:
-                                    break
-                        
-                        if len(used_males) >= num_males:
-                            break
-                
-                return female_recommendations
-            
             # Gerar recomendações com configurações personalizadas
-            female_recommendations = distribute_males_improved(
-                dp.breeding_matrix, dp.females, dp.males, 
-                num_recommendations, allow_reuse
+            # As indicações dependem apenas do conjunto de dados e das configurações,
+            # então ficam no cache entre as interações com a página
+            recommendations_key = (dataset_key, num_recommendations, allow_reuse)
+            female_recommendations = view_cache.get_or_compute(
+                ('recommendations',) + recommendations_key,
+                lambda: distribute_males_improved(
+                    dp.breeding_matrix, dp.females, dp.males, 
+                    num_recommendations, allow_reuse
+                )
             )
             
-            # Criar matriz de indicações
-            recommendations_matrix = []
+            def build_recommendations_df():
+                # Criar matriz de indicações
+                recommendations_matrix = []
             
-            for i in range(num_females):
-                # Criar linha da matriz
-                female_row = {
-                    'Fêmea': f'f{i+1}',
-                    'ID_Original': dp.females[i]
-                }
+                for i in range(num_females):
+                    # Criar linha da matriz
+                    female_row = {
+                        'Fêmea': f'f{i+1}',
+                        'ID_Original': dp.females[i]
+                    }
                 
-                # Calcular estatísticas da fêmea
-                if female_recommendations[i]:
-                    best_coancestry = female_recommendations[i][0]['coancestry']
-                    avg_coancestry = np.mean([c['coancestry'] for c in female_recommendations[i]])
-                    female_row['Melhor_Coancestralidade'] = best_coancestry
-                    female_row['Média_Coancestralidade'] = avg_coancestry
-                else:
-                    female_row['Melhor_Coancestralidade'] = 1.0
-                    female_row['Média_Coancestralidade'] = 1.0
+                    # Calcular estatísticas da fêmea
+                    if female_recommendations[i]:
+                        best_coancestry = female_recommendations[i][0]['coancestry']
+                        avg_coancestry = np.mean([c['coancestry'] for c in female_recommendations[i]])
+                        female_row['Melhor_Coancestralidade'] = best_coancestry
+                        female_row['Média_Coancestralidade'] = avg_coancestry
+                    else:
+                        female_row['Melhor_Coancestralidade'] = 1.0
+                        female_row['Média_Coancestralidade'] = 1.0
                 
-                # Adicionar as recomendações para esta fêmea
-                for j in range(num_recommendations):
-                    if j < len(female_recommendations[i]):
-                        crossing = female_recommendations[i][j]
-                        male_idx = crossing['male_idx']
-                        coancestry = crossing['coancestry']
+                    # Adicionar as recomendações para esta fêmea
+                    for j in range(num_recommendations):
+                        if j < len(female_recommendations[i]):
+                            crossing = female_recommendations[i][j]
+                            male_idx = crossing['male_idx']
+                            coancestry = crossing['coancestry']
                         
-                        # Classificar qualidade do cruzamento
-                        if coancestry < 0.05:
-                            quality = "🟢 Excelente"
-                        elif coancestry < 0.15:
-                            quality = "🟡 Bom"
-                        elif coancestry < 0.3:
-                            quality = "🟠 Regular"
-                        else:
-                            quality = "🔴 Evitar"
+                            # Classificar qualidade do cruzamento
+                            if coancestry < 0.05:
+                                quality = "🟢 Excelente"
+                            elif coancestry < 0.15:
+                                quality = "🟡 Bom"
+                            elif coancestry < 0.3:
+                                quality = "🟠 Regular"
+                            else:
+                                quality = "🔴 Evitar"
                         
-                        male_info = f"m{male_idx+1} ({dp.males[male_idx]}) - {coancestry:.6f} {quality}"
-                        female_row[f'1° Melhor' if j == 0 else f'{j+1}° Melhor'] = male_info
-                    else:
-                        female_row[f'{j+1}° Melhor'] = "N/A - Sem machos disponíveis"
+                            male_info = f"m{male_idx+1} ({dp.males[male_idx]}) - {coancestry:.6f} {quality}"
+                            female_row[f'1° Melhor' if j == 0 else f'{j+1}° Melhor'] = male_info
+                        else:
+                            female_row[f'{j+1}° Melhor'] = "N/A - Sem machos disponíveis"
                 
-                recommendations_matrix.append(female_row)
+                    recommendations_matrix.append(female_row)
             
-            # Converter para DataFrame
-            recommendations_df = pd.DataFrame(recommendations_matrix)
+                # Converter para DataFrame
+                recommendations_df = pd.DataFrame(recommendations_matrix)
+                return recommendations_df
+            
+            recommendations_df = view_cache.get_or_compute(
+                ('recommendations_df',) + recommendations_key, build_recommendations_df
+            )
             
             # Ordenar o DataFrame conforme solicitado
             if sort_by_quality == "Melhor Coancestralidade":
@@ -976,28 +1153,34 @@ elif selected_page == "Resultados da Otimização":
             # Mostrar estatísticas detalhadas
             st.subheader("📊 Estatísticas da Matriz de Indicações")
             
-            # Calcular estatísticas
-            all_coancestries = []
-            best_coancestries = []
-            males_used = set()
-            quality_counts = {"🟢 Excelente": 0, "🟡 Bom": 0, "🟠 Regular": 0, "🔴 Evitar": 0}
+            def build_recommendation_stats():
+                # Calcular estatísticas
+                all_coancestries = []
+                best_coancestries = []
+                males_used = set()
+                quality_counts = {"🟢 Excelente": 0, "🟡 Bom": 0, "🟠 Regular": 0, "🔴 Evitar": 0}
             
-            for i in range(num_females):
-                if female_recommendations[i]:
-                    best_coancestries.append(female_recommendations[i][0]['coancestry'])
-                    for rec in female_recommendations[i]:
-                        all_coancestries.append(rec['coancestry'])
-                        males_used.add(rec['male_idx'])
+                for i in range(num_females):
+                    if female_recommendations[i]:
+                        best_coancestries.append(female_recommendations[i][0]['coancestry'])
+                        for rec in female_recommendations[i]:
+                            all_coancestries.append(rec['coancestry'])
+                            males_used.add(rec['male_idx'])
                         
-                        # Contar qualidade
-                        if rec['coancestry'] < 0.05:
-                            quality_counts["🟢 Excelente"] += 1
-                        elif rec['coancestry'] < 0.15:
-                            quality_counts["🟡 Bom"] += 1
-                        elif rec['coancestry'] < 0.3:
-                            quality_counts["🟠 Regular"] += 1
-                        else:
-                            quality_counts["🔴 Evitar"] += 1
+                            # Contar qualidade
+                            if rec['coancestry'] < 0.05:
+                                quality_counts["🟢 Excelente"] += 1
+                            elif rec['coancestry'] < 0.15:
+                                quality_counts["🟡 Bom"] += 1
+                            elif rec['coancestry'] < 0.3:
+                                quality_counts["🟠 Regular"] += 1
+                            else:
+                                quality_counts["🔴 Evitar"] += 1
+                return all_coancestries, best_coancestries, males_used, quality_counts
+            
+            all_coancestries, best_coancestries, males_used, quality_counts = view_cache.get_or_compute(
+                ('recommendation_stats',) + recommendations_key, build_recommendation_stats
+            )
             
             # Primeira linha de estatísticas
             col1, col2, col3, col4 = st.columns(4)
@@ -1052,23 +1235,29 @@ elif selected_page == "Resultados da Otimização":
                 st.dataframe(display_df, use_container_width=True, height=400)
             
             with tab2:
-                # Análise de qualidade por fêmea
-                quality_analysis = []
-                for i in range(num_females):
-                    if female_recommendations[i]:
-                        female_quality = {
-                            'Fêmea': f'f{i+1}',
-                            'ID_Original': dp.females[i],
-                            'Melhor_Coancestralidade': female_recommendations[i][0]['coancestry'],
-                            'Média_Coancestralidade': np.mean([c['coancestry'] for c in female_recommendations[i]]),
-                            'Num_Excelentes': sum(1 for c in female_recommendations[i] if c['coancestry'] < 0.05),
-                            'Num_Bons': sum(1 for c in female_recommendations[i] if 0.05 <= c['coancestry'] < 0.15),
-                            'Num_Regulares': sum(1 for c in female_recommendations[i] if 0.15 <= c['coancestry'] < 0.3),
-                            'Num_Evitar': sum(1 for c in female_recommendations[i] if c['coancestry'] >= 0.3)
-                        }
-                        quality_analysis.append(female_quality)
+                def build_quality_df():
+                    # Análise de qualidade por fêmea
+                    quality_analysis = []
+                    for i in range(num_females):
+                        if female_recommendations[i]:
+                            female_quality = {
+                                'Fêmea': f'f{i+1}',
+                                'ID_Original': dp.females[i],
+                                'Melhor_Coancestralidade': female_recommendations[i][0]['coancestry'],
+                                'Média_Coancestralidade': np.mean([c['coancestry'] for c in female_recommendations[i]]),
+                                'Num_Excelentes': sum(1 for c in female_recommendations[i] if c['coancestry'] < 0.05),
+                                'Num_Bons': sum(1 for c in female_recommendations[i] if 0.05 <= c['coancestry'] < 0.15),
+                                'Num_Regulares': sum(1 for c in female_recommendations[i] if 0.15 <= c['coancestry'] < 0.3),
+                                'Num_Evitar': sum(1 for c in female_recommendations[i] if c['coancestry'] >= 0.3)
+                            }
+                            quality_analysis.append(female_quality)
                 
-                quality_df = pd.DataFrame(quality_analysis)
+                    quality_df = pd.DataFrame(quality_analysis)
+                    return quality_df
+                
+                quality_df = view_cache.get_or_compute(
+                    ('recommendation_quality',) + recommendations_key, build_quality_df
+                )
                 st.dataframe(quality_df, use_container_width=True)
             
             with tab3:
@@ -1108,81 +1297,72 @@ elif selected_page == "Resultados da Otimização":
             # Criar matriz melhorada para download
             st.subheader("💾 Download da Matriz de Indicações")
             
-            # Preparar dados para download
-            download_matrix = []
-            for i in range(num_females):
-                base_row = {
-                    'Femea': f'f{i+1}',
-                    'Femea_Original': dp.females[i],
-                    'Melhor_Coancestralidade': female_recommendations[i][0]['coancestry'] if female_recommendations[i] else 1.0,
-                    'Media_Coancestralidade': np.mean([c['coancestry'] for c in female_recommendations[i]]) if female_recommendations[i] else 1.0,
-                    'Num_Indicacoes': len(female_recommendations[i])
-                }
+            def build_recommendation_exports():
+                # Preparar dados para download
+                download_matrix = []
+                for i in range(num_females):
+                    base_row = {
+                        'Femea': f'f{i+1}',
+                        'Femea_Original': dp.females[i],
+                        'Melhor_Coancestralidade': female_recommendations[i][0]['coancestry'] if female_recommendations[i] else 1.0,
+                        'Media_Coancestralidade': np.mean([c['coancestry'] for c in female_recommendations[i]]) if female_recommendations[i] else 1.0,
+                        'Num_Indicacoes': len(female_recommendations[i])
+                    }
                 
-                # Adicionar as recomendações desta fêmea
-                for j in range(num_recommendations):
-                    if j < len(female_recommendations[i]):
-                        crossing = female_recommendations[i][j]
-                        male_idx = crossing['male_idx']
-                        coancestry = crossing['coancestry']
+                    # Adicionar as recomendações desta fêmea
+                    for j in range(num_recommendations):
+                        if j < len(female_recommendations[i]):
+                            crossing = female_recommendations[i][j]
+                            male_idx = crossing['male_idx']
+                            coancestry = crossing['coancestry']
                         
-                        # Classificar qualidade
-                        if coancestry < 0.05:
-                            quality = "Excelente"
-                        elif coancestry < 0.15:
-                            quality = "Bom"
-                        elif coancestry < 0.3:
-                            quality = "Regular"
-                        else:
-                            quality = "Evitar"
+                            # Classificar qualidade
+                            if coancestry < 0.05:
+                                quality = "Excelente"
+                            elif coancestry < 0.15:
+                                quality = "Bom"
+                            elif coancestry < 0.3:
+                                quality = "Regular"
+                            else:
+                                quality = "Evitar"
                         
-                        base_row[f'Macho_{j+1}'] = f"m{male_idx+1}"
-                        base_row[f'Macho_Original_{j+1}'] = dp.males[male_idx]
-                        base_row[f'Coancestralidade_{j+1}'] = coancestry
-                        base_row[f'Qualidade_{j+1}'] = quality
-                    else:
-                        base_row[f'Macho_{j+1}'] = "N/A"
-                        base_row[f'Macho_Original_{j+1}'] = "N/A"
-                        base_row[f'Coancestralidade_{j+1}'] = "N/A"
-                        base_row[f'Qualidade_{j+1}'] = "N/A"
+                            base_row[f'Macho_{j+1}'] = f"m{male_idx+1}"
+                            base_row[f'Macho_Original_{j+1}'] = dp.males[male_idx]
+                            base_row[f'Coancestralidade_{j+1}'] = coancestry
+                            base_row[f'Qualidade_{j+1}'] = quality
+                        else:
+                            base_row[f'Macho_{j+1}'] = "N/A"
+                            base_row[f'Macho_Original_{j+1}'] = "N/A"
+                            base_row[f'Coancestralidade_{j+1}'] = "N/A"
+                            base_row[f'Qualidade_{j+1}'] = "N/A"
                 
-                download_matrix.append(base_row)
+                    download_matrix.append(base_row)
             
-            download_df = pd.DataFrame(download_matrix)
+                download_df = pd.DataFrame(download_matrix)
+                
+                # Download simplificado apenas com indicações
+                simple_cols = ['Femea', 'Femea_Original'] + [f'Macho_Original_{j+1}' for j in range(num_recommendations)] + [f'Coancestralidade_{j+1}' for j in range(num_recommendations)]
+                
+                return download_df, download_df[simple_cols]
+            
+            download_df, download_simple_df = view_cache.get_or_compute(
+                ('recommendation_exports',) + recommendations_key, build_recommendation_exports
+            )
             
             # Opções de download
             col_dl1, col_dl2 = st.columns(2)
             
             with col_dl1:
                 # Download completo com todas as colunas
-                csv_buffer = io.StringIO()
-                download_df.to_csv(csv_buffer, index=False)
-                csv_data = csv_buffer.getvalue()
-                
-                st.download_button(
-                    label="💾 Download Matriz Completa (CSV)",
-                    data=csv_data,
-                    file_name=f"matriz_indicacoes_completa_{int(time.time())}.csv",
-                    mime="text/csv",
-                    help="Inclui todas as colunas com estatísticas e qualidade"
-                )
+                download_dataframe("💾 Download Matriz Completa", download_df, "matriz_indicacoes_completa",
+                                   cache_key=('recommendations_full',) + recommendations_key,
+                                   help="Inclui todas as colunas com estatísticas e qualidade")
             
             with col_dl2:
                 # Download simplificado apenas com indicações
-                simple_cols = ['Femea', 'Femea_Original'] + [f'Macho_Original_{j+1}' for j in range(num_recommendations)] + [f'Coancestralidade_{j+1}' for j in range(num_recommendations)]
-                simple_df = download_df[simple_cols]
-                
-                csv_buffer_simple = io.StringIO()
-                simple_df.to_csv(csv_buffer_simple, index=False)
-                csv_simple_data = csv_buffer_simple.getvalue()
-                
-                st.download_button(
-                    label="💾 Download Matriz Simples (CSV)",
-                    data=csv_simple_data,
-                    file_name=f"matriz_indicacoes_simples_{int(time.time())}.csv",
-                    mime="text/csv",
-                    help="Apenas fêmeas, machos e coancestralidade"
-                )
+                download_dataframe("💾 Download Matriz Simples", download_simple_df, "matriz_indicacoes_simples",
+                                   cache_key=('recommendations_simple',) + recommendations_key,
+                                   help="Apenas fêmeas, machos e coancestralidade")
             
             # Criar função para destacar melhores recomendações
             def create_best_crossings_matrix(female_recommendations, num_females, num_males):
@@ -1199,7 +1379,10 @@ elif selected_page == "Resultados da Otimização":
                 return best_matrix
             
             # Criar matriz dos melhores cruzamentos
-            best_matrix = create_best_crossings_matrix(female_recommendations, num_females, num_males)
+            best_matrix = view_cache.get_or_compute(
+                ('best_matrix',) + recommendations_key,
+                lambda: create_best_crossings_matrix(female_recommendations, num_females, num_males)
+            )
             
             # Visualização da matriz otimizada
             st.subheader("🗺️ Visualização da Matriz Otimizada")
@@ -1299,10 +1482,11 @@ elif selected_page == "Resultados da Otimização":
             st.header("🔬 Otimização GRASP dos Melhores Cruzamentos")
             st.info("Aplicando algoritmo GRASP especificamente na matriz de melhores cruzamentos para encontrar a solução ótima.")
             
-            # Criar matriz reduzida com apenas os melhores cruzamentos
+            # Criar grafo de conflitos com apenas os melhores cruzamentos
             def create_best_crossings_matrix(female_recommendations, num_females, num_males):
                 """
-                Cria uma matriz reduzida contendo apenas os melhores cruzamentos identificados.
+                Reúne os melhores cruzamentos identificados e o grafo de conflitos entre eles
+                (mesma fêmea ou mesmo macho).
                 """
                 # Coletar todos os cruzamentos únicos das recomendações
                 all_crossings = []
@@ -1325,33 +1509,11 @@ elif selected_page == "Resultados da Otimização":
                 
                 best_crossings_data = list(unique_crossings.values())
                 
-                # Criar matriz quadrada de coancestralidade para GRASP
-                matrix_size = len(best_crossings_data)
-                grasp_matrix = np.full((matrix_size, matrix_size), 1.0)  # Inicializar com valor alto
-                
-                # Diagonal principal com os coeficientes de coancestralidade
-                for i in range(matrix_size):
-                    grasp_matrix[i, i] = best_crossings_data[i]['coancestry']
-                
-                # Penalizar cruzamentos que usam a mesma fêmea ou mesmo macho
-                for i in range(matrix_size):
-                    for j in range(i + 1, matrix_size):
-                        crossing_i = best_crossings_data[i]
-                        crossing_j = best_crossings_data[j]
-                        
-                        # Se usam a mesma fêmea ou mesmo macho, aumentar penalidade
-                        if (crossing_i['female_idx'] == crossing_j['female_idx'] or 
-                            crossing_i['male_idx'] == crossing_j['male_idx']):
-                            penalty = max(crossing_i['coancestry'], crossing_j['coancestry']) * 10
-                            grasp_matrix[i, j] = penalty
-                            grasp_matrix[j, i] = penalty
-                        else:
-                            # Cruzamentos compatíveis têm menor penalidade
-                            avg_coancestry = (crossing_i['coancestry'] + crossing_j['coancestry']) / 2
-                            grasp_matrix[i, j] = avg_coancestry
-                            grasp_matrix[j, i] = avg_coancestry
+                # Grafo de conflitos implícito: cruzamentos que usam a mesma fêmea ou
+                # o mesmo macho são encontrados pelos buckets, sem matriz m x m
+                conflict_graph = CrossingConflictGraph(best_crossings_data)
                 
-                return grasp_matrix, best_crossings_data
+                return conflict_graph, best_crossings_data
             
             # Configuração do GRASP
             col_grasp1, col_grasp2, col_grasp3 = st.columns(3)
@@ -1360,7 +1522,7 @@ elif selected_page == "Resultados da Otimização":
                 grasp_iterations = st.slider(
                     "Iterações GRASP:",
                     min_value=10,
-                    max_value=200,
+                    max_value=5000,
                     value=100,
                     help="Número de iterações para o algoritmo GRASP"
                 )
@@ -1388,99 +1550,18 @@ elif selected_page == "Resultados da Otimização":
             if st.button("🚀 Executar GRASP nos Melhores Cruzamentos"):
                 with st.spinner("Executando otimização GRASP..."):
                     # Criar matriz dos melhores cruzamentos
-                    grasp_matrix, best_crossings_data = create_best_crossings_matrix(
-                        female_recommendations, num_females, num_males
+                    conflict_graph, best_crossings_data = view_cache.get_or_compute(
+                        ('conflict_graph',) + recommendations_key,
+                        lambda: create_best_crossings_matrix(female_recommendations, num_females, num_males)
                     )
                     
-                    st.write(f"Debug: Matriz GRASP criada com {len(best_crossings_data)} cruzamentos")
+                    st.write(f"Debug: Grafo de conflitos criado com {len(best_crossings_data)} cruzamentos")
                     
                     if len(best_crossings_data) > 0:
-                        # Implementar GRASP especializado para seleção de cruzamentos
-                        def grasp_crossing_selection(crossings_data, matrix, max_selections, iterations, alpha):
-                            """
-                            GRASP especializado para seleção de melhores cruzamentos por fêmea.
-                            """
-                            best_solution = None
-                            best_cost = float('inf')
-                            iteration_costs = []
-                            
-                            for iteration in range(iterations):
-                                # Fase de Construção Greedy Randomizada
-                                selected_indices = []
-                                used_females = set()
-                                used_males = set()
-                                current_cost = 0
-                                
-                                # Criar lista de candidatos
-                                candidates = list(range(len(crossings_data)))
-                                
-                                while len(selected_indices) < max_selections and candidates:
-                                    # Calcular custos para candidatos válidos
-                                    valid_candidates = []
-                                    for idx in candidates:
-                                        crossing = crossings_data[idx]
-                                        # Verificar se não conflita com seleções anteriores
-                                        if (crossing['female_idx'] not in used_females and 
-                                            crossing['male_idx'] not in used_males):
-                                            valid_candidates.append((idx, crossing['coancestry']))
-                                    
-                                    if not valid_candidates:
-                                        break
-                                    
-                                    # Ordenar por coancestralidade (menor é melhor)
-                                    valid_candidates.sort(key=lambda x: x[1])
-                                    
-                                    # Seleção greedy randomizada
-                                    rcl_size = max(1, int(len(valid_candidates) * alpha))
-                                    rcl = valid_candidates[:rcl_size]
-                                    
-                                    # Escolher aleatoriamente da RCL
-                                    selected_idx, cost = rcl[np.random.randint(len(rcl))]
-                                    selected_indices.append(selected_idx)
-                                    
-                                    crossing = crossings_data[selected_idx]
-                                    used_females.add(crossing['female_idx'])
-                                    used_males.add(crossing['male_idx'])
-                                    current_cost += cost
-                                    
-                                    # Remover candidato selecionado
-                                    candidates.remove(selected_idx)
-                                
-                                # Busca Local simples - tentar trocar cruzamentos
-                                improved = True
-                                while improved:
-                                    improved = False
-                                    for i in range(len(selected_indices)):
-                                        current_idx = selected_indices[i]
-                                        current_crossing = crossings_data[current_idx]
-                                        
-                                        # Tentar substituir por um melhor cruzamento para a mesma fêmea
-                                        for j, crossing in enumerate(crossings_data):
-                                            if (j not in selected_indices and 
-                                                crossing['female_idx'] == current_crossing['female_idx'] and
-                                                crossing['male_idx'] not in [crossings_data[idx]['male_idx'] for k, idx in enumerate(selected_indices) if k != i] and
-                                                crossing['coancestry'] < current_crossing['coancestry']):
-                                                
-                                                # Fazer a troca
-                                                new_cost = current_cost - current_crossing['coancestry'] + crossing['coancestry']
-                                                if new_cost < current_cost:
-                                                    selected_indices[i] = j
-                                                    current_cost = new_cost
-                                                    improved = True
-                                                    break
-                                
-                                iteration_costs.append(current_cost)
-                                
-                                # Verificar se é a melhor solução
-                                if current_cost < best_cost:
-                                    best_cost = current_cost
-                                    best_solution = selected_indices.copy()
-                            
-                            return best_solution, best_cost, iteration_costs
-                        
-                        # Executar GRASP personalizado
+                        # Executar GRASP personalizado (randomizado: cada clique é uma nova execução,
+                        # por isso o resultado não vai para o cache)
                         best_solution, best_cost, iteration_costs = grasp_crossing_selection(
-                            best_crossings_data, grasp_matrix, max_selected_crossings, grasp_iterations, grasp_alpha
+                            best_crossings_data, conflict_graph, max_selected_crossings, grasp_iterations, grasp_alpha
                         )
                         
                         # Mostrar resultados
@@ -1552,16 +1633,8 @@ elif selected_page == "Resultados da Otimização":
                             st.plotly_chart(convergence_fig, use_container_width=True)
                             
                             # Download da solução GRASP
-                            csv_grasp_buffer = io.StringIO()
-                            results_df.to_csv(csv_grasp_buffer, index=False)
-                            csv_grasp_data = csv_grasp_buffer.getvalue()
-                            
-                            st.download_button(
-                                label="📊 Download Solução GRASP (CSV)",
-                                data=csv_grasp_data,
-                                file_name=f"solucao_grasp_melhores_cruzamentos_{int(time.time())}.csv",
-                                mime="text/csv"
-                            )
+                            download_dataframe("📊 Download Solução GRASP", results_df,
+                                               "solucao_grasp_melhores_cruzamentos")
                         
                         else:
                             st.warning("Nenhum cruzamento foi selecionado pela otimização.")
@@ -1576,8 +1649,8 @@ elif selected_page == "Resultados da Otimização":
         st.subheader("📊 Resumo Estatístico dos Melhores Cruzamentos")
         
         # Determinar qual dataset usar para estatísticas
-        if 'best_crossings' in best_result and best_result['best_crossings']:
-            stats_data = [c['coancestry'] for c in best_result['best_crossings']]
+        if best_crossings:
+            stats_data = [c['coancestry'] for c in best_crossings]
             coef_column = 'coancestry'
         elif hasattr(dp, 'breeding_matrix') and hasattr(dp, 'females'):
             stats_data = [np.min(dp.breeding_matrix[i, :]) for i in range(len(dp.females))]
@@ -0,0 +1,144 @@
+import io
+import os
+import pandas as pd
+from typing import Iterator, List, Optional, Tuple
+
+# Parquet é opcional: sem pyarrow, entrada e saída continuam apenas em CSV
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    pa = None
+    pq = None
+    PARQUET_AVAILABLE = False
+
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+PARQUET_MAGIC = b'PAR1'
+
+EXPORT_FORMATS = ['CSV', 'Parquet'] if PARQUET_AVAILABLE else ['CSV']
+
+
+def is_parquet_source(source) -> bool:
+    """
+    Whether a path, Streamlit uploaded file or file-like object holds a Parquet file.
+
+    The file name extension is checked first; file-like objects without a
+    recognizable name are identified by the Parquet magic bytes.
+
+    Args:
+        source: Path, uploaded file or binary file-like object
+
+    Returns:
+        True for Parquet input
+    """
+    name = source if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', None)
+    if isinstance(name, (str, os.PathLike)):
+        if str(name).lower().endswith(PARQUET_EXTENSIONS):
+            return True
+        if isinstance(source, (str, os.PathLike)):
+            return False
+
+    try:
+        position = source.tell()
+        magic = source.read(len(PARQUET_MAGIC))
+        source.seek(position)
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return False
+    return magic == PARQUET_MAGIC
+
+
+def _require_parquet():
+    if not PARQUET_AVAILABLE:
+        raise ImportError("Parquet support requires pyarrow (pip install pyarrow)")
+
+
+def parquet_columns(source) -> List[str]:
+    """
+    Column names of a Parquet file, read from the footer only.
+    """
+    _require_parquet()
+    return pq.ParquetFile(source).schema_arrow.names
+
+
+def iter_parquet_batches(source, columns: List[str], batch_size: int,
+                         dictionary_columns: Optional[List[str]] = None) -> Iterator[Tuple[pd.DataFrame, int, int]]:
+    """
+    Stream a Parquet file in record batches, reading only the requested columns.
+
+    Args:
+        source: Path, uploaded file or binary file-like object
+        columns: Columns to read (column projection)
+        batch_size: Maximum number of rows per batch
+        dictionary_columns: Columns read as dictionary arrays, returned as pandas categoricals
+
+    Yields:
+        Tuple of (batch DataFrame, rows read so far, total rows in the file)
+    """
+    _require_parquet()
+    parquet_file = pq.ParquetFile(source, read_dictionary=dictionary_columns or [])
+    total_rows = parquet_file.metadata.num_rows
+    rows_read = 0
+
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+        rows_read += batch.num_rows
+        yield batch.to_pandas(), rows_read, total_rows
+
+
+def read_parquet(source, columns: Optional[List[str]] = None,
+                 dictionary_columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read a whole Parquet file (or only the given columns) into a DataFrame.
+    """
+    _require_parquet()
+    return pq.read_table(source, columns=columns, read_dictionary=dictionary_columns).to_pandas()
+
+
+def _to_arrow_table(df: pd.DataFrame, index: bool) -> 'pa.Table':
+    # Colunas de texto viram categóricas (dictionary encoding no Parquet);
+    # colunas com tipos misturados (ex.: números e "N/A") são gravadas como texto
+    columns = {}
+    for column in df.columns:
+        values = df[column]
+        if values.dtype == object or pd.api.types.is_string_dtype(values.dtype):
+            if pd.api.types.infer_dtype(values, skipna=True) not in ('string', 'empty'):
+                values = values.astype(str)
+            values = values.astype('category')
+        columns[str(column)] = values
+
+    encoded = pd.DataFrame(columns, index=df.index)
+    return pa.Table.from_pandas(encoded, preserve_index=index)
+
+
+def write_parquet(df: pd.DataFrame, destination, index: bool = False, compression: str = 'zstd'):
+    """
+    Write a DataFrame to Parquet with dictionary-encoded text columns.
+
+    Args:
+        df: DataFrame to write
+        destination: Path or binary file-like object
+        index: Whether to store the DataFrame index
+        compression: Parquet compression codec
+    """
+    _require_parquet()
+    pq.write_table(_to_arrow_table(df, index), destination, compression=compression)
+
+
+def export_dataframe(df: pd.DataFrame, export_format: str = 'CSV', index: bool = False) -> Tuple[object, str, str]:
+    """
+    Serialize a DataFrame for a download button.
+
+    Args:
+        df: DataFrame to export
+        export_format: 'CSV' or 'Parquet'
+        index: Whether to include the DataFrame index
+
+    Returns:
+        Tuple of (data, mime type, file extension)
+    """
+    if export_format == 'Parquet':
+        buffer = io.BytesIO()
+        write_parquet(df, buffer, index=index)
+        return buffer.getvalue(), 'application/vnd.apache.parquet', 'parquet'
+
+    return df.to_csv(index=index), 'text/csv', 'csv'
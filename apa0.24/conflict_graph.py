@@ -0,0 +1,128 @@
+import numpy as np
+from typing import List
+
+
+class AnimalCrossingAdjacency:
+    """
+    CSR index from each animal to the crossings that use it.
+
+    The crossings of animal a are crossings[offsets[a]:offsets[a + 1]], in
+    increasing order, so a lookup is a slice (a view, no search) and the whole
+    index is two flat arrays built with one stable sort.
+    """
+
+    def __init__(self, animals: np.ndarray, num_animals: int = None):
+        """
+        Build the index.
+
+        Args:
+            animals: Animal of each crossing
+            num_animals: Number of animals (default: largest animal index + 1)
+        """
+        animals = np.asarray(animals, dtype=np.int64)
+        if num_animals is None:
+            num_animals = int(animals.max()) + 1 if animals.size else 0
+
+        self.crossings = np.argsort(animals, kind='stable')
+        self.offsets = np.zeros(num_animals + 1, dtype=np.int64)
+        np.cumsum(np.bincount(animals, minlength=num_animals), out=self.offsets[1:])
+
+    def __len__(self) -> int:
+        return self.offsets.size - 1
+
+    def __getitem__(self, animal: int) -> np.ndarray:
+        animal = int(animal)
+        if animal < 0 or animal >= len(self):
+            return self.crossings[:0]
+        return self.crossings[self.offsets[animal]:self.offsets[animal + 1]]
+
+    @property
+    def degree(self) -> np.ndarray:
+        """Number of crossings of each animal"""
+        return np.diff(self.offsets)
+
+    @property
+    def nbytes(self) -> int:
+        return self.crossings.nbytes + self.offsets.nbytes
+
+
+class CrossingConflictGraph:
+    """
+    Implicit conflict graph between candidate crossings (female, male).
+
+    Two crossings conflict when they share the female or the male. Instead of an
+    m x m penalty matrix, crossing indices are grouped in per-female and per-male
+    buckets (CSR adjacency indexes), so conflicts are found by slicing two
+    buckets: O(m) memory and build time.
+    """
+
+    def __init__(self, crossings_data: List[dict]):
+        """
+        Build the graph.
+
+        Args:
+            crossings_data: List of crossings with 'female_idx', 'male_idx' and 'coancestry'
+        """
+        self.female_idx = np.array([c['female_idx'] for c in crossings_data], dtype=np.int64)
+        self.male_idx = np.array([c['male_idx'] for c in crossings_data], dtype=np.int64)
+        self.coancestry = np.array([c['coancestry'] for c in crossings_data], dtype=float)
+
+        # Índices dos cruzamentos agrupados por fêmea e por macho, em ordem crescente
+        self.female_buckets = AnimalCrossingAdjacency(self.female_idx)
+        self.male_buckets = AnimalCrossingAdjacency(self.male_idx)
+
+    def __len__(self) -> int:
+        return self.female_idx.size
+
+    @property
+    def nbytes(self) -> int:
+        return (self.female_idx.nbytes + self.male_idx.nbytes + self.coancestry.nbytes +
+                self.female_buckets.nbytes + self.male_buckets.nbytes)
+
+    def female_bucket(self, female_idx: int) -> np.ndarray:
+        """
+        Crossings that use the given female.
+        """
+        return self.female_buckets[female_idx]
+
+    def male_bucket(self, male_idx: int) -> np.ndarray:
+        """
+        Crossings that use the given male.
+        """
+        return self.male_buckets[male_idx]
+
+    def conflicts(self, crossing: int) -> np.ndarray:
+        """
+        Crossings that conflict with the given one (same female or same male),
+        excluding the crossing itself.
+
+        Args:
+            crossing: Crossing index
+
+        Returns:
+            Sorted array of conflicting crossing indices
+        """
+        neighbors = np.union1d(self.female_bucket(self.female_idx[crossing]),
+                               self.male_bucket(self.male_idx[crossing]))
+        return neighbors[neighbors != crossing]
+
+    def are_conflicting(self, crossing_a: int, crossing_b: int) -> bool:
+        """
+        Whether two different crossings share the female or the male.
+        """
+        return crossing_a != crossing_b and (
+            self.female_idx[crossing_a] == self.female_idx[crossing_b] or
+            self.male_idx[crossing_a] == self.male_idx[crossing_b]
+        )
+
+    def penalty(self, crossing_a: int, crossing_b: int) -> float:
+        """
+        Value of the former dense penalty matrix for a pair of crossings: the
+        coancestry on the diagonal, 10x the larger coancestry for conflicting
+        crossings and the mean coancestry for compatible ones.
+        """
+        if crossing_a == crossing_b:
+            return self.coancestry[crossing_a]
+        if self.are_conflicting(crossing_a, crossing_b):
+            return max(self.coancestry[crossing_a], self.coancestry[crossing_b]) * 10
+        return (self.coancestry[crossing_a] + self.coancestry[crossing_b]) / 2
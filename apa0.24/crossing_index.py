@@ -0,0 +1,77 @@
+import numpy as np
+from typing import List, Tuple
+
+from packed_matrix import upper_triangle
+
+
+class SortedCrossingIndex:
+    """
+    Every possible crossing (upper triangle of the coancestry matrix) sorted by
+    coancestry, lowest first, with ties in row-major triangle order.
+
+    Built once per dataset and passed to any number of GRASPOptimizer
+    instances, instead of each optimizer sorting the O(n²) triangle on its
+    first construction. It holds three flat arrays (int32 rows and columns
+    and the coefficients), so it is cheap to cache and to pickle to worker
+    processes; the list of tuples used by the list-based backend is built
+    lazily and is not pickled.
+    """
+
+    def __init__(self, rows: np.ndarray, cols: np.ndarray, values: np.ndarray, matrix_size: int):
+        """
+        Initialize the index from already sorted arrays (see from_matrix).
+
+        Args:
+            rows, cols: Pair indices (i < j) of each crossing
+            values: Coancestry of each crossing, in increasing order
+            matrix_size: Size of the coancestry matrix
+        """
+        self.rows = rows
+        self.cols = cols
+        self.values = values
+        self.matrix_size = matrix_size
+        self._tuples = None
+
+    @classmethod
+    def from_matrix(cls, coancestry_matrix) -> 'SortedCrossingIndex':
+        """
+        Sort the upper triangle of a coancestry matrix.
+
+        Args:
+            coancestry_matrix: Dense ndarray or PackedSymmetricMatrix
+
+        Returns:
+            SortedCrossingIndex instance
+        """
+        matrix_size = coancestry_matrix.shape[0]
+        values = upper_triangle(coancestry_matrix)
+        order = np.argsort(values, kind='stable')
+
+        # Posições do triângulo (ordem de np.triu_indices) convertidas em (i, j)
+        row_starts = np.arange(matrix_size) * (2 * matrix_size - np.arange(matrix_size) - 1) // 2
+        rows = np.searchsorted(row_starts, order, side='right') - 1
+        cols = order - row_starts[rows] + rows + 1
+
+        return cls(rows.astype(np.int32), cols.astype(np.int32),
+                   np.asarray(values[order], dtype=float), matrix_size)
+
+    def __len__(self) -> int:
+        return self.values.size
+
+    @property
+    def nbytes(self) -> int:
+        return self.rows.nbytes + self.cols.nbytes + self.values.nbytes
+
+    def as_tuples(self) -> List[Tuple[int, int, float]]:
+        """
+        The sorted crossings as a list of (i, j, coancestry) tuples (built once, shared).
+        """
+        if self._tuples is None:
+            self._tuples = list(zip(self.rows.tolist(), self.cols.tolist(), self.values.tolist()))
+        return self._tuples
+
+    def __getstate__(self) -> dict:
+        # A lista de tuplas é derivada: não vai para os processos
+        state = self.__dict__.copy()
+        state['_tuples'] = None
+        return state
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+from typing import List, Tuple, Optional, Iterable
+from crossing_index import SortedCrossingIndex
+
+
+class CrossingRanking:
+    """
+    Lazy ranking of every possible crossing (upper triangle of the coancestry
+    matrix) by coancestry, best first.
+
+    The ranking reads a SortedCrossingIndex (total order by coancestry and
+    triangle position), sorted once and shared, so every page is a slice of it
+    even when large tie blocks cross page bounds. Only the requested page is
+    materialized, as a columnar DataFrame instead of one dict per crossing.
+    """
+
+    COLUMNS = ['rank', 'pair1_idx', 'pair2_idx', 'pair1_name', 'pair2_name', 'coancestry', 'selected']
+
+    def __init__(self, coancestry_matrix, pair_names: List[str] = None,
+                 selected_crossings: Optional[Iterable[Tuple[int, int]]] = None,
+                 crossing_index: Optional[SortedCrossingIndex] = None):
+        """
+        Initialize the ranking.
+
+        Args:
+            coancestry_matrix: Square matrix of coancestry values between pairs
+                (dense ndarray or PackedSymmetricMatrix)
+            pair_names: List of pair names corresponding to matrix indices
+            selected_crossings: Crossings (i, j) to flag as selected (e.g. the best solution)
+            crossing_index: Precomputed SortedCrossingIndex of the matrix (sorted on
+                first use when None)
+        """
+        self.coancestry_matrix = coancestry_matrix
+        self.matrix_size = coancestry_matrix.shape[0]
+        self.pair_names = np.asarray(pair_names if pair_names else
+                                     [f'P{i+1}' for i in range(self.matrix_size)], dtype=object)
+
+        # Conjunto hash dos pares selecionados, codificados como i * n + j com i < j
+        self.selected_codes = {self._encode(i, j) for i, j in (selected_crossings or [])}
+
+        self.crossing_index = crossing_index
+
+    @property
+    def num_crossings(self) -> int:
+        return self.matrix_size * (self.matrix_size - 1) // 2
+
+    def num_pages(self, page_size: int) -> int:
+        """
+        Number of pages of the given size.
+        """
+        return max(1, -(-self.num_crossings // page_size))
+
+    def _encode(self, i: int, j: int) -> int:
+        i, j = (i, j) if i < j else (j, i)
+        return int(i) * self.matrix_size + int(j)
+
+    def _sorted_index(self) -> SortedCrossingIndex:
+        # Ordenação total do triângulo, feita uma única vez
+        if self.crossing_index is None:
+            self.crossing_index = SortedCrossingIndex.from_matrix(self.coancestry_matrix)
+        return self.crossing_index
+
+    def range(self, start: int, stop: int) -> pd.DataFrame:
+        """
+        Crossings ranked in positions [start, stop) (0-based).
+
+        Args:
+            start: First rank position
+            stop: Position after the last one
+
+        Returns:
+            DataFrame with columns rank (1-based), pair1_idx, pair2_idx, pair1_name,
+            pair2_name, coancestry and selected
+        """
+        index = self._sorted_index()
+        start = max(0, min(start, len(index)))
+        stop = max(start, min(stop, len(index)))
+        if start == stop:
+            return pd.DataFrame({column: [] for column in self.COLUMNS})
+
+        return self._build_frame(index, start, stop)
+
+    def _build_frame(self, index: SortedCrossingIndex, start: int, stop: int) -> pd.DataFrame:
+        # Monta o DataFrame colunar de um trecho do ranking
+        rows = index.rows[start:stop].astype(np.int64)
+        cols = index.cols[start:stop].astype(np.int64)
+        codes = rows * self.matrix_size + cols
+
+        return pd.DataFrame({
+            'rank': np.arange(start + 1, stop + 1),
+            'pair1_idx': rows,
+            'pair2_idx': cols,
+            'pair1_name': self.pair_names[rows],
+            'pair2_name': self.pair_names[cols],
+            'coancestry': index.values[start:stop],
+            'selected': np.fromiter((code in self.selected_codes for code in codes.tolist()),
+                                    dtype=bool, count=codes.size)
+        })
+
+    def top_k(self, k: int) -> pd.DataFrame:
+        """
+        The k best crossings (lowest coancestry).
+        """
+        return self.range(0, k)
+
+    def page(self, page: int, page_size: int = 100) -> pd.DataFrame:
+        """
+        One page of the ranking.
+
+        Args:
+            page: Page number (0-based)
+            page_size: Number of crossings per page
+
+        Returns:
+            Columnar DataFrame of the page (see range())
+        """
+        return self.range(page * page_size, (page + 1) * page_size)
+
+    def iter_pages(self, page_size: int = 10000):
+        """
+        Iterate over the whole ranking, one DataFrame per page.
+        """
+        index = self._sorted_index()
+        for start in range(0, len(index), page_size):
+            yield self._build_frame(index, start, min(start + page_size, len(index)))
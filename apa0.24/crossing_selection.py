@@ -0,0 +1,105 @@
+import numpy as np
+from typing import List, Tuple, Optional
+
+from conflict_graph import CrossingConflictGraph
+
+
+def grasp_crossing_selection(crossings_data: List[dict], conflict_graph: Optional[CrossingConflictGraph],
+                             max_selections: int, iterations: int,
+                             alpha: float) -> Tuple[Optional[List[int]], float, List[float]]:
+    """
+    Specialized GRASP to select the best crossings, at most one per female and per male.
+    
+    Vectorized implementation: crossings are sorted by coancestry once, used males
+    are kept in a boolean mask, conflicting candidates are discarded through the
+    conflict graph buckets and the local search walks per-female candidate slices
+    that are already sorted.
+    
+    Args:
+        crossings_data: Crossings with 'female_idx', 'male_idx' and 'coancestry'
+        conflict_graph: Conflict graph of the crossings (built from crossings_data if None)
+        max_selections: Maximum number of selected crossings
+        iterations: Number of GRASP iterations
+        alpha: Fraction of the valid candidates that forms the RCL
+        
+    Returns:
+        Tuple of (crossing indices of the best solution, best cost, cost of each iteration)
+    """
+    if conflict_graph is None:
+        conflict_graph = CrossingConflictGraph(crossings_data)
+
+    num_crossings = len(conflict_graph)
+    best_solution = None
+    best_cost = float('inf')
+    iteration_costs = []
+
+    if num_crossings == 0:
+        return best_solution, best_cost, iteration_costs
+
+    coancestry = conflict_graph.coancestry
+    female_idx = conflict_graph.female_idx
+    male_idx = conflict_graph.male_idx
+
+    # Ordem global por coancestralidade (empates pelo índice do cruzamento)
+    sorted_crossings = np.argsort(coancestry, kind='stable')
+
+    # Candidatos de cada fêmea ordenados por coancestralidade, para a busca local: um
+    # único array agrupado por fêmea, com os mesmos offsets do índice de fêmeas
+    female_candidates = np.lexsort((coancestry, female_idx))
+    female_offsets = conflict_graph.female_buckets.offsets
+
+    male_used = np.zeros(int(male_idx.max()) + 1, dtype=bool)
+
+    for iteration in range(iterations):
+        # Fase de Construção Greedy Randomizada
+        available = np.ones(num_crossings, dtype=bool)
+        male_used[:] = False
+        selected_indices = []
+        current_cost = 0.0
+
+        while len(selected_indices) < max_selections:
+            # Candidatos válidos, já em ordem de coancestralidade
+            valid_candidates = sorted_crossings[available[sorted_crossings]]
+            if valid_candidates.size == 0:
+                break
+
+            # Seleção greedy randomizada
+            rcl_size = max(1, int(valid_candidates.size * alpha))
+            selected_idx = int(valid_candidates[np.random.randint(rcl_size)])
+            selected_indices.append(selected_idx)
+            current_cost += coancestry[selected_idx]
+
+            # Descartar os candidatos da mesma fêmea ou do mesmo macho
+            available[conflict_graph.female_bucket(female_idx[selected_idx])] = False
+            available[conflict_graph.male_bucket(male_idx[selected_idx])] = False
+            male_used[male_idx[selected_idx]] = True
+
+        # Busca Local - trocar cada cruzamento pelo melhor da mesma fêmea com macho livre
+        improved = True
+        while improved:
+            improved = False
+            for position, current_idx in enumerate(selected_indices):
+                male_used[male_idx[current_idx]] = False
+
+                female = female_idx[current_idx]
+                candidates = female_candidates[female_offsets[female]:female_offsets[female + 1]]
+                candidates = candidates[coancestry[candidates] < coancestry[current_idx]]
+                candidates = candidates[~male_used[male_idx[candidates]]]
+
+                if candidates.size:
+                    new_idx = int(candidates[0])
+                    current_cost += coancestry[new_idx] - coancestry[current_idx]
+                    selected_indices[position] = new_idx
+                    current_idx = new_idx
+                    improved = True
+
+                male_used[male_idx[current_idx]] = True
+
+        iteration_costs.append(float(current_cost))
+
+        # Verificar se é a melhor solução
+        if current_cost < best_cost:
+            best_cost = float(current_cost)
+            best_solution = selected_indices.copy()
+
+    return best_solution, best_cost, iteration_costs
@@ -1,42 +1,295 @@
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Callable
+import hashlib
+import os
 import re
+from columnar_io import is_parquet_source, parquet_columns, iter_parquet_batches, read_parquet
+from packed_matrix import PackedSymmetricMatrix
+
+REQUIRED_COLUMNS = ['Animal_1', 'Animal_2', 'Coef']
+
+# Linhas por bloco na leitura em streaming
+DEFAULT_CHUNKSIZE = 250_000
+
+
+class IncrementalPairIndex:
+    """
+    Incrementally assigns integer codes to pair IDs ('sire_dam') as chunks are read,
+    so only the int32 code arrays of each chunk need to be kept.
+    """
+    
+    def __init__(self):
+        self.pair_to_code = {}
+    
+    def encode(self, animal_1: pd.Series, animal_2: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Encode the Animal_1 and Animal_2 columns of a chunk.
+        
+        Args:
+            animal_1: Animal_1 column of the chunk
+            animal_2: Animal_2 column of the chunk
+            
+        Returns:
+            Tuple of (Animal_1 codes, Animal_2 codes) in order of first appearance
+        """
+        codes, uniques = pd.factorize(pd.concat([animal_1, animal_2], ignore_index=True))
+        local_to_global = np.fromiter(
+            (self.pair_to_code.setdefault(pair, len(self.pair_to_code)) for pair in uniques),
+            dtype=np.int32, count=len(uniques)
+        )
+        codes = local_to_global[codes]
+        return codes[:len(animal_1)], codes[len(animal_1):]
+    
+    def finalize(self) -> Tuple[List[str], np.ndarray]:
+        """
+        Sort the pair IDs.
+        
+        Returns:
+            Tuple of (sorted pair IDs, array mapping appearance codes to sorted indices)
+        """
+        names = list(self.pair_to_code)
+        order = sorted(range(len(names)), key=names.__getitem__)
+        remap = np.empty(len(names), dtype=np.int32)
+        remap[order] = np.arange(len(names), dtype=np.int32)
+        return [names[i] for i in order], remap
+
+
+class AnimalIdIndex:
+    """
+    Interned animal IDs: every animal gets a dense int32 code (its position in the
+    sorted list of names) and every pair 'animal1_animal2' is represented by a row
+    of codes in pair_codes.
+    
+    The codes are used inside DataProcessor (female/male lists and the breeding
+    matrix). GRASP result dicts, recommendations and exports still address pairs
+    by matrix index and resolve names from all_pairs/females/males; moving them
+    to animal codes is left for a follow-up.
+    """
+    
+    def __init__(self, pair_names: List[str]):
+        """
+        Split all pair names once and encode their animals.
+        
+        Args:
+            pair_names: Pair IDs in the format 'animal1_animal2'
+        """
+        pairs = pd.Series(pair_names, dtype=object)
+        invalid = pairs.str.count('_') != 1
+        if invalid.any():
+            raise ValueError(f"Invalid pair format: {pairs[invalid].iloc[0]}")
+        
+        if len(pairs):
+            parts = pairs.str.split('_', n=1, expand=True)
+            codes, names = pd.factorize(pd.concat([parts[0], parts[1]], ignore_index=True), sort=True)
+        else:
+            codes, names = np.zeros(0, dtype=np.int64), []
+        
+        self.names = np.asarray(names, dtype=object)
+        # Coluna 0: primeiro animal do par; coluna 1: segundo animal
+        self.pair_codes = np.ascontiguousarray(codes.astype(np.int32).reshape(2, -1).T)
+    
+    def __len__(self) -> int:
+        return self.names.size
+    
+    @property
+    def nbytes(self) -> int:
+        return self.pair_codes.nbytes + self.names.nbytes
+    
+    def encode(self, names) -> np.ndarray:
+        """
+        Codes of the given animal names (-1 for unknown names).
+        """
+        return pd.Index(self.names).get_indexer(names).astype(np.int32)
+    
+    def decode(self, codes) -> np.ndarray:
+        """
+        Names of the given animal codes.
+        """
+        return self.names[np.asarray(codes)]
+
 
 class DataProcessor:
     """
     Class to process animal breeding data and create coancestry matrices.
     """
     
-    def __init__(self, uploaded_file):
+    def __init__(self, uploaded_file, chunksize: Optional[int] = None,
+                 progress_callback: Optional[Callable[[int, int, Optional[int]], None]] = None):
         """
-        Initialize the data processor with uploaded CSV file.
+        Initialize the data processor with uploaded CSV or Parquet file.
         
         Args:
-            uploaded_file: Streamlit uploaded file object
+            uploaded_file: Streamlit uploaded file object (or path / file-like object),
+                CSV or Parquet (requires pyarrow)
+            chunksize: If given, stream the file in chunks of this many rows instead of
+                loading it into a DataFrame; only the pair index and the coefficient
+                arrays are kept, and self.df is None
+            progress_callback: Optional callback(rows_read, bytes_read, total_bytes)
+                called after each chunk (total_bytes is None when unknown)
         """
-        self.df = pd.read_csv(uploaded_file)
-        self.validate_data()
+        if chunksize is None:
+            if is_parquet_source(uploaded_file):
+                self.df = read_parquet(uploaded_file, columns=self._parquet_projection(uploaded_file),
+                                       dictionary_columns=['Animal_1', 'Animal_2'])
+            else:
+                self.df = pd.read_csv(uploaded_file)
+            self.validate_data()
+            self._start_reading()
+            self._add_chunk(self.df)
+            self._finish_reading()
+        else:
+            self.df = None
+            self.read_in_chunks(uploaded_file, chunksize, progress_callback)
         self.process_data()
     
-    def validate_data(self):
+    def validate_data(self, df: pd.DataFrame = None):
         """
         Validate that the CSV file has required columns.
+        
+        Args:
+            df: DataFrame (or chunk) to validate; defaults to self.df
         """
-        required_columns = ['Animal_1', 'Animal_2', 'Coef']
-        missing_columns = [col for col in required_columns if col not in self.df.columns]
+        df = self.df if df is None else df
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
         
         if missing_columns:
             raise ValueError(f"Missing required columns: {missing_columns}")
         
         # Check for null values
-        if self.df[required_columns].isnull().any().any():
+        if df[REQUIRED_COLUMNS].isnull().any().any():
             raise ValueError("Dataset contains null values in required columns")
         
         # Check coefficient values
-        if not pd.api.types.is_numeric_dtype(self.df['Coef']):
+        if not pd.api.types.is_numeric_dtype(df['Coef']):
             raise ValueError("Coef column must contain numeric values")
     
+    def _start_reading(self):
+        # Estado da leitura incremental: índice de pares, hash e arrays por bloco
+        self._pair_index = IncrementalPairIndex()
+        self._hasher = hashlib.sha1()
+        self._idx1_parts, self._idx2_parts, self._coef_parts = [], [], []
+    
+    def _add_chunk(self, chunk: pd.DataFrame):
+        # Codifica um bloco e acumula os arrays (índices int32 e coeficientes)
+        animal_1 = chunk['Animal_1'].astype(str)
+        animal_2 = chunk['Animal_2'].astype(str)
+        coef = chunk['Coef'].to_numpy(dtype=float)
+        
+        # Hash do conteúdo, atualizado bloco a bloco (mesmo resultado com ou sem streaming)
+        row_hashes = pd.util.hash_pandas_object(
+            pd.DataFrame({'Animal_1': animal_1, 'Animal_2': animal_2, 'Coef': coef}), index=False
+        )
+        self._hasher.update(row_hashes.values.tobytes())
+        
+        idx1, idx2 = self._pair_index.encode(animal_1, animal_2)
+        self._idx1_parts.append(idx1)
+        self._idx2_parts.append(idx2)
+        self._coef_parts.append(coef)
+    
+    def _finish_reading(self):
+        # Ordena os pares e converte os códigos de aparição em índices da lista ordenada
+        self.dataset_hash = self._hasher.hexdigest()
+        self.all_pairs, remap = self._pair_index.finalize()
+        self.num_pairs = len(self.all_pairs)
+        
+        if self._coef_parts:
+            self.pair_idx1 = remap[np.concatenate(self._idx1_parts)]
+            self.pair_idx2 = remap[np.concatenate(self._idx2_parts)]
+            self.coef_values = np.concatenate(self._coef_parts)
+        else:
+            self.pair_idx1 = np.zeros(0, dtype=np.int32)
+            self.pair_idx2 = np.zeros(0, dtype=np.int32)
+            self.coef_values = np.zeros(0)
+        self.num_records = len(self.coef_values)
+        
+        del self._pair_index, self._hasher, self._idx1_parts, self._idx2_parts, self._coef_parts
+    
+    @staticmethod
+    def _parquet_projection(source) -> List[str]:
+        # Apenas as colunas necessárias são lidas do Parquet; a ausência é reportada como no CSV
+        columns = parquet_columns(source)
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in columns]
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {missing_columns}")
+        return REQUIRED_COLUMNS
+    
+    @staticmethod
+    def _source_size(source) -> Optional[int]:
+        # Tamanho total em bytes, quando conhecido (caminho, arquivo enviado ou buffer)
+        if isinstance(source, (str, os.PathLike)):
+            return os.path.getsize(source)
+        if getattr(source, 'size', None) is not None:
+            return int(source.size)
+        try:
+            position = source.tell()
+            source.seek(0, os.SEEK_END)
+            size = source.tell()
+            source.seek(position)
+            return size
+        except (AttributeError, OSError):
+            return None
+    
+    def read_in_chunks(self, source, chunksize: int = DEFAULT_CHUNKSIZE,
+                       progress_callback: Optional[Callable[[int, int, Optional[int]], None]] = None):
+        """
+        Stream the CSV in chunks, building the pair index and the coefficient arrays
+        incrementally. Peak memory is bounded by one chunk plus the int32/float arrays.
+        Parquet files are streamed by record batches instead, reading only the required
+        columns with the animal IDs dictionary-encoded.
+        
+        Args:
+            source: Path, Streamlit uploaded file or file-like object (CSV or Parquet)
+            chunksize: Number of rows per chunk
+            progress_callback: Optional callback(rows_read, bytes_read, total_bytes)
+        """
+        if is_parquet_source(source):
+            self._read_parquet_batches(source, chunksize, progress_callback)
+            return
+        
+        total_bytes = self._source_size(source)
+        handle = open(source, 'rb') if isinstance(source, (str, os.PathLike)) else source
+        
+        self._start_reading()
+        rows_read = 0
+        
+        try:
+            reader = pd.read_csv(handle, chunksize=chunksize,
+                                 usecols=lambda column: column in REQUIRED_COLUMNS)
+            for chunk in reader:
+                self.validate_data(chunk)
+                self._add_chunk(chunk)
+                rows_read += len(chunk)
+                
+                if progress_callback:
+                    bytes_read = handle.tell() if hasattr(handle, 'tell') else 0
+                    if total_bytes is not None:
+                        bytes_read = min(bytes_read, total_bytes)
+                    progress_callback(rows_read, bytes_read, total_bytes)
+        finally:
+            if handle is not source:
+                handle.close()
+        
+        self._finish_reading()
+    
+    def _read_parquet_batches(self, source, batch_size: int,
+                              progress_callback: Optional[Callable[[int, int, Optional[int]], None]] = None):
+        # Leitura em lotes do Parquet; o progresso em bytes é estimado pela fração de linhas lidas
+        total_bytes = self._source_size(source)
+        columns = self._parquet_projection(source)
+        
+        self._start_reading()
+        for batch, rows_read, total_rows in iter_parquet_batches(source, columns, batch_size,
+                                                                 dictionary_columns=['Animal_1', 'Animal_2']):
+            self.validate_data(batch)
+            self._add_chunk(batch)
+            
+            if progress_callback:
+                bytes_read = int(total_bytes * rows_read / total_rows) if total_bytes and total_rows else 0
+                progress_callback(rows_read, bytes_read, total_bytes)
+        
+        self._finish_reading()
+    
     def extract_animals_from_pair(self, pair_string: str) -> Tuple[str, str]:
         """
         Extract individual animals from a pair string like 'parent1_parent2'.
@@ -56,54 +309,26 @@ class DataProcessor:
         """
         Process the data to extract animals and create mappings.
         """
-        # Extract all individual animals from pairs
-        all_animals = set()
-        
-        for _, row in self.df.iterrows():
-            animal1_pair = row['Animal_1']
-            animal2_pair = row['Animal_2']
-            
-            # Extract animals from first pair
-            a1, a2 = self.extract_animals_from_pair(animal1_pair)
-            all_animals.update([a1, a2])
-            
-            # Extract animals from second pair
-            a3, a4 = self.extract_animals_from_pair(animal2_pair)
-            all_animals.update([a3, a4])
-        
-        # Sort animals for consistent ordering
-        all_animals = sorted(list(all_animals))
-        
         # For this implementation, we'll assume the first animal in each pair is female
         # and the second is male. This is a simplification for the academic project.
-        females = set()
-        males = set()
+        # Os pares são divididos uma única vez e os animais viram códigos int32 ordenados
+        self.animal_ids = AnimalIdIndex(self.all_pairs)
+        self.pair_codes = self.animal_ids.pair_codes
         
-        for _, row in self.df.iterrows():
-            animal1_pair = row['Animal_1']
-            animal2_pair = row['Animal_2']
-            
-            # Extract animals from pairs
-            f1, m1 = self.extract_animals_from_pair(animal1_pair)
-            f2, m2 = self.extract_animals_from_pair(animal2_pair)
-            
-            females.update([f1, f2])
-            males.update([m1, m2])
+        # Códigos (ordenados) dos animais que aparecem como fêmea e como macho
+        self.female_codes = np.unique(self.pair_codes[:, 0])
+        self.male_codes = np.unique(self.pair_codes[:, 1])
         
-        # Convert to sorted lists
-        self.females = sorted(list(females))
-        self.males = sorted(list(males))
-        
-        # Create mappings
-        self.female_to_idx = {female: idx for idx, female in enumerate(self.females)}
-        self.male_to_idx = {male: idx for idx, male in enumerate(self.males)}
+        # Nomes apenas para exibição, na ordem dos códigos (ordem alfabética)
+        self.females = self.animal_ids.decode(self.female_codes).tolist()
+        self.males = self.animal_ids.decode(self.male_codes).tolist()
         
         # Calculate statistics
         self.num_females = len(self.females)
         self.num_males = len(self.males)
-        self.coef_mean = self.df['Coef'].mean()
-        self.coef_max = self.df['Coef'].max()
-        self.coef_min = self.df['Coef'].min()
+        self.coef_mean = float(self.coef_values.mean()) if self.num_records else float('nan')
+        self.coef_max = float(self.coef_values.max()) if self.num_records else float('nan')
+        self.coef_min = float(self.coef_values.min()) if self.num_records else float('nan')
         
         # Create coancestry matrix
         self.create_coancestry_matrix()
@@ -114,34 +339,11 @@ class DataProcessor:
         Matriz representa todos os cruzamentos possíveis entre pares do arquivo CSV.
         Versão otimizada para performance.
         """
-        # Usar pandas para otimizar a criação da lista de pares únicos
-        all_pairs = set(self.df['Animal_1'].unique()) | set(self.df['Animal_2'].unique())
-        
-        self.all_pairs = sorted(list(all_pairs))
-        self.num_pairs = len(self.all_pairs)
-        
-        # Criar mapeamento de pares para índices
-        self.pair_to_idx = {pair: idx for idx, pair in enumerate(self.all_pairs)}
-        
-        # Inicializar matriz com zeros
-        self.coancestry_matrix = np.zeros((self.num_pairs, self.num_pairs))
-        
-        # Preencher matriz usando indexação vetorizada do pandas
-        df_indexed = self.df.copy()
-        df_indexed['idx1'] = df_indexed['Animal_1'].map(self.pair_to_idx)
-        df_indexed['idx2'] = df_indexed['Animal_2'].map(self.pair_to_idx)
-        
-        # Preencher valores na matriz usando indexação avançada
-        idx1_values = df_indexed['idx1'].values
-        idx2_values = df_indexed['idx2'].values
-        coef_values = df_indexed['Coef'].values
-        
-        # Preencher simetricamente
-        self.coancestry_matrix[idx1_values, idx2_values] = coef_values
-        self.coancestry_matrix[idx2_values, idx1_values] = coef_values
-        
-        # Preencher diagonal principal com 1 (mesmo animal)
-        np.fill_diagonal(self.coancestry_matrix, 1.0)
+        # Matriz simétrica guardada apenas pelo triângulo superior (metade da memória);
+        # pares sem coeficiente ficam com zero e a diagonal principal com 1 (mesmo animal)
+        self.coancestry_matrix = PackedSymmetricMatrix.from_pairs(
+            self.num_pairs, self.pair_idx1, self.pair_idx2, self.coef_values, diagonal=1.0
+        )
         
         # Para compatibilidade com o algoritmo GRASP, também criar matriz fêmeas x machos
         self.create_breeding_matrix()
@@ -154,19 +356,33 @@ class DataProcessor:
         # Inicializar matriz breeding com zeros
         self.breeding_matrix = np.zeros((self.num_females, self.num_males))
         
+        # Índices na matriz de coancestralidade completa dos animais que também são IDs de par
+        # (-1 quando não encontrados: sem parentesco conhecido, valor 0)
+        pair_index = pd.Index(self.all_pairs)
+        female_pair_idx = pair_index.get_indexer(self.females)
+        male_pair_idx = pair_index.get_indexer(self.males)
+        
         # Preencher matriz breeding usando a matriz de coancestralidade
-        for f_idx, female in enumerate(self.females):
-            for m_idx, male in enumerate(self.males):
-                # Encontrar índices na matriz de coancestralidade completa
-                female_pair_idx = self.pair_to_idx.get(female, -1)
-                male_pair_idx = self.pair_to_idx.get(male, -1)
-                
-                if female_pair_idx != -1 and male_pair_idx != -1:
-                    # Usar o valor da matriz de coancestralidade
-                    self.breeding_matrix[f_idx, m_idx] = self.coancestry_matrix[female_pair_idx, male_pair_idx]
-                else:
-                    # Se não encontrar na matriz, usar 0 (sem parentesco conhecido)
-                    self.breeding_matrix[f_idx, m_idx] = 0.0
+        rows = np.flatnonzero(female_pair_idx != -1)
+        cols = np.flatnonzero(male_pair_idx != -1)
+        self.breeding_matrix[np.ix_(rows, cols)] = self.coancestry_matrix[
+            np.ix_(female_pair_idx[rows], male_pair_idx[cols])
+        ]
+    
+    @property
+    def pair_to_idx(self) -> Dict[str, int]:
+        """Mapping pair ID -> matrix index (built on demand; the pipeline works on codes)"""
+        return dict(zip(self.all_pairs, range(self.num_pairs)))
+    
+    @property
+    def female_to_idx(self) -> Dict[str, int]:
+        """Mapping female ID -> breeding matrix row (built on demand)"""
+        return dict(zip(self.females, range(self.num_females)))
+    
+    @property
+    def male_to_idx(self) -> Dict[str, int]:
+        """Mapping male ID -> breeding matrix column (built on demand)"""
+        return dict(zip(self.males, range(self.num_males)))
     
     def get_animal_mapping(self) -> Dict[str, str]:
         """
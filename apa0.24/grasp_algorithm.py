@@ -1,6 +1,105 @@
 import numpy as np
+import pandas as pd
 import random
+import time
 from typing import List, Tuple, Callable, Optional
+from crossing_ranking import CrossingRanking
+from crossing_index import SortedCrossingIndex
+import grasp_kernels
+from grasp_kernels import JIT_AVAILABLE
+
+
+class ReactiveAlpha:
+    """
+    Reactive GRASP: chooses alpha from a discrete set of values with
+    probabilities proportional to the quality of the solutions each value produces.
+    """
+    
+    def __init__(self, alpha_values: List[float] = None, delta: float = 4.0,
+                 update_interval: int = 10):
+        """
+        Initialize the reactive alpha state.
+        
+        Args:
+            alpha_values: Candidate alpha values (default: 0.1 to 0.9)
+            delta: Amplification exponent (higher = favours good values faster)
+            update_interval: Number of recorded solutions between probability updates
+        """
+        self.alpha_values = list(alpha_values) if alpha_values else [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9]
+        self.delta = delta
+        self.update_interval = update_interval
+        
+        num_values = len(self.alpha_values)
+        self.probabilities = [1.0 / num_values] * num_values
+        self.cost_sums = [0.0] * num_values
+        self.counts = [0] * num_values
+        self.best_cost = float('inf')
+        self._records_since_update = 0
+    
+    def sample(self) -> float:
+        """
+        Draw an alpha value according to the current probabilities.
+        
+        Returns:
+            Selected alpha value
+        """
+        return random.choices(self.alpha_values, weights=self.probabilities)[0]
+    
+    def record(self, alpha: float, cost: float):
+        """
+        Record the cost of a solution built with the given alpha.
+        
+        Args:
+            alpha: Alpha value used to build the solution; it is credited to the
+                closest candidate value (no exact float equality required)
+            cost: Cost of the solution after local search
+        """
+        k = int(np.argmin(np.abs(np.asarray(self.alpha_values) - alpha)))
+        self.cost_sums[k] += float(cost)
+        self.counts[k] += 1
+        self.best_cost = min(self.best_cost, float(cost))
+        
+        self._records_since_update += 1
+        if self._records_since_update >= self.update_interval:
+            self.update_probabilities()
+    
+    def update_probabilities(self):
+        """
+        Recompute probabilities as q_k = (best / mean_k) ** delta, normalized.
+        Values never tried keep the neutral quality 1.
+        """
+        # Evitar divisão por zero quando a coancestralidade mínima é 0
+        epsilon = 1e-9
+        qualities = []
+        for k in range(len(self.alpha_values)):
+            if self.counts[k] == 0:
+                qualities.append(1.0)
+            else:
+                mean_cost = self.cost_sums[k] / self.counts[k]
+                qualities.append(((self.best_cost + epsilon) / (mean_cost + epsilon)) ** self.delta)
+        
+        total = sum(qualities)
+        self.probabilities = [q / total for q in qualities]
+        self._records_since_update = 0
+    
+    def get_probabilities(self) -> dict:
+        """
+        Get the current probability of each alpha value.
+        
+        Returns:
+            Dictionary mapping alpha value to probability
+        """
+        return dict(zip(self.alpha_values, self.probabilities))
+    
+    def best_alpha(self) -> float:
+        """
+        Get the alpha value with the highest current probability.
+        
+        Returns:
+            Most probable alpha value
+        """
+        return self.alpha_values[int(np.argmax(self.probabilities))]
+
 
 class GRASPOptimizer:
     """
@@ -8,18 +107,40 @@ class GRASPOptimizer:
     animal breeding optimization to minimize coancestry working directly on crossing matrix.
     """
     
-    def __init__(self, coancestry_matrix: np.ndarray, max_iterations: int = 200, 
+    KERNEL_BACKENDS = ('python', 'jit', 'interpreted')
+    
+    def __init__(self, coancestry_matrix, max_iterations: int = 200, 
                  alpha: float = 0.3, local_search_iterations: int = 30, 
-                 pair_names: list = None):
+                 pair_names: list = None, elite_size: int = 5,
+                 use_path_relinking: bool = True,
+                 reactive_alpha: Optional[ReactiveAlpha] = None,
+                 batch_size: int = 1, kernel_backend: str = 'auto',
+                 crossing_index: Optional[SortedCrossingIndex] = None):
         """
         Initialize GRASP optimizer.
         
         Args:
             coancestry_matrix: Square matrix of coancestry values between all crossing pairs
+                (dense ndarray or PackedSymmetricMatrix)
             max_iterations: Maximum number of GRASP iterations
             alpha: Greedy parameter (0 = pure greedy, 1 = pure random)
             local_search_iterations: Number of local search iterations
             pair_names: List of pair names corresponding to matrix indices
+            elite_size: Maximum number of distinct solutions kept in the elite pool
+            use_path_relinking: Apply path-relinking between new solutions and the elite pool
+            reactive_alpha: Optional ReactiveAlpha state; when given, alpha is drawn
+                per iteration from it instead of using the fixed alpha (it can be
+                shared between executions so the learned probabilities carry over)
+            batch_size: Number of solutions built together by the vectorized batch
+                construction (1 = one greedy_randomized_construction per iteration)
+            kernel_backend: Implementation of construction, local search and
+                diversification: 'python' (list-based methods), 'jit' (array kernels
+                compiled with Numba; run interpreted when Numba is missing),
+                'interpreted' (the same kernels as plain Python, the reference for
+                validating 'jit') or 'auto' ('jit' when Numba is installed, else
+                'interpreted', so a fixed seed gives the same result either way)
+            crossing_index: Precomputed SortedCrossingIndex of the matrix, shared between
+                optimizers on the same dataset (built on first use when None)
         """
         self.coancestry_matrix = coancestry_matrix
         self.matrix_size = coancestry_matrix.shape[0]
@@ -27,12 +148,35 @@ class GRASPOptimizer:
         self.alpha = alpha
         self.local_search_iterations = local_search_iterations
         self.pair_names = pair_names if pair_names else [f'P{i+1}' for i in range(self.matrix_size)]
+        self.elite_size = elite_size
+        self.use_path_relinking = use_path_relinking
+        self.reactive_alpha = reactive_alpha
+        self.batch_size = max(1, int(batch_size))
+        
+        if kernel_backend == 'auto':
+            kernel_backend = 'jit' if JIT_AVAILABLE else 'interpreted'
+        if kernel_backend not in self.KERNEL_BACKENDS:
+            raise ValueError(f"Invalid kernel backend: {kernel_backend}")
+        self.kernel_backend = kernel_backend
+        
+        if crossing_index is not None and crossing_index.matrix_size != self.matrix_size:
+            raise ValueError("Crossing index was built for a matrix of a different size")
+        self.crossing_index = crossing_index
         
         # For tracking convergence
         self.iteration_costs = []
         self.best_solution = None
         self.best_cost = float('inf')
         self.best_crossings = []
+        
+        # Conjunto elite: lista de (custo, solução) ordenada pelo custo
+        self.elite_solutions = []
+        self.best_iteration = 0
+        self.time_to_best = 0.0
+        
+        # Perfil de execução por fase (tempos, chamadas e movimentos)
+        self.profile = {}
+        self._reset_profile()
     
     def calculate_total_cost(self, selected_crossings: List[int]) -> float:
         """
@@ -44,19 +188,12 @@ class GRASPOptimizer:
         Returns:
             Total coancestry cost (sum of selected coancestry coefficients)
         """
-        total_cost = 0.0
-        
-        # Somar os coeficientes de coancestralidade dos cruzamentos selecionados
-        for crossing_idx in selected_crossings:
-            # Usar apenas a diagonal inferior para evitar duplicatas
-            row = crossing_idx // self.matrix_size
-            col = crossing_idx % self.matrix_size
-            
-            # Só considerar se não for a diagonal principal (mesmo animal)
-            if row != col:
-                total_cost += self.coancestry_matrix[row, col]
+        if len(selected_crossings) == 0:
+            return 0.0
         
-        return total_cost
+        # Cruzamentos na diagonal principal (mesmo animal) não somam custo
+        costs, _ = self.evaluate_solutions(np.asarray(selected_crossings).reshape(1, -1))
+        return float(costs[0])
     
     def calculate_crossing_matrix_cost(self, solution_matrix: np.ndarray) -> float:
         """
@@ -68,15 +205,107 @@ class GRASPOptimizer:
         Returns:
             Total coancestry cost
         """
-        total_cost = 0.0
+        # Somar apenas os valores onde a matriz solução indica 1 (triangular superior)
+        rows, cols = np.nonzero(np.triu(np.asarray(solution_matrix) == 1, k=1))
+        if rows.size == 0:
+            return 0.0
         
-        # Somar apenas os valores onde a matriz solução indica 1
-        for i in range(self.matrix_size):
-            for j in range(i + 1, self.matrix_size):  # Usar apenas triangular superior
-                if solution_matrix[i, j] == 1:
-                    total_cost += self.coancestry_matrix[i, j]
+        costs, _ = self.evaluate_solutions(np.stack((rows, cols), axis=1)[np.newaxis])
+        return float(costs[0])
+    
+    def evaluate_solutions(self, solutions) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluate a whole population of solutions in one vectorized call.
         
-        return total_cost
+        Solutions are rows of an array of shape (num_solutions, num_crossings, 2)
+        with the pair indices (i, j) of each crossing, or of shape
+        (num_solutions, num_crossings) with flat crossing indices i * matrix_size + j
+        (as in calculate_total_cost). Shorter solutions are padded with -1.
+        
+        A solution is feasible when every crossing joins two different pairs of
+        the matrix and no crossing appears twice (in either orientation).
+        Crossings on the diagonal or outside the matrix add no cost.
+        
+        Args:
+            solutions: Array of solutions (see above)
+            
+        Returns:
+            Tuple of (total cost of each solution, feasibility flag of each solution)
+        """
+        solutions = np.asarray(solutions, dtype=np.int64)
+        if solutions.ndim == 3 and solutions.shape[2] == 2:
+            rows, cols = solutions[:, :, 0], solutions[:, :, 1]
+            padding = (rows == -1) & (cols == -1)
+        elif solutions.ndim == 2:
+            padding = solutions == -1
+            rows = np.where(padding, -1, solutions // max(self.matrix_size, 1))
+            cols = np.where(padding, -1, solutions % max(self.matrix_size, 1))
+        else:
+            raise ValueError(f"Invalid solutions shape: {solutions.shape}")
+        
+        # Cruzamentos válidos: dentro da matriz e entre pares diferentes
+        valid = ((rows >= 0) & (rows < self.matrix_size) & (cols >= 0) &
+                 (cols < self.matrix_size) & (rows != cols))
+        
+        costs = np.zeros(rows.shape)
+        costs[valid] = self.coancestry_matrix[rows[valid], cols[valid]]
+        
+        # Repetições: códigos (menor, maior) ordenados por solução; entradas inválidas
+        # recebem códigos negativos distintos para nunca coincidirem
+        codes = np.minimum(rows, cols) * self.matrix_size + np.maximum(rows, cols)
+        codes = np.where(valid, codes, -1 - np.arange(rows.shape[1]))
+        codes.sort(axis=1)
+        repeated = (codes[:, 1:] == codes[:, :-1]).any(axis=1)
+        
+        feasible = (valid | padding).all(axis=1) & ~repeated
+        return costs.sum(axis=1), feasible
+    
+    def get_crossing_index(self) -> SortedCrossingIndex:
+        """
+        Sorted index of all possible crossings, built on first use unless one was
+        given to the constructor.
+        
+        Returns:
+            SortedCrossingIndex of the coancestry matrix
+        """
+        if self.crossing_index is None:
+            self.crossing_index = SortedCrossingIndex.from_matrix(self.coancestry_matrix)
+        return self.crossing_index
+    
+    def _sorted_crossing_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Linhas, colunas e coancestralidade dos cruzamentos ordenados (índice compartilhado)
+        index = self.get_crossing_index()
+        return index.rows, index.cols, index.values
+    
+    def _construction_pool_size(self, num_candidates: int) -> int:
+        # Limitar número de candidatos baseado no número de iterações para balance performance/qualidade
+        if self.max_iterations > 500:
+            return min(100, num_candidates)  # Muito menos candidatos para iterações altas
+        elif self.max_iterations > 200:
+            return min(150, num_candidates)  # Menos candidatos para iterações médias
+        return min(300, num_candidates)  # Candidatos normais para iterações baixas
+    
+    def _local_search_pool_size(self, num_candidates: int) -> int:
+        # Limitar número de candidatos baseado no número de iterações para otimização
+        if self.max_iterations > 500:
+            return min(50, num_candidates)  # Muito menos candidatos para iterações altas
+        elif self.max_iterations > 200:
+            return min(75, num_candidates)  # Candidatos reduzidos
+        return min(100, num_candidates)  # Candidatos normais para iterações baixas
+    
+    def _kernel(self, name: str) -> Callable:
+        # Kernel compilado ('jit') ou a mesma função como Python puro ('interpreted')
+        kernel = getattr(grasp_kernels, name)
+        return kernel if self.kernel_backend == 'jit' else grasp_kernels.interpreted(kernel)
+    
+    def _kernel_rng_state(self) -> np.ndarray:
+        # Semente dos kernels tirada do módulo random: com random.seed fixo, os backends
+        # 'jit' e 'interpreted' produzem exatamente as mesmas soluções
+        return np.array([random.randrange(1, grasp_kernels.RNG_MODULUS)], dtype=np.int64)
+    
+    def _solution_arrays(self, solution: List[Tuple[int, int]]) -> Tuple[np.ndarray, np.ndarray]:
+        crossings = np.asarray(solution, dtype=np.int64).reshape(-1, 2)
+        return crossings[:, 0].copy(), crossings[:, 1].copy()
     
     def greedy_randomized_construction(self, num_crossings: int = None) -> List[Tuple[int, int]]:
         """
@@ -92,34 +321,25 @@ class GRASPOptimizer:
         if num_crossings is None:
             num_crossings = max(3, min(20, self.matrix_size // 10))  # Limitar ainda mais o número de cruzamentos
         
+        if self.kernel_backend != 'python':
+            rows, cols, values = self._sorted_crossing_arrays()
+            rng_state = self._kernel_rng_state()
+            pool = self._kernel('sample_positions')(values.size, self._construction_pool_size(values.size),
+                                                    rng_state)
+            selected = pool[self._kernel('construct_solution')(rows[pool], cols[pool], values[pool],
+                                                               num_crossings, float(self.alpha),
+                                                               self.matrix_size, rng_state)]
+            return list(zip(rows[selected].tolist(), cols[selected].tolist()))
+        
         solution = []
         used_pairs = set()
         used_animals = set()  # Para evitar sequência de animais
         
-        # Pré-calcular todos os cruzamentos possíveis ordenados (cache)
-        if not hasattr(self, '_sorted_crossings'):
-            all_crossings = []
-            for i in range(self.matrix_size):
-                for j in range(i + 1, self.matrix_size):
-                    all_crossings.append((i, j, self.coancestry_matrix[i, j]))
-            
-            # Ordenar por coeficiente de coancestralidade (menor é melhor)
-            all_crossings.sort(key=lambda x: x[2])
-            self._sorted_crossings = all_crossings
-        
-        # Embaralhar os candidatos para evitar sequência
-        candidate_pool = self._sorted_crossings.copy()
+        # Embaralhar os candidatos (índice ordenado compartilhado) para evitar sequência
+        candidate_pool = self.get_crossing_index().as_tuples().copy()
         random.shuffle(candidate_pool)
         
-        # Limitar número de candidatos baseado no número de iterações para balance performance/qualidade
-        if self.max_iterations > 500:
-            max_candidates = min(100, len(candidate_pool))  # Muito menos candidatos para iterações altas
-        elif self.max_iterations > 200:
-            max_candidates = min(150, len(candidate_pool))  # Menos candidatos para iterações médias
-        else:
-            max_candidates = min(300, len(candidate_pool))  # Candidatos normais para iterações baixas
-        
-        candidate_pool = candidate_pool[:max_candidates]
+        candidate_pool = candidate_pool[:self._construction_pool_size(len(candidate_pool))]
         
         # Reordenar por coancestralidade após embaralhamento
         candidate_pool.sort(key=lambda x: x[2])
@@ -156,7 +376,7 @@ class GRASPOptimizer:
             if len(rcl) < 10 and len(candidates) > len(rcl):
                 additional_candidates = random.sample(candidates[len(rcl):], 
                                                     min(5, len(candidates) - len(rcl)))
-                rcl.extend(additional_candidates)
+                rcl.extend((i, j) for i, j, _ in additional_candidates)
             
             # Selecionar aleatoriamente da RCL
             selected_crossing = random.choice(rcl)
@@ -172,6 +392,95 @@ class GRASPOptimizer:
         
         return solution
     
+    def greedy_randomized_construction_batch(self, batch_size: int, num_crossings: int = None,
+                                             alphas: Optional[List[float]] = None) -> List[List[Tuple[int, int]]]:
+        """
+        Construct several solutions at once, vectorized over the batch.
+        
+        Follows the rules of greedy_randomized_construction: each solution draws
+        its own random candidate pool from the shared sorted crossing arrays, and
+        at every step one crossing is selected for every solution with array
+        operations (candidate masks, RCL thresholds and random draws are computed
+        for the whole batch).
+        
+        Args:
+            batch_size: Number of solutions to build
+            num_crossings: Number of crossings per solution (default as in
+                greedy_randomized_construction)
+            alphas: Greedy parameter of each solution (default: self.alpha for all)
+            
+        Returns:
+            List of batch_size solutions, each a list of crossing pairs (row, col)
+        """
+        if num_crossings is None:
+            num_crossings = max(3, min(20, self.matrix_size // 10))
+        
+        rows, cols, values = self._sorted_crossing_arrays()
+        alphas = np.full(batch_size, self.alpha) if alphas is None else np.asarray(alphas, dtype=float)
+        pool_size = self._construction_pool_size(values.size)
+        solutions = [[] for _ in range(batch_size)]
+        if batch_size == 0 or pool_size == 0:
+            return solutions
+        
+        # Um único gerador, semeado pelo módulo random: random.seed reproduz a execução
+        rng = np.random.default_rng(random.getrandbits(64))
+        
+        # Pool aleatório de cada solução: posições distintas da lista ordenada, em ordem
+        # crescente (ou seja, já ordenadas por coancestralidade)
+        pool = np.sort(np.array([rng.choice(values.size, pool_size, replace=False)
+                                 for _ in range(batch_size)]), axis=1)
+        pool_i, pool_j, pool_cost = rows[pool], cols[pool], values[pool]
+        
+        batch = np.arange(batch_size)
+        used_pairs = np.zeros((batch_size, pool_size), dtype=bool)
+        used_animals = np.zeros((batch_size, self.matrix_size), dtype=bool)
+        active = np.ones(batch_size, dtype=bool)
+        
+        for step in range(min(num_crossings, pool_size)):
+            # Candidatos sem animais já usados; se não houver, permitir reutilizar animais
+            free = ~used_pairs
+            strict = free & ~used_animals[batch[:, None], pool_i] & ~used_animals[batch[:, None], pool_j]
+            candidates = np.where(strict.any(axis=1, keepdims=True), strict, free)
+            ranks = np.cumsum(candidates, axis=1)
+            num_candidates = ranks[:, -1]
+            active &= num_candidates > 0
+            if not active.any():
+                break
+            
+            # RCL: entre os 100 melhores candidatos, os de custo até o limiar do alpha
+            top_count = np.minimum(100, num_candidates)
+            min_cost = pool_cost[batch, np.argmax(candidates, axis=1)]
+            max_cost = pool_cost[batch, np.argmax(candidates & (ranks == top_count[:, None]), axis=1)]
+            threshold = min_cost + alphas * (max_cost - min_cost)
+            rcl_size = np.count_nonzero(candidates & (ranks <= top_count[:, None]) &
+                                        (pool_cost <= threshold[:, None]), axis=1)
+            
+            # Com menos de 10 na RCL, até 5 candidatos aleatórios do restante entram no
+            # sorteio; sortear um deles equivale a sortear entre todos os restantes
+            remaining = num_candidates - rcl_size
+            extra = np.where(rcl_size < 10, np.minimum(5, remaining), 0)
+            draw = (rng.random(batch_size) * (rcl_size + extra)).astype(np.int64)
+            rest_draw = rcl_size + (rng.random(batch_size) * remaining).astype(np.int64)
+            chosen_rank = np.where(draw < rcl_size, draw, rest_draw) + 1
+            position = np.argmax(candidates & (ranks == chosen_rank[:, None]), axis=1)
+            
+            selected = np.flatnonzero(active)
+            selected_pos = position[selected]
+            selected_i = pool_i[selected, selected_pos]
+            selected_j = pool_j[selected, selected_pos]
+            used_pairs[selected, selected_pos] = True
+            for b, i, j in zip(selected.tolist(), selected_i.tolist(), selected_j.tolist()):
+                solutions[b].append((i, j))
+            
+            # A cada 3 seleções, liberar os animais usados
+            if (step + 1) % 3 == 0:
+                used_animals[selected] = False
+            else:
+                used_animals[selected, selected_i] = True
+                used_animals[selected, selected_j] = True
+        
+        return solutions
+    
     def local_search(self, solution: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
         """
         Perform local search to improve the solution working on crossing pairs.
@@ -183,40 +492,34 @@ class GRASPOptimizer:
         Returns:
             Improved solution
         """
+        if self.kernel_backend != 'python':
+            return self._kernel_local_search(solution)
+        
         current_solution = solution.copy()
         current_cost = self.calculate_crossing_cost(current_solution)
         
         improved = True
         iterations = 0
+        moves_evaluated = 0
+        moves_accepted = 0
         
-        # Pré-calcular todos os cruzamentos possíveis ordenados por coancestralidade
-        if not hasattr(self, '_sorted_crossings'):
-            all_crossings = []
-            for i in range(self.matrix_size):
-                for j in range(i + 1, self.matrix_size):
-                    all_crossings.append((i, j, self.coancestry_matrix[i, j]))
-            
-            # Ordenar por coancestralidade (menor primeiro)
-            all_crossings.sort(key=lambda x: x[2])
-            self._sorted_crossings = all_crossings
-        
-        # Embaralhar candidatos para evitar padrões sequenciais
-        candidate_pool = self._sorted_crossings.copy()
+        # Embaralhar candidatos (índice ordenado compartilhado) para evitar padrões sequenciais
+        candidate_pool = self.get_crossing_index().as_tuples().copy()
         random.shuffle(candidate_pool)
         
-        # Limitar número de candidatos baseado no número de iterações para otimização
-        if self.max_iterations > 500:
-            max_candidates = min(50, len(candidate_pool))  # Muito menos candidatos para iterações altas
-        elif self.max_iterations > 200:
-            max_candidates = min(75, len(candidate_pool))  # Candidatos reduzidos
-        else:
-            max_candidates = min(100, len(candidate_pool))  # Candidatos normais para iterações baixas
-        
-        top_candidates = candidate_pool[:max_candidates]
+        top_candidates = candidate_pool[:self._local_search_pool_size(len(candidate_pool))]
         
         # Reordenar por coancestralidade após embaralhamento
         top_candidates.sort(key=lambda x: x[2])
         
+        # Cruzamentos da solução (conjunto hash) e uso de cada animal, atualizados a cada
+        # troca: as verificações de cada movimento não percorrem a solução
+        solution_crossings = set(current_solution)
+        animal_usage = [0] * self.matrix_size
+        for ci, cj in current_solution:
+            animal_usage[ci] += 1
+            animal_usage[cj] += 1
+        
         while improved and iterations < self.local_search_iterations:
             improved = False
             iterations += 1
@@ -236,32 +539,68 @@ class GRASPOptimizer:
                 
                 # Tentar substituir por candidatos de baixa coancestralidade
                 for new_i, new_j, new_cost in top_candidates:
-                    if (new_i, new_j) not in current_solution and new_cost < current_crossing_cost:
-                        # Verificar se não cria sequência de animais
-                        current_animals = set()
-                        for ci, cj in current_solution:
-                            if (ci, cj) != current_crossing:
-                                current_animals.add(ci)
-                                current_animals.add(cj)
+                    moves_evaluated += 1
+                    if (new_i, new_j) not in solution_crossings and new_cost < current_crossing_cost:
+                        # Verificar se não cria sequência de animais: uso pelos demais
+                        # cruzamentos (descontando o cruzamento que sai)
+                        new_i_usage = animal_usage[new_i] - (new_i == current_i) - (new_i == current_j)
+                        new_j_usage = animal_usage[new_j] - (new_j == current_i) - (new_j == current_j)
                         
                         # Aceitar substituição se não cria muita sobreposição
-                        if new_i not in current_animals or new_j not in current_animals:
+                        if new_i_usage == 0 or new_j_usage == 0:
                             new_solution = current_solution.copy()
                             new_solution[idx] = (new_i, new_j)
                             
                             total_new_cost = self.calculate_crossing_cost(new_solution)
                             
                             if total_new_cost < current_cost:
+                                moves_accepted += 1
                                 current_solution = new_solution
                                 current_cost = total_new_cost
+                                solution_crossings.discard(current_crossing)
+                                solution_crossings.add((new_i, new_j))
+                                animal_usage[current_i] -= 1
+                                animal_usage[current_j] -= 1
+                                animal_usage[new_i] += 1
+                                animal_usage[new_j] += 1
                                 improved = True
                                 break
                 
                 if improved:
                     break
         
+        self.profile['moves_evaluated'] += moves_evaluated
+        self.profile['moves_accepted'] += moves_accepted
+        
         return current_solution
     
+    def _kernel_local_search(self, solution: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """
+        Local search of the 'jit' / 'interpreted' backends (grasp_kernels.local_search).
+        
+        Args:
+            solution: Current solution as list of crossing pairs
+            
+        Returns:
+            Improved solution
+        """
+        rows, cols, values = self._sorted_crossing_arrays()
+        sol_i, sol_j = self._solution_arrays(solution)
+        sol_cost = np.asarray(self.coancestry_matrix[sol_i, sol_j], dtype=float).reshape(-1)
+        
+        rng_state = self._kernel_rng_state()
+        pool = self._kernel('sample_positions')(values.size, self._local_search_pool_size(values.size),
+                                                rng_state)
+        moves_evaluated, moves_accepted = self._kernel('local_search')(
+            sol_i, sol_j, sol_cost, rows[pool], cols[pool], values[pool],
+            self.matrix_size, self.local_search_iterations, rng_state
+        )
+        
+        self.profile['moves_evaluated'] += int(moves_evaluated)
+        self.profile['moves_accepted'] += int(moves_accepted)
+        
+        return list(zip(sol_i.tolist(), sol_j.tolist()))
+    
     def calculate_crossing_cost(self, solution: List[Tuple[int, int]]) -> float:
         """
         Calculate cost for a solution of crossing pairs.
@@ -272,10 +611,158 @@ class GRASPOptimizer:
         Returns:
             Total coancestry cost
         """
-        total_cost = 0.0
-        for i, j in solution:
-            total_cost += self.coancestry_matrix[i, j]
-        return total_cost
+        if not solution:
+            return 0.0
+        
+        costs, _ = self.evaluate_solutions(np.asarray(solution).reshape(1, -1, 2))
+        return float(costs[0])
+    
+    PROFILED_PHASES = ('construction', 'local_search', 'path_relinking',
+                       'diversify_solution', 'convert_to_crossing_details')
+    
+    def _reset_profile(self):
+        """
+        Reset the per-phase profile counters.
+        """
+        self.profile = {phase: {'calls': 0, 'time': 0.0} for phase in self.PROFILED_PHASES}
+        self.profile['moves_evaluated'] = 0
+        self.profile['moves_accepted'] = 0
+        self.profile['iterations'] = 0
+        self.profile['total_time'] = 0.0
+    
+    def _run_phase(self, phase: str, function: Callable, *args):
+        """
+        Run one phase of the algorithm accumulating its call count and elapsed time.
+        
+        Args:
+            phase: Phase name (one of PROFILED_PHASES)
+            function: Method implementing the phase
+            *args: Arguments forwarded to the method
+            
+        Returns:
+            Whatever the phase method returns
+        """
+        start = time.perf_counter()
+        result = function(*args)
+        entry = self.profile[phase]
+        entry['calls'] += 1
+        entry['time'] += time.perf_counter() - start
+        return result
+    
+    def get_profile(self) -> dict:
+        """
+        Get the profile of the last optimize() call.
+        
+        Returns:
+            Dictionary with, for each phase, the number of calls and total time in
+            seconds, plus local search moves evaluated/accepted, iterations and total time
+        """
+        return {key: dict(value) if isinstance(value, dict) else value
+                for key, value in self.profile.items()}
+    
+    def update_elite_pool(self, solution: List[Tuple[int, int]], cost: float) -> bool:
+        """
+        Insert a solution into the elite pool if it is new and good enough.
+        
+        Args:
+            solution: Locally optimal solution as list of crossing pairs
+            cost: Cost of the solution
+            
+        Returns:
+            True if the solution was added to the elite pool
+        """
+        if self.elite_size <= 0 or not solution:
+            return False
+        
+        # Ignorar soluções já presentes (mesmo conjunto de cruzamentos)
+        solution_set = set(solution)
+        for _, elite_solution in self.elite_solutions:
+            if set(elite_solution) == solution_set:
+                return False
+        
+        if len(self.elite_solutions) >= self.elite_size:
+            # Conjunto cheio: só entra se for melhor que a pior solução elite
+            if cost >= self.elite_solutions[-1][0]:
+                return False
+            self.elite_solutions.pop()
+        
+        self.elite_solutions.append((cost, list(solution)))
+        self.elite_solutions.sort(key=lambda x: x[0])
+        return True
+    
+    def path_relinking(self, initial_solution: List[Tuple[int, int]],
+                       guiding_solution: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """
+        Explore the path between a solution and an elite (guiding) solution.
+        
+        At each step the crossing of the current solution that is not in the
+        guiding solution is replaced by a crossing of the guiding solution,
+        choosing the move with the lowest resulting cost. As in local_search, a
+        move is only allowed when at least one animal of the added crossing is
+        not used by the other crossings; the path stops when no move is allowed.
+        The best solution visited along the path is returned.
+        
+        Args:
+            initial_solution: Starting solution as list of crossing pairs
+            guiding_solution: Elite solution that guides the path
+            
+        Returns:
+            Best solution found along the path (may be the initial solution)
+        """
+        current = list(initial_solution)
+        best_solution = list(initial_solution)
+        best_cost = self.calculate_crossing_cost(best_solution)
+        current_cost = best_cost
+        
+        guiding_set = set(guiding_solution)
+        to_remove = [crossing for crossing in current if crossing not in guiding_set]
+        current_set = set(current)
+        to_add = [crossing for crossing in guiding_solution if crossing not in current_set]
+        
+        # Uso de cada animal na solução atual (mesma regra de sobreposição da busca local)
+        animal_usage = [0] * self.matrix_size
+        for ci, cj in current:
+            animal_usage[ci] += 1
+            animal_usage[cj] += 1
+        
+        while to_remove and to_add:
+            # Escolher o movimento (remover, adicionar) permitido que gera o menor custo
+            best_move = None
+            best_move_cost = float('inf')
+            for remove_crossing in to_remove:
+                remove_i, remove_j = remove_crossing
+                remove_cost = self.coancestry_matrix[remove_i, remove_j]
+                for add_crossing in to_add:
+                    add_i, add_j = add_crossing
+                    add_i_usage = animal_usage[add_i] - (add_i == remove_i) - (add_i == remove_j)
+                    add_j_usage = animal_usage[add_j] - (add_j == remove_i) - (add_j == remove_j)
+                    if add_i_usage > 0 and add_j_usage > 0:
+                        continue
+                    
+                    move_cost = (current_cost - remove_cost +
+                                 self.coancestry_matrix[add_i, add_j])
+                    if move_cost < best_move_cost:
+                        best_move_cost = move_cost
+                        best_move = (remove_crossing, add_crossing)
+            
+            if best_move is None:
+                break
+            
+            remove_crossing, add_crossing = best_move
+            current[current.index(remove_crossing)] = add_crossing
+            current_cost = best_move_cost
+            to_remove.remove(remove_crossing)
+            to_add.remove(add_crossing)
+            for animal in remove_crossing:
+                animal_usage[animal] -= 1
+            for animal in add_crossing:
+                animal_usage[animal] += 1
+            
+            if current_cost < best_cost:
+                best_cost = current_cost
+                best_solution = list(current)
+        
+        return best_solution
     
     def optimize(self, progress_callback: Optional[Callable] = None, num_crossings: int = None) -> Tuple[List[Tuple[int, int]], float, List[float]]:
         """
@@ -292,30 +779,70 @@ class GRASPOptimizer:
         self.best_solution = None
         self.best_cost = float('inf')
         self.best_crossings = []
+        self.elite_solutions = []
+        self.best_iteration = 0
+        self.time_to_best = 0.0
+        self._reset_profile()
+        start_time = time.perf_counter()
         
         no_improvement_count = 0
         max_no_improvement = min(50, self.max_iterations // 10)  # Convergência antecipada adaptativa
         
+        base_alpha = self.alpha
+        pending_solutions = []  # (alpha, solução) construídas em lote e ainda não processadas
+        
         for iteration in range(self.max_iterations):
-            # Construction phase - selecionar cruzamentos da matriz
-            solution = self.greedy_randomized_construction(num_crossings)
+            if self.batch_size > 1:
+                # Construção em lote: um sorteio de alpha por solução do lote
+                if not pending_solutions:
+                    # Lote limitado às iterações que ainda podem rodar antes da parada antecipada,
+                    # para que nenhuma solução construída seja descartada
+                    batch_size = min(self.batch_size, self.max_iterations - iteration,
+                                     max(1, max_no_improvement - no_improvement_count))
+                    if self.reactive_alpha is not None:
+                        alphas = [self.reactive_alpha.sample() for _ in range(batch_size)]
+                    else:
+                        alphas = [base_alpha] * batch_size
+                    solutions = self._run_phase('construction', self.greedy_randomized_construction_batch,
+                                                batch_size, num_crossings, alphas)
+                    pending_solutions = list(zip(alphas, solutions))[::-1]
+                self.alpha, solution = pending_solutions.pop()
+            else:
+                # GRASP reativo: sortear alpha conforme a qualidade observada
+                if self.reactive_alpha is not None:
+                    self.alpha = self.reactive_alpha.sample()
+                
+                # Construction phase - selecionar cruzamentos da matriz
+                solution = self._run_phase('construction', self.greedy_randomized_construction, num_crossings)
             
             # Local search phase - aplicar com menos frequência para iterações altas
             if self.max_iterations > 500 and iteration % 3 == 0:
-                solution = self.local_search(solution)  # Busca local esporádica
+                solution = self._run_phase('local_search', self.local_search, solution)  # Busca local esporádica
             elif self.max_iterations <= 500:
-                solution = self.local_search(solution)  # Busca local normal
+                solution = self._run_phase('local_search', self.local_search, solution)  # Busca local normal
+            
+            # Path-relinking entre a solução atual e uma solução do conjunto elite
+            if self.use_path_relinking and self.elite_solutions:
+                guiding_solution = random.choice(self.elite_solutions)[1]
+                solution = self._run_phase('path_relinking', self.path_relinking, solution, guiding_solution)
             
             # Evaluate solution
             cost = self.calculate_crossing_cost(solution)
+            self.update_elite_pool(solution, cost)
+            
+            if self.reactive_alpha is not None:
+                self.reactive_alpha.record(self.alpha, cost)
             
             # Update best solution
             if cost < self.best_cost:
                 self.best_cost = cost
                 # Diversificar solução antes de salvar
-                diversified_solution = self.diversify_solution(solution)
+                diversified_solution = self._run_phase('diversify_solution', self.diversify_solution, solution)
                 self.best_solution = diversified_solution.copy()
-                self.best_crossings = self.convert_to_crossing_details(diversified_solution)
+                self.best_crossings = self._run_phase('convert_to_crossing_details',
+                                                      self.convert_to_crossing_details, diversified_solution)
+                self.best_iteration = iteration + 1
+                self.time_to_best = time.perf_counter() - start_time
                 no_improvement_count = 0  # Reset contador
             else:
                 no_improvement_count += 1
@@ -331,6 +858,10 @@ class GRASPOptimizer:
             if no_improvement_count >= max_no_improvement:
                 break
         
+        self.alpha = base_alpha
+        self.profile['iterations'] = len(self.iteration_costs)
+        self.profile['total_time'] = time.perf_counter() - start_time
+        
         return self.best_solution, self.best_cost, self.iteration_costs
     
     def convert_to_crossing_details(self, solution: List[Tuple[int, int]]) -> List[dict]:
@@ -369,8 +900,14 @@ class GRASPOptimizer:
         """
         if len(solution) <= 1:
             return solution
+        
+        if self.kernel_backend != 'python':
+            sol_i, sol_j = self._solution_arrays(solution)
+            order = self._kernel('diversify_solution')(sol_i, sol_j, self.matrix_size)
+            return [solution[k] for k in order.tolist()]
             
         diversified = []
+        added = set()  # Cruzamentos já incluídos (consulta O(1) em vez de percorrer a lista)
         used_animals = set()
         
         # Primeira passagem: incluir cruzamentos sem animais repetidos
@@ -378,24 +915,27 @@ class GRASPOptimizer:
             i, j = crossing
             if i not in used_animals and j not in used_animals:
                 diversified.append(crossing)
+                added.add(crossing)
                 used_animals.add(i)
                 used_animals.add(j)
         
         # Segunda passagem: incluir cruzamentos restantes com menor sobreposição
         for crossing in solution:
-            if crossing not in diversified:
+            if crossing not in added:
                 i, j = crossing
                 overlap = (i in used_animals) + (j in used_animals)
                 if overlap <= 1:  # Permitir sobreposição de até 1 animal
                     diversified.append(crossing)
+                    added.add(crossing)
                     used_animals.add(i)
                     used_animals.add(j)
         
         # Se ainda não temos cruzamentos suficientes, incluir os restantes
         if len(diversified) < len(solution) // 2:
             for crossing in solution:
-                if crossing not in diversified:
+                if crossing not in added:
                     diversified.append(crossing)
+                    added.add(crossing)
                     if len(diversified) >= len(solution):
                         break
         
@@ -408,7 +948,7 @@ class GRASPOptimizer:
         Returns:
             Binary matrix where 1 indicates selected crossings
         """
-        matrix = np.zeros_like(self.coancestry_matrix)
+        matrix = np.zeros(self.coancestry_matrix.shape)
         
         if self.best_solution:
             for i, j in self.best_solution:
@@ -417,28 +957,43 @@ class GRASPOptimizer:
         
         return matrix
     
+    def get_crossings_ranking(self) -> CrossingRanking:
+        """
+        Get a lazy ranking of all possible crossings, flagging the best solution.
+        
+        Returns:
+            CrossingRanking over the upper triangle of the coancestry matrix
+        """
+        return CrossingRanking(self.coancestry_matrix, self.pair_names, self.best_solution,
+                               self.get_crossing_index())
+    
+    def get_ranked_crossings_page(self, page: int = 0, page_size: int = 100) -> pd.DataFrame:
+        """
+        Get one page of all possible crossings ranked by coancestry coefficient.
+        
+        Args:
+            page: Page number (0-based)
+            page_size: Number of crossings per page
+            
+        Returns:
+            Columnar DataFrame with rank, pair indices, pair names, coancestry and selected flag
+        """
+        return self.get_crossings_ranking().page(page, page_size)
+    
     def get_all_crossings_ranked(self) -> List[dict]:
         """
         Get all possible crossings ranked by coancestry coefficient.
         
+        Prefer get_ranked_crossings_page for large matrices: this method
+        materializes one dict per crossing.
+        
         Returns:
             List of all crossings sorted by coancestry (best first)
         """
+        ranking = self.get_crossings_ranking()
         all_crossings = []
-        
-        for i in range(self.matrix_size):
-            for j in range(i + 1, self.matrix_size):
-                all_crossings.append({
-                    'pair1_idx': i,
-                    'pair2_idx': j,
-                    'pair1_name': self.pair_names[i],
-                    'pair2_name': self.pair_names[j],
-                    'coancestry': self.coancestry_matrix[i, j],
-                    'selected': (i, j) in (self.best_solution or [])
-                })
-        
-        # Ordenar por coancestralidade (menor primeiro)
-        all_crossings.sort(key=lambda x: x['coancestry'])
+        for page in ranking.iter_pages():
+            all_crossings.extend(page.drop(columns='rank').to_dict('records'))
         return all_crossings
     
     def get_solution_statistics(self, solution: List[int]) -> dict:
@@ -0,0 +1,299 @@
+import numpy as np
+from typing import Tuple
+
+# Numba é opcional: sem ele os mesmos kernels rodam como Python puro
+try:
+    from numba import njit
+    JIT_AVAILABLE = True
+except ImportError:
+    JIT_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        # Decorador neutro: @njit e @njit(...) devolvem a própria função
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda function: function
+
+# Gerador congruencial (MINSTD): os produtos cabem em int64, então a sequência é a
+# mesma compilada ou interpretada, o que permite validar um backend contra o outro
+RNG_MODULUS = 2147483647
+RNG_MULTIPLIER = 48271
+
+
+@njit(cache=True)
+def _uniform(rng_state: np.ndarray) -> float:
+    # Próximo número em [0, 1); o estado fica em um array de 1 elemento
+    rng_state[0] = (rng_state[0] * RNG_MULTIPLIER) % RNG_MODULUS
+    return (rng_state[0] - 1) / (RNG_MODULUS - 1)
+
+
+@njit(cache=True)
+def _randint(rng_state: np.ndarray, upper: int) -> int:
+    # Inteiro uniforme em [0, upper)
+    value = int(_uniform(rng_state) * upper)
+    return value if value < upper else upper - 1
+
+
+@njit(cache=True)
+def _shuffle(values: np.ndarray, rng_state: np.ndarray):
+    # Fisher-Yates no próprio array
+    for k in range(values.size - 1, 0, -1):
+        swap = _randint(rng_state, k + 1)
+        values[k], values[swap] = values[swap], values[k]
+
+
+@njit(cache=True)
+def sample_positions(num_total: int, sample_size: int, rng_state: np.ndarray) -> np.ndarray:
+    """
+    Random sample of distinct positions in [0, num_total), returned in increasing order
+    (Floyd's algorithm: O(sample_size) memory, independent of num_total).
+    """
+    chosen = np.empty(sample_size, dtype=np.int64)
+    if sample_size == 0:
+        return chosen
+    # Conjunto de int64 (o Numba precisa do tipo: criado com um elemento e esvaziado)
+    seen = {np.int64(0)}
+    seen.clear()
+    for k in range(sample_size):
+        upper = num_total - sample_size + k
+        position = np.int64(_randint(rng_state, upper + 1))
+        if position in seen:
+            position = np.int64(upper)
+        seen.add(position)
+        chosen[k] = position
+    return np.sort(chosen)
+
+
+@njit(cache=True)
+def construct_solution(pool_i: np.ndarray, pool_j: np.ndarray, pool_cost: np.ndarray,
+                       num_crossings: int, alpha: float, matrix_size: int,
+                       rng_state: np.ndarray) -> np.ndarray:
+    """
+    Greedy randomized construction over a candidate pool sorted by coancestry.
+
+    Same rules as GRASPOptimizer.greedy_randomized_construction: candidates
+    avoid already used animals (falling back to any unused crossing), the RCL
+    holds the best of the first 100 candidates within the alpha threshold and,
+    when it has fewer than 10 entries, up to 5 random candidates from the rest
+    join the draw.
+
+    Args:
+        pool_i, pool_j, pool_cost: Candidate crossings sorted by coancestry
+        num_crossings: Number of crossings to select
+        alpha: Greedy parameter
+        matrix_size: Number of pairs (animal index bound)
+        rng_state: Random state (int64 array of one element, updated in place)
+
+    Returns:
+        Pool positions of the selected crossings, in selection order
+    """
+    pool_size = pool_cost.size
+    used_pair = np.zeros(pool_size, dtype=np.bool_)
+    used_animal = np.zeros(matrix_size, dtype=np.bool_)
+    selected = np.empty(min(num_crossings, pool_size), dtype=np.int64)
+    count = 0
+
+    for _ in range(selected.size):
+        # Há candidatos sem nenhum animal já usado?
+        strict = False
+        for p in range(pool_size):
+            if not used_pair[p] and not used_animal[pool_i[p]] and not used_animal[pool_j[p]]:
+                strict = True
+                break
+
+        # Contar candidatos e localizar o primeiro e o 100º (limites do limiar)
+        num_candidates = 0
+        min_cost = 0.0
+        max_cost = 0.0
+        for p in range(pool_size):
+            if used_pair[p] or (strict and (used_animal[pool_i[p]] or used_animal[pool_j[p]])):
+                continue
+            num_candidates += 1
+            if num_candidates == 1:
+                min_cost = pool_cost[p]
+            if num_candidates <= 100:
+                max_cost = pool_cost[p]
+        if num_candidates == 0:
+            break
+
+        threshold = min_cost + alpha * (max_cost - min_cost)
+        rcl_size = 0
+        seen = 0
+        for p in range(pool_size):
+            if used_pair[p] or (strict and (used_animal[pool_i[p]] or used_animal[pool_j[p]])):
+                continue
+            seen += 1
+            if seen > 100 or pool_cost[p] > threshold:
+                break
+            rcl_size += 1
+
+        # Sortear um dos candidatos extras equivale a sortear entre todos os restantes
+        remaining = num_candidates - rcl_size
+        extra = min(5, remaining) if rcl_size < 10 else 0
+        rank = _randint(rng_state, rcl_size + extra)
+        if rank >= rcl_size:
+            rank = rcl_size + _randint(rng_state, remaining)
+
+        seen = -1
+        position = -1
+        for p in range(pool_size):
+            if used_pair[p] or (strict and (used_animal[pool_i[p]] or used_animal[pool_j[p]])):
+                continue
+            seen += 1
+            if seen == rank:
+                position = p
+                break
+
+        used_pair[position] = True
+        selected[count] = position
+        count += 1
+
+        # A cada 3 seleções, liberar os animais usados
+        if count % 3 == 0:
+            used_animal[:] = False
+        else:
+            used_animal[pool_i[position]] = True
+            used_animal[pool_j[position]] = True
+
+    return selected[:count]
+
+
+@njit(cache=True)
+def local_search(sol_i: np.ndarray, sol_j: np.ndarray, sol_cost: np.ndarray,
+                 cand_i: np.ndarray, cand_j: np.ndarray, cand_cost: np.ndarray,
+                 matrix_size: int, max_iterations: int, rng_state: np.ndarray) -> Tuple[int, int]:
+    """
+    First-improvement local search replacing crossings by lower-coancestry candidates.
+
+    Same moves as GRASPOptimizer.local_search. The solution arrays are updated
+    in place. Animal overlap is checked against per-animal usage counts, so a
+    move check does not depend on the solution size.
+
+    Args:
+        sol_i, sol_j, sol_cost: Crossings of the solution and their coancestry
+        cand_i, cand_j, cand_cost: Candidate crossings (shuffled in place)
+        matrix_size: Number of pairs (animal index bound)
+        max_iterations: Maximum number of improvement rounds
+        rng_state: Random state (int64 array of one element, updated in place)
+
+    Returns:
+        Tuple of (moves evaluated, moves accepted)
+    """
+    size = sol_cost.size
+    current_cost = 0.0
+    animal_usage = np.zeros(matrix_size, dtype=np.int64)
+    for k in range(size):
+        current_cost += sol_cost[k]
+        animal_usage[sol_i[k]] += 1
+        animal_usage[sol_j[k]] += 1
+
+    order = np.arange(size)
+    candidates = np.arange(cand_cost.size)
+    moves_evaluated = 0
+    moves_accepted = 0
+    improved = True
+    iterations = 0
+
+    while improved and iterations < max_iterations:
+        improved = False
+        iterations += 1
+        _shuffle(order, rng_state)
+
+        for idx in order:
+            current_i = sol_i[idx]
+            current_j = sol_j[idx]
+            current_crossing_cost = sol_cost[idx]
+            _shuffle(candidates, rng_state)
+
+            for c in candidates:
+                moves_evaluated += 1
+                new_i = cand_i[c]
+                new_j = cand_j[c]
+                if cand_cost[c] >= current_crossing_cost:
+                    continue
+
+                # Animais dos demais cruzamentos: aceitar se ao menos um dos novos é livre.
+                # Isso também descarta cruzamentos já presentes na solução (os dois
+                # animais estariam em uso, ou o custo seria igual ao do que sai)
+                new_i_usage = animal_usage[new_i] - (new_i == current_i) - (new_i == current_j)
+                new_j_usage = animal_usage[new_j] - (new_j == current_i) - (new_j == current_j)
+                if new_i_usage > 0 and new_j_usage > 0:
+                    continue
+
+                total_new_cost = 0.0
+                for k in range(size):
+                    total_new_cost += cand_cost[c] if k == idx else sol_cost[k]
+
+                if total_new_cost < current_cost:
+                    moves_accepted += 1
+                    animal_usage[current_i] -= 1
+                    animal_usage[current_j] -= 1
+                    animal_usage[new_i] += 1
+                    animal_usage[new_j] += 1
+                    sol_i[idx] = new_i
+                    sol_j[idx] = new_j
+                    sol_cost[idx] = cand_cost[c]
+                    current_cost = total_new_cost
+                    improved = True
+                    break
+
+            if improved:
+                break
+
+    return moves_evaluated, moves_accepted
+
+
+@njit(cache=True)
+def diversify_solution(sol_i: np.ndarray, sol_j: np.ndarray, matrix_size: int) -> np.ndarray:
+    """
+    Order of the crossings kept by GRASPOptimizer.diversify_solution.
+
+    Args:
+        sol_i, sol_j: Crossings of the solution
+        matrix_size: Number of pairs (animal index bound)
+
+    Returns:
+        Indices of the solution crossings in the diversified order
+    """
+    size = sol_i.size
+    used_animal = np.zeros(matrix_size, dtype=np.bool_)
+    added = np.zeros(size, dtype=np.bool_)
+    result = np.empty(size, dtype=np.int64)
+    count = 0
+
+    # Primeira passagem: cruzamentos sem animais repetidos
+    for k in range(size):
+        if not used_animal[sol_i[k]] and not used_animal[sol_j[k]]:
+            result[count] = k
+            count += 1
+            added[k] = True
+            used_animal[sol_i[k]] = True
+            used_animal[sol_j[k]] = True
+
+    # Segunda passagem: restantes com sobreposição de até 1 animal
+    for k in range(size):
+        if not added[k] and int(used_animal[sol_i[k]]) + int(used_animal[sol_j[k]]) <= 1:
+            result[count] = k
+            count += 1
+            added[k] = True
+            used_animal[sol_i[k]] = True
+            used_animal[sol_j[k]] = True
+
+    # Ainda poucos cruzamentos: completar com os restantes
+    if count < size // 2:
+        for k in range(size):
+            if count >= size:
+                break
+            if not added[k]:
+                result[count] = k
+                count += 1
+                added[k] = True
+
+    return result[:count]
+
+
+def interpreted(kernel):
+    """
+    Pure-Python version of a kernel (the original function when Numba compiled it).
+    """
+    return getattr(kernel, 'py_func', kernel)
@@ -0,0 +1,133 @@
+import numpy as np
+from typing import List, Tuple
+
+
+def block_edges(size: int, max_blocks: int) -> np.ndarray:
+    """
+    Split an axis of the given size into at most max_blocks contiguous blocks.
+
+    Args:
+        size: Number of rows or columns of the axis
+        max_blocks: Maximum number of blocks
+
+    Returns:
+        Array of block boundaries [0, ..., size] (length = number of blocks + 1)
+    """
+    num_blocks = max(1, min(size, max_blocks))
+    return np.unique(np.linspace(0, size, num_blocks + 1).astype(int))
+
+
+def downsample_matrix(matrix, max_rows: int = 150, max_cols: int = 150,
+                      method: str = 'mean') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Aggregate a matrix into a grid of at most max_rows x max_cols blocks.
+
+    Args:
+        matrix: 2-D matrix to aggregate (ndarray or PackedSymmetricMatrix)
+        max_rows: Maximum number of block rows
+        max_cols: Maximum number of block columns
+        method: 'mean' or 'min' aggregation of each block
+
+    Returns:
+        Tuple of (aggregated grid, row block edges, column block edges)
+    """
+    return extract_tile(matrix, 0, matrix.shape[0], 0, matrix.shape[1], max_rows, max_cols, method)
+
+
+def _aggregate_block(block: np.ndarray, col_edges: np.ndarray, method: str) -> np.ndarray:
+    # Agrega um pedaço denso (linhas de um bloco) nos blocos de coluna dados por col_edges
+    if method == 'min':
+        return np.minimum.reduceat(block.min(axis=0), col_edges[:-1])
+    return np.add.reduceat(block.sum(axis=0), col_edges[:-1])
+
+
+def extract_tile(matrix, row_start: int, row_end: int, col_start: int, col_end: int,
+                 max_rows: int = 300, max_cols: int = 300,
+                 method: str = 'mean') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Extract a region of the matrix, at full resolution when it fits the tile size.
+
+    Larger regions are aggregated block by block: each row block is read in
+    pieces of whole column blocks holding at most max_rows x max_cols cells,
+    so only tile-sized dense arrays are ever built. This keeps the memory of a
+    full-matrix view of a PackedSymmetricMatrix independent of its size.
+
+    Args:
+        matrix: 2-D matrix (ndarray or PackedSymmetricMatrix)
+        row_start, row_end: Row range [row_start, row_end)
+        col_start, col_end: Column range [col_start, col_end)
+        max_rows, max_cols: Maximum tile size sent to the browser
+        method: Aggregation used when the region is larger than the tile
+
+    Returns:
+        Tuple of (tile, row block edges, column block edges), with edges in
+        absolute matrix coordinates
+    """
+    if method not in ('mean', 'min'):
+        raise ValueError(f"Invalid aggregation method: {method}")
+
+    row_edges = block_edges(row_end - row_start, max_rows) + row_start
+    col_edges = block_edges(col_end - col_start, max_cols) + col_start
+
+    # Já cabe na tela: região em resolução completa
+    if len(row_edges) - 1 == row_end - row_start and len(col_edges) - 1 == col_end - col_start:
+        return np.asarray(matrix[row_start:row_end, col_start:col_end], dtype=float), row_edges, col_edges
+
+    cell_budget = max_rows * max_cols
+    grid = np.empty((len(row_edges) - 1, len(col_edges) - 1))
+
+    for r in range(len(row_edges) - 1):
+        top, bottom = row_edges[r], row_edges[r + 1]
+        cols_per_piece = max(1, cell_budget // (bottom - top))
+
+        c = 0
+        while c < len(col_edges) - 1:
+            # Blocos de coluna inteiros que cabem no orçamento de células (ao menos um)
+            last = np.searchsorted(col_edges, col_edges[c] + cols_per_piece, side='right') - 1
+            last = max(last, c + 1)
+            block = np.asarray(matrix[top:bottom, col_edges[c]:col_edges[last]], dtype=float)
+            grid[r, c:last] = _aggregate_block(block, col_edges[c:last + 1] - col_edges[c], method)
+            c = last
+
+    if method == 'mean':
+        grid /= np.outer(np.diff(row_edges), np.diff(col_edges))
+
+    return grid, row_edges, col_edges
+
+
+def block_labels(edges: np.ndarray, prefix: str) -> List[str]:
+    """
+    Build axis labels for blocks, e.g. 'P1' for single cells and 'P1–P50' for blocks.
+
+    Args:
+        edges: Block boundaries in absolute coordinates
+        prefix: Label prefix ('P', 'f', 'm')
+
+    Returns:
+        List with one label per block
+    """
+    labels = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end - start == 1:
+            labels.append(f'{prefix}{start + 1}')
+        else:
+            labels.append(f'{prefix}{start + 1}–{prefix}{end}')
+    return labels
+
+
+def locate_cells(edges: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """
+    Map cell indices to the block that contains them (-1 when outside the edges).
+
+    Args:
+        edges: Block boundaries in absolute coordinates
+        indices: Cell indices along the same axis
+
+    Returns:
+        Block index for each cell
+    """
+    indices = np.asarray(indices)
+    blocks = np.searchsorted(edges, indices, side='right') - 1
+    outside = (indices < edges[0]) | (indices >= edges[-1])
+    blocks[outside] = -1
+    return blocks
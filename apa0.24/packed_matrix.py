@@ -0,0 +1,204 @@
+import numpy as np
+from typing import Tuple
+
+
+class PackedSymmetricMatrix:
+    """
+    Symmetric matrix stored as its packed upper triangle.
+
+    Only the n(n-1)/2 values above the diagonal (in np.triu_indices(n, k=1)
+    order) and the n diagonal values are kept, about half the memory of the
+    dense n x n array. Element (i, j) lives at a closed-form offset of the
+    triangle, so scalar and vectorized lookups need no index tables.
+
+    Supports the subset of ndarray indexing used by the application:
+    m[i, j] (scalars or broadcastable index arrays, including np.ix_),
+    m[i] / row(i) for a full row, m[a:b, c:d] for a dense block and
+    np.asarray(m) for the full dense matrix.
+    """
+
+    ndim = 2
+
+    def __init__(self, triangle: np.ndarray, diagonal: np.ndarray):
+        """
+        Initialize the matrix.
+
+        Args:
+            triangle: Values above the diagonal in np.triu_indices(n, k=1) order
+            diagonal: Diagonal values (length n)
+        """
+        self.diagonal = np.asarray(diagonal, dtype=float)
+        self.size = self.diagonal.size
+        self.triangle = np.asarray(triangle, dtype=float)
+
+        if self.triangle.size != self.size * (self.size - 1) // 2:
+            raise ValueError(f"Triangle of {self.triangle.size} values does not match size {self.size}")
+
+        # Início de cada linha no vetor do triângulo
+        rows = np.arange(self.size, dtype=np.int64)
+        self.row_starts = rows * (2 * self.size - rows - 1) // 2
+
+    @classmethod
+    def from_pairs(cls, size: int, idx1: np.ndarray, idx2: np.ndarray, values: np.ndarray,
+                   diagonal: float = 1.0) -> 'PackedSymmetricMatrix':
+        """
+        Build the matrix from (i, j, value) entries; unset entries are zero.
+
+        Args:
+            size: Matrix size n
+            idx1, idx2: Row and column of each entry (either triangle)
+            values: Value of each entry
+            diagonal: Value of the main diagonal
+
+        Returns:
+            PackedSymmetricMatrix instance
+        """
+        matrix = cls(np.zeros(size * (size - 1) // 2), np.full(size, diagonal, dtype=float))
+        idx1 = np.asarray(idx1, dtype=np.int64)
+        idx2 = np.asarray(idx2, dtype=np.int64)
+
+        # Entradas da diagonal são ignoradas (a diagonal tem valor próprio)
+        off_diagonal = idx1 != idx2
+        matrix.triangle[matrix.offset(idx1[off_diagonal], idx2[off_diagonal])] = \
+            np.asarray(values, dtype=float)[off_diagonal]
+        return matrix
+
+    @classmethod
+    def from_dense(cls, matrix: np.ndarray) -> 'PackedSymmetricMatrix':
+        """
+        Pack a dense symmetric matrix (only its upper triangle is read).
+        """
+        matrix = np.asarray(matrix, dtype=float)
+        rows, cols = np.triu_indices(matrix.shape[0], k=1)
+        return cls(matrix[rows, cols], np.diagonal(matrix).copy())
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (self.size, self.size)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.triangle.dtype
+
+    @property
+    def nbytes(self) -> int:
+        return self.triangle.nbytes + self.diagonal.nbytes + self.row_starts.nbytes
+
+    def __len__(self) -> int:
+        return self.size
+
+    def offset(self, i, j):
+        """
+        Position of (i, j), i != j, in the triangle vector (vectorized; order of i and j is irrelevant).
+        """
+        low = np.minimum(i, j)
+        high = np.maximum(i, j)
+        return self.row_starts[low] + high - low - 1
+
+    def value(self, i: int, j: int) -> float:
+        """
+        Single element (i, j).
+        """
+        if i == j:
+            return self.diagonal[i]
+        if i > j:
+            i, j = j, i
+        return self.triangle[self.row_starts[i] + j - i - 1]
+
+    def take(self, rows, cols) -> np.ndarray:
+        """
+        Elements at broadcastable row and column index arrays (like m[rows, cols] on an ndarray).
+        """
+        rows, cols = np.broadcast_arrays(np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))
+        rows = np.where(rows < 0, rows + self.size, rows)
+        cols = np.where(cols < 0, cols + self.size, cols)
+
+        result = np.empty(rows.shape, dtype=float)
+        on_diagonal = rows == cols
+        result[on_diagonal] = self.diagonal[rows[on_diagonal]]
+        off_diagonal = ~on_diagonal
+        result[off_diagonal] = self.triangle[self.offset(rows[off_diagonal], cols[off_diagonal])]
+        return result
+
+    def row(self, i: int) -> np.ndarray:
+        """
+        Full row i as a dense vector.
+
+        The part right of the diagonal is a contiguous slice of the triangle; the
+        part left of it is gathered from column i of the rows above.
+        """
+        i = int(i) % self.size if self.size else int(i)
+        result = np.empty(self.size, dtype=float)
+
+        above = np.arange(i, dtype=np.int64)
+        result[:i] = self.triangle[self.row_starts[above] + i - above - 1]
+        result[i] = self.diagonal[i]
+        start = self.row_starts[i]
+        result[i + 1:] = self.triangle[start:start + self.size - i - 1]
+        return result
+
+    def _axis_indices(self, key):
+        # Índices de um eixo: fatias viram intervalos, escalares ficam escalares
+        if isinstance(key, slice):
+            return np.arange(*key.indices(self.size)), False
+        if isinstance(key, (int, np.integer)):
+            return np.int64(key), True
+        return np.asarray(key), False
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            if isinstance(key, (int, np.integer)):
+                return self.row(key)
+            key = (key, slice(None))
+        if len(key) != 2:
+            raise IndexError("PackedSymmetricMatrix takes exactly two indices")
+
+        i, j = key
+        if isinstance(i, (int, np.integer)) and isinstance(j, (int, np.integer)):
+            return self.value(i, j)
+
+        if isinstance(i, slice) or isinstance(j, slice):
+            # Bloco denso: fatias combinam como produto cartesiano (np.ix_)
+            rows, row_scalar = self._axis_indices(i)
+            cols, col_scalar = self._axis_indices(j)
+            block = self.take(np.reshape(rows, (-1, 1)), np.reshape(cols, (1, -1)))
+            if row_scalar:
+                return block[0]
+            if col_scalar:
+                return block[:, 0]
+            return block
+
+        return self.take(i, j)
+
+    def to_dense(self) -> np.ndarray:
+        """
+        Full n x n array.
+        """
+        dense = np.empty((self.size, self.size), dtype=float)
+        rows, cols = np.triu_indices(self.size, k=1)
+        dense[rows, cols] = self.triangle
+        dense[cols, rows] = self.triangle
+        np.fill_diagonal(dense, self.diagonal)
+        return dense
+
+    def __array__(self, dtype=None, copy=None):
+        dense = self.to_dense()
+        return dense if dtype is None else dense.astype(dtype)
+
+
+def upper_triangle(matrix) -> np.ndarray:
+    """
+    Values above the diagonal of a square matrix, in np.triu_indices(n, k=1) order.
+
+    For a PackedSymmetricMatrix this is the stored vector itself (no copy).
+
+    Args:
+        matrix: Dense ndarray or PackedSymmetricMatrix
+
+    Returns:
+        1-D array of n(n-1)/2 values
+    """
+    if isinstance(matrix, PackedSymmetricMatrix):
+        return matrix.triangle
+    rows, cols = np.triu_indices(matrix.shape[0], k=1)
+    return np.asarray(matrix[rows, cols])
@@ -0,0 +1,139 @@
+import numpy as np
+from typing import List
+
+
+def _top_k_per_row(breeding_matrix: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k lowest values of each row, ordered by (value, column).
+
+    Args:
+        breeding_matrix: Matrix females x males
+        k: Number of columns per row
+
+    Returns:
+        Array (num_rows, k) of column indices
+    """
+    num_cols = breeding_matrix.shape[1]
+    k = min(k, num_cols)
+    if k == 0:
+        return np.zeros((breeding_matrix.shape[0], 0), dtype=int)
+
+    if k < num_cols:
+        # Valor do k-ésimo menor de cada linha; empates nesse valor ficam com os menores índices
+        threshold = np.partition(breeding_matrix, k - 1, axis=1)[:, k - 1:k]
+        below = breeding_matrix < threshold
+        ties = breeding_matrix == threshold
+        missing = k - below.sum(axis=1, keepdims=True)
+        selected = below | (ties & (np.cumsum(ties, axis=1) <= missing))
+        candidates = np.nonzero(selected)[1].reshape(-1, k)
+    else:
+        candidates = np.tile(np.arange(num_cols), (breeding_matrix.shape[0], 1))
+
+    # Desempate pelo índice do macho, como na ordenação estável original
+    values = np.take_along_axis(breeding_matrix, candidates, axis=1)
+    order = np.lexsort((candidates, values), axis=1)
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+def _greedy_assignment(breeding_matrix: np.ndarray, females: np.ndarray,
+                       males: np.ndarray) -> np.ndarray:
+    """
+    Greedy one-to-one assignment of available males to females by increasing coancestry.
+
+    Equivalent to walking all (female, male) crossings sorted by (coancestry, female,
+    male) and taking each one whose female and male are still free, but done in
+    vectorized steps: in each step every crossing that is the best of both its row
+    and its column among the free females and males is accepted (greedy would take
+    all of them), then the accepted rows and columns are removed.
+
+    Args:
+        breeding_matrix: Matrix females x males
+        females: Indices of the females that need a male
+        males: Indices of the available males
+
+    Returns:
+        Array with the male assigned to each female in females (-1 when none is left)
+    """
+    assigned = np.full(len(females), -1, dtype=int)
+    free_rows = np.arange(len(females))
+    free_cols = np.asarray(males)
+
+    while free_rows.size and free_cols.size:
+        sub_matrix = breeding_matrix[np.ix_(females[free_rows], free_cols)]
+
+        # Melhor macho de cada fêmea e melhor fêmea de cada macho (argmin desempata pelo menor índice)
+        row_best = np.argmin(sub_matrix, axis=1)
+        col_best = np.argmin(sub_matrix, axis=0)
+        mutual = col_best[row_best] == np.arange(free_rows.size)
+
+        accepted_rows = np.flatnonzero(mutual)
+        assigned[free_rows[accepted_rows]] = free_cols[row_best[accepted_rows]]
+
+        keep_cols = np.ones(free_cols.size, dtype=bool)
+        keep_cols[row_best[accepted_rows]] = False
+        free_rows = free_rows[~mutual]
+        free_cols = free_cols[keep_cols]
+
+    return assigned
+
+
+def distribute_males_improved(breeding_matrix: np.ndarray, females: List[str], males: List[str],
+                              max_recommendations_per_female: int = 5,
+                              allow_reuse: bool = False) -> List[List[dict]]:
+    """
+    Distribute males to females, prioritizing the best crossings (lowest coancestry).
+
+    With allow_reuse, each female gets her max_recommendations_per_female best males
+    (per-row top-k). Without reuse, recommendations are given in rounds: in each round
+    every female that still needs a male receives the best male not yet used, assigned
+    greedily by increasing coancestry over a male-availability mask.
+
+    Args:
+        breeding_matrix: Matrix females x males with coancestry coefficients
+        females: Female identifiers (rows of breeding_matrix)
+        males: Male identifiers (columns of breeding_matrix)
+        max_recommendations_per_female: Number of recommendations per female
+        allow_reuse: Allow the same male to be recommended to several females
+
+    Returns:
+        List with, for each female, a list of dictionaries with female_idx,
+        male_idx and coancestry, best first
+    """
+    num_females = len(females)
+    num_males = len(males)
+    breeding_matrix = np.asarray(breeding_matrix)[:num_females, :num_males]
+
+    female_recommendations = [[] for _ in range(num_females)]
+
+    if allow_reuse:
+        top_males = _top_k_per_row(breeding_matrix, max_recommendations_per_female)
+        for i in range(num_females):
+            female_recommendations[i] = [{
+                'female_idx': i,
+                'male_idx': int(j),
+                'coancestry': breeding_matrix[i, j]
+            } for j in top_males[i]]
+        return female_recommendations
+
+    available_males = np.ones(num_males, dtype=bool)
+    females_in_round = np.arange(num_females)
+
+    for _ in range(max_recommendations_per_female):
+        if not available_males.any() or females_in_round.size == 0:
+            break
+
+        assigned = _greedy_assignment(breeding_matrix, females_in_round, np.flatnonzero(available_males))
+        has_male = assigned >= 0
+
+        for i, j in zip(females_in_round[has_male], assigned[has_male]):
+            female_recommendations[i].append({
+                'female_idx': int(i),
+                'male_idx': int(j),
+                'coancestry': breeding_matrix[i, j]
+            })
+        available_males[assigned[has_male]] = False
+
+        # Apenas fêmeas que receberam indicação nesta rodada seguem para a próxima
+        females_in_round = females_in_round[has_male]
+
+    return female_recommendations
@@ -0,0 +1,217 @@
+import numpy as np
+from typing import List, Tuple, Optional
+from crossing_ranking import CrossingRanking
+from crossing_index import SortedCrossingIndex
+from packed_matrix import upper_triangle
+
+
+class OptimizationRecord:
+    """
+    Compact, array-backed record of one GRASP execution.
+
+    Replaces keeping the GRASPOptimizer itself in the session state: only the
+    solution indices, the costs, the parameters and a downsampled convergence
+    trace are stored. Detailed views (crossing tables, ranked comparisons) are
+    rebuilt on demand from the coancestry matrix and pair names held by the
+    DataProcessor.
+
+    For compatibility with the results page, the record also supports
+    dictionary-style access (record['best_cost'], record.get('alpha'), ...).
+    """
+
+    MAX_TRACE_POINTS = 500
+
+    # Campos acessíveis como em um dicionário
+    FIELDS = ('execution', 'best_solution', 'best_cost', 'iteration_costs', 'execution_time',
+              'max_iterations', 'alpha', 'local_search_iterations', 'final_iterations',
+              'best_iteration', 'time_to_best', 'profile', 'alpha_probabilities',
+              'num_crossings_selected')
+
+    __slots__ = ('execution', 'solution', 'crossing_costs', 'best_cost', 'trace_iterations',
+                 'trace_costs', 'final_iterations', 'execution_time', 'max_iterations', 'alpha',
+                 'local_search_iterations', 'best_iteration', 'time_to_best', 'profile',
+                 'alpha_probabilities')
+
+    def __init__(self, execution: int, solution: np.ndarray, crossing_costs: np.ndarray,
+                 best_cost: float, trace_iterations: np.ndarray, trace_costs: np.ndarray,
+                 final_iterations: int, execution_time: float, max_iterations: int, alpha: float,
+                 local_search_iterations: int, best_iteration: int = 0, time_to_best: float = 0.0,
+                 profile: Optional[dict] = None, alpha_probabilities: Optional[dict] = None):
+        """
+        Initialize the record.
+
+        Args:
+            execution: Execution number (1-based)
+            solution: Array (k, 2) of int32 pair indices of the selected crossings
+            crossing_costs: Coancestry of each selected crossing, aligned with solution
+            best_cost: Total cost of the best solution
+            trace_iterations: Iterations kept in the downsampled convergence trace
+            trace_costs: Best cost at each kept iteration
+            final_iterations: Number of iterations actually executed
+            execution_time: Wall-clock time of the execution in seconds
+            max_iterations, alpha, local_search_iterations: GRASP parameters used
+            best_iteration: Iteration in which the best solution was found
+            time_to_best: Time until the best solution was found
+            profile: Per-phase profile (GRASPOptimizer.get_profile())
+            alpha_probabilities: Reactive alpha probabilities, if used
+        """
+        self.execution = execution
+        self.solution = solution
+        self.crossing_costs = crossing_costs
+        self.best_cost = best_cost
+        self.trace_iterations = trace_iterations
+        self.trace_costs = trace_costs
+        self.final_iterations = final_iterations
+        self.execution_time = execution_time
+        self.max_iterations = max_iterations
+        self.alpha = alpha
+        self.local_search_iterations = local_search_iterations
+        self.best_iteration = best_iteration
+        self.time_to_best = time_to_best
+        self.profile = profile
+        self.alpha_probabilities = alpha_probabilities
+
+    @classmethod
+    def from_optimizer(cls, optimizer, execution: int, execution_time: float,
+                       alpha: float = None, alpha_probabilities: Optional[dict] = None) -> 'OptimizationRecord':
+        """
+        Build a record from an optimizer after optimize() has run.
+
+        Args:
+            optimizer: GRASPOptimizer that has finished optimizing
+            execution: Execution number (1-based)
+            execution_time: Wall-clock time of the execution in seconds
+            alpha: Alpha to report (defaults to optimizer.alpha)
+            alpha_probabilities: Reactive alpha probabilities, if used
+
+        Returns:
+            OptimizationRecord without references to the optimizer
+        """
+        solution = np.array(optimizer.best_solution or [], dtype=np.int32).reshape(-1, 2)
+        crossing_costs = np.asarray(optimizer.coancestry_matrix[solution[:, 0], solution[:, 1]], dtype=float)
+        trace_iterations, trace_costs = cls.downsample_trace(optimizer.iteration_costs)
+
+        return cls(
+            execution=execution,
+            solution=solution,
+            crossing_costs=crossing_costs,
+            best_cost=float(optimizer.best_cost),
+            trace_iterations=trace_iterations,
+            trace_costs=trace_costs,
+            final_iterations=len(optimizer.iteration_costs),
+            execution_time=execution_time,
+            max_iterations=optimizer.max_iterations,
+            alpha=optimizer.alpha if alpha is None else alpha,
+            local_search_iterations=optimizer.local_search_iterations,
+            best_iteration=optimizer.best_iteration,
+            time_to_best=optimizer.time_to_best,
+            profile=optimizer.get_profile(),
+            alpha_probabilities=alpha_probabilities
+        )
+
+    @classmethod
+    def downsample_trace(cls, iteration_costs: List[float],
+                         max_points: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Reduce a best-cost-per-iteration trace to the iterations where it changes.
+
+        The trace is monotone (best cost so far), so keeping the first point, every
+        improvement and the last point preserves its shape exactly. If there are still
+        more than max_points, evenly spaced points are kept.
+
+        Args:
+            iteration_costs: Best cost after each iteration
+            max_points: Maximum number of points to keep
+
+        Returns:
+            Tuple of (iterations as int32, costs as float32)
+        """
+        max_points = max_points or cls.MAX_TRACE_POINTS
+        costs = np.asarray(iteration_costs, dtype=float)
+        if costs.size == 0:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+
+        keep = np.flatnonzero(np.diff(costs) != 0) + 1
+        keep = np.unique(np.concatenate(([0], keep, [costs.size - 1])))
+        if keep.size > max_points:
+            keep = keep[np.unique(np.linspace(0, keep.size - 1, max_points).astype(int))]
+
+        return keep.astype(np.int32), costs[keep].astype(np.float32)
+
+    @property
+    def best_solution(self) -> List[Tuple[int, int]]:
+        """Best solution as a list of (i, j) tuples, as returned by GRASPOptimizer"""
+        return [(int(i), int(j)) for i, j in self.solution]
+
+    @property
+    def num_crossings_selected(self) -> int:
+        return len(self.solution)
+
+    @property
+    def iteration_costs(self) -> List[float]:
+        """
+        Convergence trace expanded to one value per iteration (step function of the
+        downsampled trace).
+        """
+        if self.final_iterations == 0:
+            return []
+        positions = np.searchsorted(self.trace_iterations, np.arange(self.final_iterations), side='right') - 1
+        return self.trace_costs[positions].astype(float).tolist()
+
+    def crossing_details(self, pair_names: List[str]) -> List[dict]:
+        """
+        Rebuild the detailed crossings of the best solution.
+
+        Args:
+            pair_names: Pair names indexed like the coancestry matrix
+
+        Returns:
+            List of dictionaries sorted by coancestry (same format as
+            GRASPOptimizer.convert_to_crossing_details)
+        """
+        order = np.argsort(self.crossing_costs, kind='stable')
+        return [{
+            'pair1_idx': int(self.solution[k, 0]),
+            'pair2_idx': int(self.solution[k, 1]),
+            'pair1_name': pair_names[self.solution[k, 0]],
+            'pair2_name': pair_names[self.solution[k, 1]],
+            'coancestry': float(self.crossing_costs[k])
+        } for k in order]
+
+    def ranked_coefficients(self, coancestry_matrix) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Coefficients of every possible crossing and of the selected ones, both sorted.
+
+        Args:
+            coancestry_matrix: Coancestry matrix used in the optimization (dense or packed)
+
+        Returns:
+            Tuple of (all upper-triangle coefficients, selected coefficients)
+        """
+        return np.sort(upper_triangle(coancestry_matrix)), np.sort(self.crossing_costs)
+
+    def crossing_ranking(self, coancestry_matrix, pair_names: List[str],
+                         crossing_index: Optional[SortedCrossingIndex] = None) -> CrossingRanking:
+        """
+        Lazy, paginated ranking of all possible crossings with the best solution flagged.
+
+        Args:
+            coancestry_matrix: Coancestry matrix used in the optimization (dense or packed)
+            pair_names: Pair names indexed like the coancestry matrix
+            crossing_index: Shared SortedCrossingIndex of the matrix, if available
+
+        Returns:
+            CrossingRanking instance
+        """
+        return CrossingRanking(coancestry_matrix, pair_names, self.best_solution, crossing_index)
+
+    def __getitem__(self, key: str):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.FIELDS
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in self.FIELDS else default
@@ -0,0 +1,117 @@
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+import numpy as np
+import pandas as pd
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the memory used by a cached value, in bytes.
+
+    Args:
+        value: NumPy array, DataFrame, object exposing nbytes, container or scalar
+
+    Returns:
+        Approximate size in bytes
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    if isinstance(value, (str, bytes)):
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class DerivedViewCache:
+    """
+    LRU cache for derived views (recommendations, rankings, export tables)
+    with a total memory budget. Keys must identify the dataset and every
+    parameter the computation depends on, so that changing one widget only
+    recomputes the views that actually depend on it.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Memory budget; least recently used entries are evicted beyond it
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, computing and storing it if missing.
+
+        Args:
+            key: Hashable key (e.g. (view name, dataset hash, parameters...))
+            compute: Function without arguments that builds the value
+
+        Returns:
+            Cached or freshly computed value
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value for key without computing it.
+        """
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Store a value, evicting least recently used entries to respect the budget.
+        Values larger than the whole budget are not stored.
+        """
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            while self._entries and self.current_bytes + size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+
+    def clear(self):
+        """
+        Remove every entry from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
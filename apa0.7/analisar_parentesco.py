@@ -12,7 +12,181 @@ import numpy as np
 import os
 import time
 
-def analisar_parentesco_direto(arquivo_entrada, arquivo_saida, limite_combinacoes=100, valor_descarte=-1):
+# Linhas por bloco na leitura em streaming
+TAMANHO_BLOCO_PADRAO = 250000
+
+
+def ler_parentesco_em_blocos(arquivo_entrada, valor_descarte=-1, tamanho_bloco=TAMANHO_BLOCO_PADRAO,
+                             callback_progresso=None):
+    """
+    Lê o arquivo de parentesco em blocos, descartando já na leitura os cruzamentos
+    inviáveis (valor de descarte) e os coeficientes 1. Os animais são codificados
+    incrementalmente, de modo que apenas códigos inteiros e coeficientes das linhas
+    mantidas ficam em memória.
+    
+    Parâmetros:
+    arquivo_entrada (str): Caminho para o arquivo CSV de entrada
+    valor_descarte (float): Valor de coeficiente a ser descartado
+    tamanho_bloco (int): Número de linhas por bloco
+    callback_progresso (callable): Função chamada após cada bloco com
+        (linhas_lidas, bytes_lidos, total_bytes)
+    
+    Retorno:
+    tuple: (DataFrame com Animal_1 e Animal_2 categóricos e Coef, mantendo o índice
+            das linhas do arquivo; total de linhas lidas)
+    """
+    colunas_necessarias = ['Animal_1', 'Animal_2', 'Coef']
+    total_bytes = os.path.getsize(arquivo_entrada)
+    indice_animais = {}
+    partes_indice, partes_animal1, partes_animal2, partes_coef = [], [], [], []
+    linhas_lidas = 0
+
+    def codificar(valores):
+        codigos, unicos = pd.factorize(valores)
+        mapa = np.fromiter((indice_animais.setdefault(animal, len(indice_animais)) for animal in unicos),
+                           dtype=np.int32, count=len(unicos))
+        return mapa[codigos]
+
+    with open(arquivo_entrada, 'rb') as arquivo:
+        leitor = pd.read_csv(arquivo, chunksize=tamanho_bloco,
+                             usecols=lambda coluna: coluna in colunas_necessarias)
+        for bloco in leitor:
+            # Verificar as colunas necessárias
+            for coluna in colunas_necessarias:
+                if coluna not in bloco.columns:
+                    raise ValueError(f"A coluna {coluna} não está presente no arquivo CSV")
+
+            linhas_lidas += len(bloco)
+
+            # Remover coeficientes -1 (valor de descarte) e 1 (parentesco total)
+            bloco = bloco[(bloco['Coef'] != valor_descarte) & (bloco['Coef'] != 1.0)]
+
+            partes_indice.append(bloco.index.to_numpy())
+            partes_animal1.append(codificar(bloco['Animal_1']))
+            partes_animal2.append(codificar(bloco['Animal_2']))
+            partes_coef.append(bloco['Coef'].to_numpy())
+
+            if callback_progresso:
+                callback_progresso(linhas_lidas, min(arquivo.tell(), total_bytes), total_bytes)
+
+    categorias = pd.Index(list(indice_animais), dtype=object)
+
+    def juntar(partes, dtype):
+        return np.concatenate(partes) if partes else np.zeros(0, dtype=dtype)
+
+    df = pd.DataFrame({
+        'Animal_1': pd.Categorical.from_codes(juntar(partes_animal1, np.int32), categories=categorias),
+        'Animal_2': pd.Categorical.from_codes(juntar(partes_animal2, np.int32), categories=categorias),
+        'Coef': juntar(partes_coef, float)
+    }, index=juntar(partes_indice, np.int64))
+
+    return df, linhas_lidas
+
+
+def imprimir_progresso(linhas_lidas, bytes_lidos, total_bytes):
+    """Callback de progresso padrão: imprime linhas e percentual lidos"""
+    percentual = bytes_lidos / total_bytes * 100 if total_bytes else 0
+    print(f"  {linhas_lidas} linhas lidas ({percentual:.1f}%)")
+
+
+def selecionar_melhor_por_animal2(animal1, animal2, max_por_animal1, num_animais):
+    """
+    Seleciona, percorrendo os cruzamentos em ordem de coeficiente, o primeiro cruzamento
+    de cada Animal_2 cujo Animal_1 ainda não atingiu max_por_animal1 cruzamentos.
+    
+    Equivale ao percurso linha a linha, mas feito em rodadas vetorizadas: em cada rodada
+    toma-se a primeira linha válida de cada Animal_2 ainda não incluído e, pela posição
+    de cada candidata entre as do mesmo Animal_1, rejeitam-se as que estourariam o limite.
+    Um Animal_2 rejeitado volta a disputar na sua próxima linha válida; até a primeira
+    dessas linhas as decisões da rodada são exatas e são confirmadas, e a rodada seguinte
+    recomeça a partir dela.
+    
+    Parâmetros:
+    animal1 (np.ndarray): Códigos de Animal_1 dos cruzamentos ordenados por coeficiente
+    animal2 (np.ndarray): Códigos de Animal_2, na mesma ordem
+    max_por_animal1 (int): Número máximo de cruzamentos por Animal_1
+    num_animais (int): Total de códigos de animais
+    
+    Retorno:
+    np.ndarray: Máscara booleana das linhas (ordenadas) selecionadas
+    """
+    selecionadas = np.zeros(len(animal1), dtype=bool)
+    contagem = np.zeros(num_animais, dtype=np.int64)
+    incluidos = np.zeros(num_animais, dtype=bool)
+    saturados = np.zeros(num_animais, dtype=bool)
+    ativas = np.arange(len(animal1))
+
+    while True:
+        # Linhas que ainda podem ser escolhidas
+        ativas = ativas[~incluidos[animal2[ativas]] & ~saturados[animal1[ativas]]]
+        if ativas.size == 0:
+            break
+
+        # Primeira linha válida de cada Animal_2, em ordem de coeficiente
+        primeiras = np.full(num_animais, ativas.size)
+        np.minimum.at(primeiras, animal2[ativas], np.arange(ativas.size))
+        primeiras = np.sort(primeiras[primeiras < ativas.size])
+        candidatas = ativas[primeiras]
+
+        # Posição de cada candidata entre as candidatas do mesmo Animal_1
+        animal1_candidatas = animal1[candidatas]
+        ordem_grupo = np.argsort(animal1_candidatas, kind='quicksort')
+        agrupados = animal1_candidatas[ordem_grupo]
+        posicao_no_grupo = np.empty(candidatas.size, dtype=np.int64)
+        posicao_no_grupo[ordem_grupo] = np.arange(candidatas.size) - np.searchsorted(agrupados, agrupados)
+
+        estouro = contagem[animal1_candidatas] + posicao_no_grupo >= max_por_animal1
+
+        # Próxima linha válida dos Animal_2 rejeitados: a partir dela a rodada deixa de ser exata
+        rejeitados = np.zeros(num_animais, dtype=bool)
+        rejeitados[animal2[candidatas[estouro]]] = True
+        eh_candidata = np.zeros(ativas.size, dtype=bool)
+        eh_candidata[primeiras] = True
+        retornos = ativas[rejeitados[animal2[ativas]] & ~eh_candidata]
+        limite = retornos[0] if retornos.size else len(animal1)
+
+        aceitas = candidatas[~estouro & (candidatas < limite)]
+        selecionadas[aceitas] = True
+        incluidos[animal2[aceitas]] = True
+        contagem += np.bincount(animal1[aceitas], minlength=num_animais)
+        saturados = contagem >= max_por_animal1
+
+        if not retornos.size:
+            break
+        # Linhas anteriores ao primeiro retorno já foram resolvidas
+        ativas = ativas[ativas >= limite]
+
+    return selecionadas
+
+
+def selecionar_pares_adicionais(animal1, animal2, selecionadas, quantidade, num_animais):
+    """
+    Completa a seleção com os próximos melhores cruzamentos ainda não selecionados,
+    ignorando cruzamentos de um animal com ele mesmo e pares (sem ordem) repetidos.
+    
+    Parâmetros:
+    animal1, animal2 (np.ndarray): Códigos dos animais dos cruzamentos ordenados por coeficiente
+    selecionadas (np.ndarray): Máscara das linhas já selecionadas
+    quantidade (int): Número de cruzamentos a adicionar
+    num_animais (int): Total de códigos de animais
+    
+    Retorno:
+    np.ndarray: Posições (ordenadas) das linhas adicionadas
+    """
+    if quantidade <= 0:
+        return np.zeros(0, dtype=np.int64)
+
+    posicoes = np.flatnonzero(~selecionadas & (animal1 != animal2))
+    menor = np.minimum(animal1[posicoes], animal2[posicoes]).astype(np.int64)
+    maior = np.maximum(animal1[posicoes], animal2[posicoes]).astype(np.int64)
+
+    # Primeira ocorrência de cada par, na ordem de coeficiente
+    _, primeiras = np.unique(menor * num_animais + maior, return_index=True)
+    return posicoes[np.sort(primeiras)[:quantidade]]
+
+
+def analisar_parentesco_direto(arquivo_entrada, arquivo_saida, limite_combinacoes=100, valor_descarte=-1,
+                               tamanho_bloco=TAMANHO_BLOCO_PADRAO, callback_progresso=imprimir_progresso):
     """
     Analisa o arquivo de parentesco de produtos diretamente, sem criar uma matriz completa,
     e gera um arquivo com os melhores cruzamentos.
@@ -25,44 +199,43 @@ def analisar_parentesco_direto(arquivo_entrada, arquivo_saida, limite_combinacoe
     arquivo_saida (str): Caminho para o arquivo CSV de saída com os melhores cruzamentos
     limite_combinacoes (int): Número máximo de combinações a retornar
     valor_descarte (float): Valor de coeficiente a ser descartado
+    tamanho_bloco (int): Número de linhas lidas por bloco (memória limitada ao bloco
+        mais as linhas mantidas, codificadas)
+    callback_progresso (callable): Função chamada após cada bloco com
+        (linhas_lidas, bytes_lidos, total_bytes); None para não reportar
     """
     print(f"Analisando arquivo: {arquivo_entrada}")
     inicio = time.time()
     
-    # Lendo o arquivo CSV diretamente para um DataFrame
-    print("Lendo arquivo CSV...")
-    df = pd.read_csv(arquivo_entrada)
-    print(f"Arquivo lido com sucesso. {len(df)} linhas encontradas.")
-    
-    # Verificar as colunas necessárias
-    colunas_necessarias = ['Animal_1', 'Animal_2', 'Coef']
-    for coluna in colunas_necessarias:
-        if coluna not in df.columns:
-            raise ValueError(f"A coluna {coluna} não está presente no arquivo CSV")
+    # Lendo o arquivo CSV em blocos, já filtrando cruzamentos inviáveis e coeficientes 1
+    print("Lendo arquivo CSV em blocos e filtrando cruzamentos inviáveis e valores extremos...")
+    df, total_linhas = ler_parentesco_em_blocos(arquivo_entrada, valor_descarte, tamanho_bloco,
+                                                callback_progresso)
+    print(f"Arquivo lido com sucesso. {total_linhas} linhas encontradas, {len(df)} mantidas.")
     
-    # Filtrar cruzamentos inviáveis e coeficientes 1
-    print("Filtrando cruzamentos inviáveis e valores extremos...")
-    # Remover coeficientes -1 (valor de descarte)
-    df = df[df['Coef'] != valor_descarte]
-    # Remover coeficientes 1 (parentesco total)
-    df = df[df['Coef'] != 1.0]
+    # Arrays de códigos dos animais (mesma codificação nas duas colunas) e coeficientes
+    codigos_animal1 = df['Animal_1'].cat.codes.to_numpy()
+    codigos_animal2 = df['Animal_2'].cat.codes.to_numpy()
+    num_animais = len(df['Animal_1'].cat.categories)
     
     # Obter a lista de todos os animais únicos em Animal_2 - precisamos garantir que todos estejam nos resultados
-    todos_animal2 = df['Animal_2'].unique()
-    print(f"Total de produtos/animais únicos em Animal_2: {len(todos_animal2)}")
+    total_animal2 = int(np.count_nonzero(np.bincount(codigos_animal2, minlength=num_animais)))
+    print(f"Total de produtos/animais únicos em Animal_2: {total_animal2}")
     
     # Ordenar cruzamentos conforme método GRASPE
     print("Ordenando cruzamentos...")
     # Priorizamos coeficiente 0, depois usamos os coeficientes mais baixos
-    # Não precisamos de coluna auxiliar, ordenamos diretamente pelo coeficiente
-    df = df.sort_values(by=['Coef'], ascending=[True])
+    # Mesma ordenação do sort_values original (quicksort): a seleção gulosa por Animal_2
+    # depende da ordem dos empates (há muitos coeficientes 0), e essa ordem é a que
+    # cobre todos os Animal_2 no arquivo de exemplo (ver testar_analisar_parentesco.py)
+    ordem = np.argsort(df['Coef'].to_numpy(), kind='quicksort')
+    animal1_ordenado = codigos_animal1[ordem]
+    animal2_ordenado = codigos_animal2[ordem]
     
     # Isso garantirá que os coeficientes 0 venham primeiro, seguidos pelos próximos mais baixos em ordem crescente
     
     # Calcular distribuição ideal de cruzamentos
-    todos_animal1 = df['Animal_1'].unique()
-    total_animal1 = len(todos_animal1)
-    total_animal2 = len(todos_animal2)
+    total_animal1 = int(np.count_nonzero(np.bincount(codigos_animal1, minlength=num_animais)))
     
     # Definir o limite máximo de cruzamentos por Animal_1
     # Baseado na proporção Animal_2/Animal_1, arredondado para cima
@@ -74,67 +247,34 @@ def analisar_parentesco_direto(arquivo_entrada, arquivo_saida, limite_combinacoe
     
     # Remover duplicatas sem perder pares importantes
     print("Selecionando os melhores cruzamentos para cada Animal_2...")
-    animal2_incluidos = set()  # Controla quais Animal_2 já foram incluídos
-    contagem_animal1 = {}      # Contador de uso de cada Animal_1
-    linhas_selecionadas = []   # Índices das linhas que serão mantidas
-    
-    # Primeiro passamos pelo dataframe ordenado para pegar os melhores cruzamentos para cada Animal_2
-    for idx, row in df.iterrows():
-        animal1 = row['Animal_1']
-        animal2 = row['Animal_2']
-        
-        # Se este Animal_2 ainda não foi incluído
-        if animal2 not in animal2_incluidos:
-            # Verificamos se o Animal_1 já atingiu seu limite de cruzamentos
-            contagem_atual = contagem_animal1.get(animal1, 0)
-            
-            if contagem_atual < max_cruzamentos_por_animal1:
-                animal2_incluidos.add(animal2)
-                contagem_animal1[animal1] = contagem_atual + 1
-                linhas_selecionadas.append(idx)
-                
-                # Se já incluímos todos os Animal_2, podemos parar
-                if len(animal2_incluidos) >= len(todos_animal2):
-                    break
+    selecionadas = selecionar_melhor_por_animal2(animal1_ordenado, animal2_ordenado,
+                                                 max_cruzamentos_por_animal1, num_animais)
+    total_animal2_incluidos = int(np.count_nonzero(selecionadas))
     
     # Se não conseguimos incluir todos os Animal_2, emitimos um aviso
-    animal2_faltantes = set(todos_animal2) - animal2_incluidos
-    if animal2_faltantes:
-        print(f"AVISO: Não foi possível incluir {len(animal2_faltantes)} produtos Animal_2 nos cruzamentos.")
+    if total_animal2_incluidos < total_animal2:
+        print(f"AVISO: Não foi possível incluir {total_animal2 - total_animal2_incluidos} produtos Animal_2 nos cruzamentos.")
     
     # Agora adicionamos mais cruzamentos até atingir o limite, evitando duplicatas
-    pares_vistos = set()
-    for idx, row in df.iterrows():
-        if len(linhas_selecionadas) >= limite_combinacoes:
-            break
-            
-        # Verificamos se este cruzamento já não foi selecionado
-        if idx not in linhas_selecionadas:
-            animal1 = row['Animal_1']
-            animal2 = row['Animal_2']
-            par = tuple(sorted([animal1, animal2]))
-            
-            # Só adicionamos se não for o mesmo animal e se o par ainda não foi visto
-            if animal1 != animal2 and par not in pares_vistos:
-                pares_vistos.add(par)
-                linhas_selecionadas.append(idx)
-    
-    # Manter apenas as linhas selecionadas e renomear a coluna de coeficiente
-    df_resultado = df.loc[linhas_selecionadas].copy()
+    adicionais = selecionar_pares_adicionais(animal1_ordenado, animal2_ordenado, selecionadas,
+                                             limite_combinacoes - total_animal2_incluidos, num_animais)
+    
+    # Manter apenas as linhas selecionadas (primeira passada e depois as adicionais, em ordem
+    # de coeficiente) e renomear a coluna de coeficiente
+    posicoes = np.concatenate([np.flatnonzero(selecionadas), adicionais])
+    df_resultado = df.iloc[ordem[posicoes]].copy()
     df_resultado = df_resultado.rename(columns={'Coef': 'Coeficiente'})
     
     # Calcular estatísticas de uso dos Animal_1
-    estatisticas_animal1 = {}
-    for _, row in df_resultado.iterrows():
-        animal1 = row['Animal_1']
-        estatisticas_animal1[animal1] = estatisticas_animal1.get(animal1, 0) + 1
+    utilizacao_animal1 = np.bincount(animal1_ordenado[posicoes], minlength=num_animais)
+    utilizacao_animal1 = utilizacao_animal1[utilizacao_animal1 > 0]
     
     # Adicionar estatísticas como metadados ao arquivo de resultados
     df_estatisticas = pd.DataFrame([
         {"tipo": "estatistica", "chave": "max_cruzamentos_por_animal1", "valor": max_cruzamentos_por_animal1},
-        {"tipo": "estatistica", "chave": "total_animal1_utilizados", "valor": len(estatisticas_animal1)},
+        {"tipo": "estatistica", "chave": "total_animal1_utilizados", "valor": len(utilizacao_animal1)},
         {"tipo": "estatistica", "chave": "total_animal1_possiveis", "valor": total_animal1},
-        {"tipo": "estatistica", "chave": "total_animal2_utilizados", "valor": len(animal2_incluidos)},
+        {"tipo": "estatistica", "chave": "total_animal2_utilizados", "valor": total_animal2_incluidos},
         {"tipo": "estatistica", "chave": "total_animal2_possiveis", "valor": total_animal2}
     ])
     
@@ -146,16 +286,15 @@ def analisar_parentesco_direto(arquivo_entrada, arquivo_saida, limite_combinacoe
     tempo_total = fim - inicio
     
     # Calcular estatísticas de distribuição
-    utilizacao_animal1 = [count for animal, count in estatisticas_animal1.items()]
-    media_utilizacao = sum(utilizacao_animal1) / len(utilizacao_animal1) if utilizacao_animal1 else 0
+    media_utilizacao = utilizacao_animal1.mean() if len(utilizacao_animal1) else 0
     
     print(f"\nEstatísticas de utilização de Animal_1:")
-    print(f"- Animal_1 utilizados: {len(estatisticas_animal1)} de {total_animal1} ({len(estatisticas_animal1)/total_animal1*100:.1f}%)")
+    print(f"- Animal_1 utilizados: {len(utilizacao_animal1)} de {total_animal1} ({len(utilizacao_animal1)/total_animal1*100:.1f}%)")
     print(f"- Média de cruzamentos por Animal_1: {media_utilizacao:.2f}")
     print(f"- Máximo de cruzamentos permitidos por Animal_1: {max_cruzamentos_por_animal1}")
     
     print(f"\nProcessamento concluído em {tempo_total:.2f} segundos.")
-    print(f"Total de produtos Animal_2 incluídos: {len(animal2_incluidos)} de {len(todos_animal2)}")
+    print(f"Total de produtos Animal_2 incluídos: {total_animal2_incluidos} de {total_animal2}")
     print(f"Resultados salvos em: {arquivo_saida}")
     
     # Mostrar os 10 primeiros resultados
@@ -0,0 +1,39 @@
+"""
+Script para testar a cobertura de Animal_2 em analisar_parentesco_direto
+
+Executa a análise no arquivo de exemplo e verifica se todos os produtos Animal_2
+foram incluídos nos cruzamentos (a seleção depende da ordem dos empates de
+coeficiente, por isso a verificação roda sobre o arquivo real).
+"""
+import os
+import sys
+import tempfile
+import pandas as pd
+from analisar_parentesco import analisar_parentesco_direto
+
+def testar_cobertura_animal2():
+    arquivo_exemplo = './uploads/parentesco_produtos (1).csv'
+    if not os.path.exists(arquivo_exemplo):
+        print(f"Erro: Arquivo {arquivo_exemplo} não encontrado.")
+        return False
+
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo_saida = os.path.join(pasta, 'melhores_cruzamentos.csv')
+        analisar_parentesco_direto(arquivo_exemplo, arquivo_saida, limite_combinacoes=100,
+                                   callback_progresso=None)
+
+        estatisticas = pd.read_csv(arquivo_saida.replace('.csv', '_estatisticas.csv'))
+        valores = dict(zip(estatisticas['chave'], estatisticas['valor']))
+
+    incluidos = int(valores['total_animal2_utilizados'])
+    possiveis = int(valores['total_animal2_possiveis'])
+
+    if incluidos != possiveis:
+        print(f"✗ Apenas {incluidos} de {possiveis} produtos Animal_2 foram incluídos")
+        return False
+
+    print(f"✓ Todos os {possiveis} produtos Animal_2 foram incluídos")
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if testar_cobertura_animal2() else 1)
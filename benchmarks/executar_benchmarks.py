@@ -0,0 +1,233 @@
+"""
+Suíte de benchmarks dos caminhos críticos do projeto.
+
+Mede separadamente:
+- DataProcessor (apa0.24/data_processor.py)
+- csv_to_matrix e get_matrix_statistics (apa0.18/csv_to_matrix.py)
+- GRASPOptimizer.optimize (apa0.24/grasp_algorithm.py), com e sem path-relinking
+- graspe.grasp_multiplas_execucoes (apa0.18/graspe.py)
+
+Os resultados são gravados em JSON e comparados com um baseline salvo.
+
+Uso:
+    python executar_benchmarks.py                      # todos os tamanhos
+    python executar_benchmarks.py --tamanhos 100 1000  # tamanhos específicos
+    python executar_benchmarks.py --salvar-baseline    # grava o baseline atual
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+PASTA_BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+PASTA_RAIZ = os.path.dirname(PASTA_BENCHMARKS)
+sys.path.insert(0, os.path.join(PASTA_RAIZ, 'apa0.24'))
+sys.path.insert(0, os.path.join(PASTA_RAIZ, 'apa0.18'))
+
+from gerar_rebanho import gerar_arquivo  # noqa: E402
+from data_processor import DataProcessor  # noqa: E402
+from grasp_algorithm import GRASPOptimizer  # noqa: E402
+from csv_to_matrix import csv_to_matrix, get_matrix_statistics  # noqa: E402
+import graspe  # noqa: E402
+
+TAMANHOS_PADRAO = [100, 1000, 10000, 100000]
+
+# Maior número de animais que cada alvo suporta hoje (memória/tempo).
+# Tamanhos acima do limite são registrados como 'pulado'; use --sem-limites para forçar.
+LIMITES_ANIMAIS = {
+    'DataProcessor': 1000,
+    'csv_to_matrix': 1000,
+    'get_matrix_statistics': 1000,
+    'GRASPOptimizer.optimize': 1000,
+    'GRASPOptimizer.optimize (path-relinking)': 1000,
+    'graspe.grasp_multiplas_execucoes': 100,
+}
+
+
+def medir(funcao, repeticoes, semente=42):
+    """
+    Executa funcao repeticoes vezes e retorna a lista de tempos (segundos)
+    e o retorno da última execução. As sementes são fixadas antes de cada execução.
+    """
+    tempos = []
+    retorno = None
+    for _ in range(repeticoes):
+        random.seed(semente)
+        np.random.seed(semente)
+        inicio = time.perf_counter()
+        retorno = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return tempos, retorno
+
+
+def benchmark_tamanho(num_animais, repeticoes, sem_limites, pasta_dados):
+    """Executa todos os alvos para um tamanho de rebanho"""
+    caminho = gerar_arquivo(num_animais, pasta=pasta_dados)
+    num_linhas = sum(1 for _ in open(caminho, encoding='utf-8')) - 1
+    resultados = []
+
+    def registrar(alvo, funcao, extras=None):
+        if not sem_limites and num_animais > LIMITES_ANIMAIS[alvo]:
+            resultados.append({'alvo': alvo, 'animais': num_animais, 'linhas': num_linhas,
+                               'status': 'pulado'})
+            print(f"  {alvo:45s} pulado (limite {LIMITES_ANIMAIS[alvo]} animais)")
+            return None
+        tempos, retorno = medir(funcao, repeticoes)
+        resultado = {
+            'alvo': alvo,
+            'animais': num_animais,
+            'linhas': num_linhas,
+            'status': 'ok',
+            'tempo_mediano': float(np.median(tempos)),
+            'tempo_minimo': float(np.min(tempos)),
+            'tempos': tempos,
+        }
+        if extras:
+            resultado.update(extras(retorno))
+        resultados.append(resultado)
+        print(f"  {alvo:45s} {resultado['tempo_mediano']:.4f}s")
+        return retorno
+
+    # Os limites dos alvos que dependem de dp/matriz nunca são maiores que os
+    # de DataProcessor/csv_to_matrix, então dp e matriz existem quando são usados
+    dp = registrar('DataProcessor', lambda: DataProcessor(caminho))
+    matriz = registrar('csv_to_matrix', lambda: csv_to_matrix(caminho))
+    registrar('get_matrix_statistics', lambda: get_matrix_statistics(matriz))
+
+    def executar_grasp(use_path_relinking):
+        num_crossings = max(3, min(15, len(dp.all_pairs) // 10))
+        optimizer = GRASPOptimizer(dp.coancestry_matrix, max_iterations=100, alpha=0.3,
+                                   local_search_iterations=10, pair_names=dp.all_pairs,
+                                   use_path_relinking=use_path_relinking)
+        optimizer.optimize(num_crossings=num_crossings)
+        return optimizer
+
+    # Tempo até o alvo: iteração e tempo em que a melhor solução foi encontrada
+    def tempo_ate_alvo(optimizer):
+        return {'melhor_custo': float(optimizer.best_cost),
+                'iteracao_do_melhor': optimizer.best_iteration,
+                'tempo_ate_melhor': optimizer.time_to_best}
+
+    registrar('GRASPOptimizer.optimize', lambda: executar_grasp(False), tempo_ate_alvo)
+    registrar('GRASPOptimizer.optimize (path-relinking)', lambda: executar_grasp(True), tempo_ate_alvo)
+
+    def executar_graspe():
+        # grasp_multiplas_execucoes grava arquivos relativos ao diretório atual
+        with tempfile.TemporaryDirectory() as pasta_temp:
+            diretorio_anterior = os.getcwd()
+            os.chdir(pasta_temp)
+            os.makedirs('uploads', exist_ok=True)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    return graspe.grasp_multiplas_execucoes(matriz, 1)
+            finally:
+                os.chdir(diretorio_anterior)
+
+    registrar('graspe.grasp_multiplas_execucoes', executar_graspe,
+              lambda r: {'melhor_custo': float(r['melhor_solucao_global']['valor_objetivo'])})
+
+    return resultados
+
+
+def comparar_com_baseline(resultados, baseline, tolerancia):
+    """
+    Compara os tempos medianos com o baseline.
+
+    Retorno:
+    list: Comparações com razão atual/baseline e indicação de regressão
+    """
+    referencia = {(r['alvo'], r['animais']): r for r in baseline.get('resultados', [])
+                  if r.get('status') == 'ok'}
+    comparacoes = []
+    for resultado in resultados:
+        chave = (resultado['alvo'], resultado['animais'])
+        if resultado['status'] != 'ok' or chave not in referencia:
+            continue
+        tempo_base = referencia[chave]['tempo_mediano']
+        razao = resultado['tempo_mediano'] / tempo_base if tempo_base > 0 else float('inf')
+        comparacoes.append({
+            'alvo': resultado['alvo'],
+            'animais': resultado['animais'],
+            'tempo_baseline': tempo_base,
+            'tempo_atual': resultado['tempo_mediano'],
+            'razao': razao,
+            'regressao': razao > 1.0 + tolerancia
+        })
+    return comparacoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks dos caminhos críticos do APA")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=TAMANHOS_PADRAO,
+                        help="Números de animais dos rebanhos sintéticos")
+    parser.add_argument('--repeticoes', type=int, default=3, help="Repetições por alvo")
+    parser.add_argument('--sem-limites', action='store_true',
+                        help="Executa todos os alvos mesmo acima de LIMITES_ANIMAIS")
+    parser.add_argument('--saida', default=os.path.join(PASTA_BENCHMARKS, 'resultados.json'),
+                        help="Arquivo JSON de resultados")
+    parser.add_argument('--baseline', default=os.path.join(PASTA_BENCHMARKS, 'baseline.json'),
+                        help="Arquivo JSON do baseline")
+    parser.add_argument('--salvar-baseline', action='store_true',
+                        help="Grava os resultados atuais como novo baseline")
+    parser.add_argument('--tolerancia', type=float, default=0.25,
+                        help="Aumento relativo de tempo aceito antes de acusar regressão")
+    parser.add_argument('--pasta-dados', default=os.path.join(PASTA_BENCHMARKS, 'dados'),
+                        help="Pasta dos rebanhos sintéticos gerados")
+    args = parser.parse_args()
+
+    todos_resultados = []
+    for tamanho in args.tamanhos:
+        print(f"Rebanho sintético com {tamanho} animais")
+        todos_resultados.extend(benchmark_tamanho(tamanho, args.repeticoes, args.sem_limites,
+                                                  args.pasta_dados))
+
+    relatorio = {
+        'ambiente': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'plataforma': platform.platform(),
+            'processador': platform.processor(),
+        },
+        'data': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'repeticoes': args.repeticoes,
+        'resultados': todos_resultados,
+    }
+
+    regressoes = []
+    if os.path.exists(args.baseline) and not args.salvar_baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        relatorio['comparacao_baseline'] = comparar_com_baseline(todos_resultados, baseline,
+                                                                 args.tolerancia)
+        print("\n=== Comparação com o baseline ===")
+        for comparacao in relatorio['comparacao_baseline']:
+            marcador = 'REGRESSÃO' if comparacao['regressao'] else 'ok'
+            print(f"  {comparacao['alvo']:45s} {comparacao['animais']:>7d} animais  "
+                  f"{comparacao['razao']:.2f}x  {marcador}")
+        regressoes = [c for c in relatorio['comparacao_baseline'] if c['regressao']]
+
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, indent=2, ensure_ascii=False)
+    print(f"\nResultados gravados em {args.saida}")
+
+    if args.salvar_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, indent=2, ensure_ascii=False)
+        print(f"Baseline gravado em {args.baseline}")
+
+    return 1 if regressoes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
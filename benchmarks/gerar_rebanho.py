@@ -0,0 +1,87 @@
+"""
+Gerador sintético de rebanhos para os benchmarks.
+
+Produz arquivos no mesmo formato de parentesco_produtos.csv:
+Animal_1,Animal_2,Coef, onde cada animal é um par 'pai_mae'.
+A geração é determinística para uma mesma semente.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+
+def gerar_rebanho(num_animais, semente=42, max_parceiros=50):
+    """
+    Gera um DataFrame de coancestralidade entre num_animais produtos.
+
+    Cada produto recebe um pai sorteado de um grupo pequeno de touros e uma mãe própria.
+    O coeficiente depende do parentesco entre os pais (0.25 para meio-irmãos
+    paternos, 0.125 para mães da mesma família) mais um parentesco de fundo.
+
+    Parâmetros:
+    num_animais (int): Número de produtos (pares 'pai_mae') distintos
+    semente (int): Semente do gerador aleatório
+    max_parceiros (int): Máximo de parceiros por animal. Se o triângulo completo
+        couber em num_animais * max_parceiros linhas ele é gerado inteiro,
+        caso contrário cada animal recebe max_parceiros parceiros sorteados.
+
+    Retorno:
+    DataFrame: Colunas Animal_1, Animal_2 e Coef
+    """
+    rng = np.random.default_rng(semente)
+
+    # Poucos pais (touros) e uma mãe distinta por produto, como nos dados reais
+    num_pais = max(2, int(np.sqrt(num_animais)))
+    pais = rng.integers(1_000_000, 1_000_000 + num_pais, size=num_animais)
+    maes = 3_000_000 + rng.permutation(num_animais)
+    # Mães agrupadas em famílias maternas (mães aparentadas entre si)
+    familias_maes = (maes - 3_000_000) // 4
+
+    ids = np.array([f"{p}_{m}" for p, m in zip(pais, maes)])
+
+    total_triangulo = num_animais * (num_animais - 1) // 2
+    if total_triangulo <= num_animais * max_parceiros:
+        idx1, idx2 = np.triu_indices(num_animais, k=1)
+    else:
+        idx1 = np.repeat(np.arange(num_animais), max_parceiros)
+        idx2 = rng.integers(0, num_animais, size=idx1.size)
+        validos = idx1 != idx2
+        idx1, idx2 = idx1[validos], idx2[validos]
+        # Forma canônica i < j e sem pares repetidos
+        idx1, idx2 = np.minimum(idx1, idx2), np.maximum(idx1, idx2)
+        chave = np.unique(idx1.astype(np.int64) * num_animais + idx2)
+        idx1, idx2 = chave // num_animais, chave % num_animais
+
+    coef = 0.25 * (pais[idx1] == pais[idx2]) + 0.125 * (familias_maes[idx1] == familias_maes[idx2])
+    # Parentesco de fundo: maioria zero, alguns valores pequenos
+    fundo = rng.choice([0.0, 0.0, 0.0, 0.015625, 0.03125, 0.0625, 0.125], size=idx1.size)
+    coef = np.round(coef + fundo, 6)
+
+    return pd.DataFrame({
+        'Animal_1': ids[idx1],
+        'Animal_2': ids[idx2],
+        'Coef': coef
+    })
+
+
+def gerar_arquivo(num_animais, pasta='dados', semente=42, max_parceiros=50):
+    """
+    Gera (ou reaproveita) o CSV sintético de num_animais produtos.
+
+    Retorno:
+    str: Caminho do arquivo gerado
+    """
+    os.makedirs(pasta, exist_ok=True)
+    caminho = os.path.join(pasta, f"rebanho_{num_animais}_s{semente}_p{max_parceiros}.csv")
+    if not os.path.exists(caminho):
+        gerar_rebanho(num_animais, semente, max_parceiros).to_csv(caminho, index=False)
+    return caminho
+
+
+if __name__ == "__main__":
+    import sys
+
+    tamanhos = [int(x) for x in sys.argv[1:]] or [100, 1000, 10000, 100000]
+    for tamanho in tamanhos:
+        print(gerar_arquivo(tamanho))